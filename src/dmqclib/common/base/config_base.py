@@ -11,6 +11,8 @@ validation and providing structured methods for accessing configuration values,
 ensuring consistency and reusability.
 """
 
+import hashlib
+import json
 import os
 from abc import ABC
 from typing import List, Dict, Optional
@@ -261,6 +263,28 @@ class ConfigBase(ABC):
             f"Summary statistics set '{stats_name}' not found in the config file."
         )
 
+    def get_config_hash(self, keys: Optional[List[str]] = None) -> str:
+        """Hash the resolved configuration of the selected entry.
+
+        The hash changes whenever a value in :attr:`data` changes, which makes
+        it suitable as part of a cache key. Combine it with an input fingerprint
+        such as :meth:`dmqclib.prepare.step1_read_input.input_base.InputDataSetBase.get_cache_key`
+        to decide whether a step can reuse earlier results.
+
+        :param keys: Top-level keys of :attr:`data` to include, e.g.
+                     ``["target_set", "step_param_set"]``. Defaults to
+                     ``None``, which includes all of :attr:`data`.
+        :type keys: list of str, optional
+        :return: A SHA-256 hex digest.
+        :rtype: str
+        :raises KeyError: If a key in ``keys`` is not present in :attr:`data`.
+        """
+        data = self.data if keys is None else {k: self.data[k] for k in keys}
+
+        return hashlib.sha256(
+            json.dumps(data, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
     def get_step_params(self, step_name: str) -> Dict:
         """Retrieve the parameters dictionary for a specific step.
 
@@ -12,6 +12,8 @@ from typing import Dict, Optional
 
 import polars as pl
 
+from dmqclib.common.utils.sort import join_sorted
+
 
 class FeatureBase(ABC):
     """
@@ -69,6 +71,45 @@ class FeatureBase(ABC):
         self.selected_rows: Optional[Dict[str, pl.DataFrame]] = selected_rows
         self.summary_stats: Optional[pl.DataFrame] = summary_stats
         self.features: Optional[pl.DataFrame] = None
+        #: Whether :attr:`filtered_input` is sorted by ``platform_code``,
+        #: ``profile_no`` and ``observation_no``. Set by the extract step.
+        self.sorted_input: bool = False
+        #: :attr:`summary_stats` reshaped to one row per profile, if the
+        #: extract step has already computed it. Set by the extract step.
+        self.summary_stats_wide: Optional[pl.DataFrame] = None
+
+    def join_observation_values(
+        self, observations: pl.DataFrame, col_name: str
+    ) -> pl.DataFrame:
+        """
+        Join the values of the specified column from :attr:`filtered_input`
+        onto a DataFrame of observations.
+
+        If :attr:`sorted_input` is set, the values are looked up with
+        :func:`dmqclib.common.utils.sort.join_sorted` instead of a hash join.
+
+        :param observations: Observations with the columns ``platform_code``,
+                             ``profile_no`` and ``observation_no``.
+        :type observations: pl.DataFrame
+        :param col_name: The original data column to be joined (e.g., "temp").
+        :type col_name: str
+        :return: The observations with a ``value`` column.
+        :rtype: pl.DataFrame
+        """
+        values = self.filtered_input.select(
+            pl.col("platform_code"),
+            pl.col("profile_no"),
+            pl.col("observation_no"),
+            pl.col(col_name).alias("value"),
+        )
+        if self.sorted_input:
+            return join_sorted(observations, values)
+
+        return observations.join(
+            values,
+            on=["platform_code", "profile_no", "observation_no"],
+            maintain_order="left",
+        )
 
     @abstractmethod
     def extract_features(self) -> None:
@@ -277,6 +277,10 @@ properties:
                       type: boolean
                     filter_rows:
                       type: boolean
+                    compact_schema:
+                      type: boolean
+                    cluster_profiles:
+                      type: boolean
                   required:
                     - rename_columns
                     - filter_rows
@@ -291,6 +295,25 @@ properties:
                     keep_years:
                       type: array
                   additionalProperties: false
+                lazy_scan:
+                  type: boolean
+                max_workers:
+                  type: integer
+                cache_dir:
+                  type: string
+                cache_file_type:
+                  type: string
+                row_group_size:
+                  type: integer
+                batch_size:
+                  type: integer
+                staging_dir:
+                  type: string
+                content_hash:
+                  type: boolean
+                sort_order:
+                  type: string
+                  enum: [check, enforce]
               required:
                 - sub_steps
               additionalProperties: false
@@ -871,6 +894,10 @@ properties:
                       type: boolean
                     filter_rows:
                       type: boolean
+                    compact_schema:
+                      type: boolean
+                    cluster_profiles:
+                      type: boolean
                   required:
                     - rename_columns
                     - filter_rows
@@ -885,6 +912,25 @@ properties:
                     keep_years:
                       type: array
                   additionalProperties: false
+                lazy_scan:
+                  type: boolean
+                max_workers:
+                  type: integer
+                cache_dir:
+                  type: string
+                cache_file_type:
+                  type: string
+                row_group_size:
+                  type: integer
+                batch_size:
+                  type: integer
+                staging_dir:
+                  type: string
+                content_hash:
+                  type: boolean
+                sort_order:
+                  type: string
+                  enum: [check, enforce]
               required:
                 - sub_steps
               additionalProperties: false
@@ -163,6 +163,7 @@ def load_step5_extract_dataset(
     selected_profiles: Optional[pl.DataFrame] = None,
     selected_rows: Optional[Dict[str, pl.DataFrame]] = None,
     summary_stats: Optional[pl.DataFrame] = None,
+    profile_input: Optional[pl.DataFrame] = None,
 ) -> ExtractFeatureBase:
     """
     Load a :class:`~dmqclib.prepare.step5_extract_features.extract_base.ExtractFeatureBase`-derived
@@ -182,6 +183,9 @@ def load_step5_extract_dataset(
     :type selected_rows: Optional[Dict[str, :class:`polars.DataFrame`]]
     :param summary_stats: A Polars DataFrame containing summary stats for scaling or references.
     :type summary_stats: Optional[:class:`polars.DataFrame`]
+    :param profile_input: The rows of ``input_data`` that belong to the selected
+                          profiles, if already computed by the select step.
+    :type profile_input: Optional[:class:`polars.DataFrame`]
     :return: An instantiated object that inherits from
              :class:`~dmqclib.prepare.step5_extract_features.extract_base.ExtractFeatureBase`.
     :rtype: :class:`~dmqclib.prepare.step5_extract_features.extract_base.ExtractFeatureBase`
@@ -193,6 +197,7 @@ def load_step5_extract_dataset(
         selected_profiles=selected_profiles,
         selected_rows=selected_rows,
         summary_stats=summary_stats,
+        profile_input=profile_input,
     )
 
 
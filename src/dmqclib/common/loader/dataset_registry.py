@@ -12,6 +12,9 @@ from dmqclib.prepare.step2_calc_stats.dataset_a import SummaryDataSetA
 from dmqclib.prepare.step2_calc_stats.summary_base import SummaryStatsBase
 from dmqclib.prepare.step3_select_profiles.dataset_a import SelectDataSetA
 from dmqclib.prepare.step3_select_profiles.dataset_all import SelectDataSetAll
+from dmqclib.prepare.step3_select_profiles.dataset_nearest import (
+    SelectDataSetNearest,
+)
 from dmqclib.prepare.step3_select_profiles.select_base import ProfileSelectionBase
 from dmqclib.prepare.step4_select_rows.dataset_a import LocateDataSetA
 from dmqclib.prepare.step4_select_rows.dataset_all import LocateDataSetAll
@@ -45,6 +48,7 @@ SUMMARY_DATASET_REGISTRY: Dict[str, Type[SummaryStatsBase]] = {
 SELECT_DATASET_REGISTRY: Dict[str, Type[ProfileSelectionBase]] = {
     "SelectDataSetA": SelectDataSetA,
     "SelectDataSetAll": SelectDataSetAll,
+    "SelectDataSetNearest": SelectDataSetNearest,
 }
 
 #: A registry mapping class names (used in YAML config) to the
@@ -0,0 +1,119 @@
+"""
+This module builds a per-profile catalog of QC flag counts.
+
+The select step decides whether a profile is positive or negative from the QC
+flags of all its rows, and the locate step only needs the rows of profiles
+with flagged observations of its target. :func:`build_profile_catalog`
+summarises the flags of every target for every profile in one ``group_by``
+pass, so these decisions become filters on a table with one row per profile
+instead of scans over all observations. :func:`filter_profiles` restricts the
+observations to the selected profiles once, for the steps after the select
+step.
+"""
+
+from typing import Dict, List
+
+import polars as pl
+
+
+def build_profile_catalog(
+    df: pl.DataFrame, target_dict: Dict[str, Dict], key_col_names: List[str]
+) -> pl.DataFrame:
+    """
+    Count the positive and negative QC flags of every target per profile.
+
+    For each target, the catalog has the columns:
+
+    * ``<target>_n_bad``: The number of rows with a flag in ``pos_flag_values``
+      (default ``[4]``).
+    * ``<target>_n_good``: The number of rows with a flag in
+      ``neg_flag_values`` (default ``[1]``).
+    * ``<target>_has_bad``: Whether ``<target>_n_bad`` is greater than zero.
+    * ``<target>_has_good``: Whether ``<target>_n_good`` is greater than zero.
+
+    The column ``n_rows`` holds the number of rows of each profile.
+
+    :param df: The input data with the flag columns of the targets.
+    :type df: pl.DataFrame
+    :param target_dict: Target definitions keyed by target name, as returned by
+                        :meth:`dmqclib.common.base.config_base.ConfigBase.get_target_dict`.
+    :type target_dict: Dict[str, Dict]
+    :param key_col_names: The columns identifying a profile.
+    :type key_col_names: List[str]
+    :return: One row per profile with ``key_col_names``, ``n_rows`` and the
+             flag columns of every target.
+    :rtype: pl.DataFrame
+    """
+    counts = [pl.len().alias("n_rows")]
+    for target_name, target_value in target_dict.items():
+        flag = pl.col(target_value["flag"])
+        counts.extend(
+            [
+                flag.is_in(target_value.get("pos_flag_values", [4]))
+                .sum()
+                .alias(f"{target_name}_n_bad"),
+                flag.is_in(target_value.get("neg_flag_values", [1]))
+                .sum()
+                .alias(f"{target_name}_n_good"),
+            ]
+        )
+
+    return (
+        df.group_by(key_col_names)
+        .agg(counts)
+        .with_columns(
+            expr
+            for target_name in target_dict
+            for expr in [
+                (pl.col(f"{target_name}_n_bad") > 0).alias(f"{target_name}_has_bad"),
+                (pl.col(f"{target_name}_n_good") > 0).alias(f"{target_name}_has_good"),
+            ]
+        )
+    )
+
+
+def has_any_bad(target_names: List[str]) -> pl.Expr:
+    """
+    Build a catalog filter for profiles with a positive flag in any target.
+
+    :param target_names: The target names of the catalog.
+    :type target_names: List[str]
+    :return: A boolean expression on the catalog of :func:`build_profile_catalog`.
+    :rtype: pl.Expr
+    """
+    return pl.any_horizontal(f"{x}_has_bad" for x in target_names)
+
+
+def has_only_good(target_names: List[str]) -> pl.Expr:
+    """
+    Build a catalog filter for profiles without positive flags and with at
+    least one negative flag in every target.
+
+    :param target_names: The target names of the catalog.
+    :type target_names: List[str]
+    :return: A boolean expression on the catalog of :func:`build_profile_catalog`.
+    :rtype: pl.Expr
+    """
+    return pl.all_horizontal(
+        ~pl.col(f"{x}_has_bad") & pl.col(f"{x}_has_good") for x in target_names
+    )
+
+
+def filter_profiles(df: pl.DataFrame, profiles: pl.DataFrame) -> pl.DataFrame:
+    """
+    Keep the rows of the given profiles, in their original order.
+
+    :param df: The input data.
+    :type df: pl.DataFrame
+    :param profiles: The profiles to keep, with ``platform_code`` and
+                     ``profile_no``. Duplicate profiles are allowed.
+    :type profiles: pl.DataFrame
+    :return: The rows of ``df`` whose profile is in ``profiles``.
+    :rtype: pl.DataFrame
+    """
+    return df.join(
+        profiles.select(["platform_code", "profile_no"]),
+        on=["platform_code", "profile_no"],
+        how="semi",
+        maintain_order="left",
+    )
@@ -1,30 +1,488 @@
 """
 This module provides utility functions for reading various file formats into Polars DataFrames.
 
-It supports common data formats like Parquet, TSV (tab-separated values), and CSV
-(comma-separated values), including their gzipped versions, and allows for automatic
-file type inference based on file extensions.
+It supports common data formats like Parquet, Arrow IPC (Feather), TSV
+(tab-separated values), and CSV (comma-separated values), including their gzipped
+versions, and allows for automatic file type inference based on file extensions. Files can be read eagerly into a
+DataFrame or scanned lazily into a LazyFrame.
+
+Besides single files, the input may be a directory, a glob pattern, or a
+Hive-partitioned dataset (e.g. ``year=2022/month=05/*.parquet``). Such inputs
+are expanded into a list of files that are read concurrently, and the
+partition values found in the paths are added as columns.
+
+Text inputs (CSV/TSV, optionally gzipped) can be converted once into Parquet
+files stored in a cache directory, so that later reads skip decompression and
+parsing. With an Arrow IPC cache, Parquet inputs are converted as well, and the
+uncompressed IPC files are memory-mapped, so that several processes reading
+the same input share one page-cached copy. Cached files are keyed by the
+source path, size, modification time, and read options, and are replaced when
+the source file changes.
+
+Profile-clustered data can be written as Parquet files whose row groups end
+on profile boundaries, together with a profile index that maps every
+(``platform_code``, ``profile_no``) key to its row offset and row count, so
+that single profiles can be read by offset instead of by a join.
+
+Very large text inputs can be read in batches of lines with
+:func:`iter_input_file_batches` and staged into a Parquet file with
+:func:`stage_input_file`, so that peak memory is bounded by the batch size.
+
+:func:`get_input_fingerprint` summarises input files by their size,
+modification time and Parquet footer, optionally with a content hash, to
+detect whether the input changed between runs.
 """
 
+import glob
+import gzip
+import hashlib
+import io
+import json
 import os
-from typing import Dict, Any, Optional
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
 
 import polars as pl
+import pyarrow.parquet as pq
+
+_GLOB_CHARS = ("*", "?", "[")
+_TEXT_FILE_TYPES = ("tsv", "tsv.gz", "csv", "csv.gz")
+_CACHE_FILE_TYPES = ("parquet", "ipc")
+
+
+def _infer_file_type(input_file: str) -> str:
+    """
+    Infer the file type of an input file from its extension.
+
+    :param input_file: The full path to the file.
+    :type input_file: str
+    :raises ValueError: If the file type cannot be inferred from the extension.
+    :return: One of "parquet", "ipc", "tsv", "tsv.gz", "csv" or "csv.gz".
+    :rtype: str
+    """
+    filename = os.path.basename(input_file).lower()
+    if filename.endswith(".parquet"):
+        return "parquet"
+    elif filename.endswith((".arrow", ".ipc", ".feather")):
+        return "ipc"
+    elif filename.endswith(".tsv.gz"):
+        return "tsv.gz"
+    elif filename.endswith(".tsv"):
+        return "tsv"
+    elif filename.endswith(".csv.gz"):
+        return "csv.gz"
+    elif filename.endswith(".csv"):
+        return "csv"
+
+    raise ValueError(
+        "Could not infer file type automatically. Please specify 'file_type' explicitly."
+    )
+
+
+def is_multi_file_input(input_file: str) -> bool:
+    """
+    Check whether an input path refers to more than a single file.
+
+    :param input_file: A file path, a directory, or a glob pattern.
+    :type input_file: str
+    :return: True if ``input_file`` is a directory or contains glob characters.
+    :rtype: bool
+    """
+    input_file = str(input_file)
+    return os.path.isdir(input_file) or any(c in input_file for c in _GLOB_CHARS)
+
+
+def list_input_files(input_file: str, file_type: Optional[str] = None) -> List[str]:
+    """
+    Expand a directory or glob pattern into a sorted list of data files.
+
+    Directories are searched recursively, so Hive-style layouts such as
+    ``year=2022/month=05/part-0.parquet`` are supported. Files whose type
+    cannot be inferred from their extension (e.g. ``_SUCCESS`` markers) are
+    ignored. If ``file_type`` is given, only files of that type are returned.
+
+    :param input_file: A file path, a directory, or a glob pattern.
+    :type input_file: str
+    :param file_type: The file format to keep. Defaults to None, which keeps
+                      all supported formats.
+    :type file_type: Optional[str]
+    :raises FileNotFoundError: If no matching file is found.
+    :return: A sorted list of file paths.
+    :rtype: List[str]
+    """
+    input_file = str(input_file)
+    if not is_multi_file_input(input_file):
+        if not os.path.exists(input_file):
+            raise FileNotFoundError(f"File '{input_file}' does not exist.")
+        return [input_file]
+
+    pattern = (
+        os.path.join(input_file, "**", "*") if os.path.isdir(input_file) else input_file
+    )
+
+    input_files = []
+    for file_name in sorted(glob.glob(pattern, recursive=True)):
+        if not os.path.isfile(file_name):
+            continue
+        try:
+            inferred_type = _infer_file_type(file_name)
+        except ValueError:
+            continue
+        if not file_type or inferred_type == file_type:
+            input_files.append(file_name)
+
+    if not input_files:
+        raise FileNotFoundError(f"No input files found for '{input_file}'.")
+
+    return input_files
+
+
+def get_hive_partitions(file_name: str) -> Dict[str, Any]:
+    """
+    Extract Hive partition values from the directories of a file path.
+
+    Every directory name of the form ``key=value`` yields one partition.
+    Values that look like integers or floats are converted accordingly.
+
+    :param file_name: The path of a data file.
+    :type file_name: str
+    :return: A dictionary mapping partition keys to their values.
+    :rtype: Dict[str, Any]
+    """
+    partitions = {}
+    for part in os.path.normpath(os.path.dirname(str(file_name))).split(os.sep):
+        if "=" not in part:
+            continue
+        key, value = part.split("=", 1)
+        for cast in (int, float):
+            try:
+                value = cast(value)
+                break
+            except ValueError:
+                continue
+        partitions[key] = value
+
+    return partitions
+
+
+def _add_hive_partitions(
+    df: pl.DataFrame | pl.LazyFrame, file_name: str
+) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Add the Hive partition values of ``file_name`` as literal columns to ``df``.
+
+    Partition keys that already exist as columns in the file are left untouched.
+
+    :param df: A Polars DataFrame or LazyFrame read from ``file_name``.
+    :type df: pl.DataFrame | pl.LazyFrame
+    :param file_name: The path the data was read from.
+    :type file_name: str
+    :return: The DataFrame or LazyFrame with partition columns appended.
+    :rtype: pl.DataFrame | pl.LazyFrame
+    """
+    col_names = df.collect_schema().names()
+    partitions = {
+        k: v for k, v in get_hive_partitions(file_name).items() if k not in col_names
+    }
+    if not partitions:
+        return df
+
+    return df.with_columns([pl.lit(v).alias(k) for k, v in partitions.items()])
+
+
+def get_cache_file_name(
+    input_file: str,
+    cache_dir: str,
+    file_type: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None,
+    cache_file_type: str = "parquet",
+) -> str:
+    """
+    Build the name of the cache file for an input file.
+
+    The file name consists of a hash of the absolute source path, a hash of
+    the file type and read options, and a hash of the source size and
+    modification time. A change to any of these values therefore results in
+    a different name.
+
+    :param input_file: The path of the source file.
+    :type input_file: str
+    :param cache_dir: The directory where cached files are stored.
+    :type cache_dir: str
+    :param file_type: The file format of ``input_file``. Defaults to None,
+                      which infers it from the file extension.
+    :type file_type: Optional[str]
+    :param options: The keyword arguments passed to the Polars reader.
+    :type options: Optional[Dict[str, Any]]
+    :param cache_file_type: The format of the cache file, either "parquet"
+                            or "ipc". Defaults to "parquet".
+    :type cache_file_type: str
+    :raises FileNotFoundError: If ``input_file`` does not exist.
+    :raises ValueError: If ``cache_file_type`` is not supported.
+    :return: The full path of the cache file.
+    :rtype: str
+    """
+    if cache_file_type not in _CACHE_FILE_TYPES:
+        raise ValueError(
+            f"Unsupported cache_file_type '{cache_file_type}'. Must be one of: "
+            "'parquet', 'ipc'."
+        )
+
+    if not os.path.exists(input_file):
+        raise FileNotFoundError(f"File '{input_file}' does not exist.")
+
+    abs_path = os.path.abspath(input_file)
+    stat = os.stat(abs_path)
+    options_key = json.dumps(
+        {
+            "file_type": file_type or _infer_file_type(input_file),
+            "options": options or {},
+        },
+        sort_keys=True,
+        default=str,
+    )
+    version_key = json.dumps({"size": stat.st_size, "mtime": stat.st_mtime_ns})
+    path_hash = hashlib.sha256(abs_path.encode()).hexdigest()[:16]
+    options_hash = hashlib.sha256(options_key.encode()).hexdigest()[:16]
+    version_hash = hashlib.sha256(version_key.encode()).hexdigest()[:16]
+    extension = "arrow" if cache_file_type == "ipc" else "parquet"
+
+    return os.path.join(
+        str(cache_dir), f"{path_hash}_{options_hash}_{version_hash}.{extension}"
+    )
+
+
+def get_cached_input_file(
+    input_file: str,
+    cache_dir: str,
+    file_type: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None,
+    cache_file_type: str = "parquet",
+) -> str:
+    """
+    Return a Parquet or Arrow IPC copy of an input file, creating it if necessary.
+
+    If the cache file from :func:`get_cache_file_name` does not exist, the
+    source is read with :func:`read_input_file` and written to the cache
+    directory. Arrow IPC files are written uncompressed so that they can be
+    memory-mapped. Cache files of older versions of the same source with the
+    same file type, read options and cache format are removed; caches with
+    other options or formats are kept. The new file is written under a temporary name and then renamed,
+    so that concurrent readers never see a partially written file.
+
+    :param input_file: The path of the source file.
+    :type input_file: str
+    :param cache_dir: The directory where cached files are stored.
+                      It is created if it does not exist.
+    :type cache_dir: str
+    :param file_type: The file format of ``input_file``. Defaults to None,
+                      which infers it from the file extension.
+    :type file_type: Optional[str]
+    :param options: The keyword arguments passed to the Polars reader.
+    :type options: Optional[Dict[str, Any]]
+    :param cache_file_type: The format of the cache file, either "parquet"
+                            or "ipc". Defaults to "parquet".
+    :type cache_file_type: str
+    :raises FileNotFoundError: If ``input_file`` does not exist.
+    :return: The full path of the cached file.
+    :rtype: str
+    """
+    cache_file = get_cache_file_name(
+        input_file, cache_dir, file_type, options, cache_file_type
+    )
+    if os.path.exists(cache_file):
+        return cache_file
+
+    os.makedirs(str(cache_dir), exist_ok=True)
+    df = read_input_file(input_file, file_type, options)
+
+    fd, tmp_file = tempfile.mkstemp(dir=str(cache_dir), suffix=".tmp")
+    os.close(fd)
+    try:
+        if cache_file_type == "ipc":
+            df.write_ipc(tmp_file, compression="uncompressed")
+        else:
+            df.write_parquet(tmp_file)
+        os.replace(tmp_file, cache_file)
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+    path_hash, options_hash, _ = os.path.basename(cache_file).split("_")
+    extension = os.path.splitext(cache_file)[1]
+    for stale_file in glob.glob(
+        os.path.join(str(cache_dir), f"{path_hash}_{options_hash}_*{extension}")
+    ):
+        if stale_file != cache_file:
+            os.remove(stale_file)
+
+    return cache_file
+
+
+def _resolve_cached_input(
+    input_file: str,
+    file_type: Optional[str],
+    options: Optional[Dict[str, Any]],
+    cache_dir: Optional[str],
+    cache_file_type: str,
+) -> Tuple[str, Optional[str], Optional[Dict[str, Any]]]:
+    """
+    Swap an input file for its cached copy if caching is enabled.
+
+    Text files are always cached. Parquet files are only cached when
+    ``cache_file_type`` is "ipc", and files that already are in the cache
+    format are read directly.
+
+    :return: The file name, file type and options to read with.
+    :rtype: Tuple[str, Optional[str], Optional[Dict[str, Any]]]
+    """
+    if not cache_dir:
+        return input_file, file_type, options
+
+    source_type = file_type or _infer_file_type(input_file)
+    if source_type == cache_file_type or (
+        source_type not in _TEXT_FILE_TYPES and cache_file_type != "ipc"
+    ):
+        return input_file, file_type, options
+
+    cache_file = get_cached_input_file(
+        input_file, cache_dir, file_type, options, cache_file_type
+    )
+
+    return cache_file, cache_file_type, None
+
+
+def read_input_files(
+    input_files: List[str],
+    file_type: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None,
+    max_workers: Optional[int] = None,
+    hive_partitioning: bool = True,
+    cache_dir: Optional[str] = None,
+    cache_file_type: str = "parquet",
+) -> pl.DataFrame:
+    """
+    Read several input files concurrently and concatenate them.
+
+    Each file is read with :func:`read_input_file` in a thread pool, its
+    Hive partition values are optionally added as columns, and the results are
+    concatenated with relaxed schemas so that files with slightly
+    different column types can be combined.
+
+    :param input_files: The list of files to read, e.g. from :func:`list_input_files`.
+    :type input_files: List[str]
+    :param file_type: The file format passed to :func:`read_input_file`.
+    :type file_type: Optional[str]
+    :param options: Additional keyword arguments passed to the Polars reader.
+    :type options: Optional[Dict[str, Any]]
+    :param max_workers: The maximum number of files read at the same time.
+                        Defaults to None, which uses the default of
+                        :class:`concurrent.futures.ThreadPoolExecutor`.
+    :type max_workers: Optional[int]
+    :param hive_partitioning: If True, add the values of ``key=value``
+                              directories as columns. Defaults to True.
+    :type hive_partitioning: bool
+    :param cache_dir: The cache directory, see :func:`read_input_file`.
+                      Defaults to None.
+    :type cache_dir: Optional[str]
+    :param cache_file_type: The format of cached files, see
+                            :func:`read_input_file`. Defaults to "parquet".
+    :type cache_file_type: str
+    :raises FileNotFoundError: If ``input_files`` is empty.
+    :return: A Polars DataFrame containing the rows of all files.
+    :rtype: pl.DataFrame
+    """
+    if not input_files:
+        raise FileNotFoundError("No input files to read.")
+
+    def _read(file_name: str) -> pl.DataFrame:
+        df = read_input_file(
+            file_name,
+            file_type,
+            options,
+            cache_dir=cache_dir,
+            cache_file_type=cache_file_type,
+        )
+        return _add_hive_partitions(df, file_name) if hive_partitioning else df
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        dfs = list(executor.map(_read, input_files))
+
+    return pl.concat(dfs, how="diagonal_relaxed")
+
+
+def scan_input_files(
+    input_files: List[str],
+    file_type: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None,
+    hive_partitioning: bool = True,
+    cache_dir: Optional[str] = None,
+    cache_file_type: str = "parquet",
+) -> pl.LazyFrame:
+    """
+    Lazily scan several input files and concatenate them.
+
+    This is the lazy counterpart of :func:`read_input_files`. Polars
+    collects the concatenated scans in parallel.
+
+    :param input_files: The list of files to scan, e.g. from :func:`list_input_files`.
+    :type input_files: List[str]
+    :param file_type: The file format passed to :func:`scan_input_file`.
+    :type file_type: Optional[str]
+    :param options: Additional keyword arguments passed to the Polars scanner.
+    :type options: Optional[Dict[str, Any]]
+    :param hive_partitioning: If True, add the values of ``key=value``
+                              directories as columns. Defaults to True.
+    :type hive_partitioning: bool
+    :param cache_dir: The cache directory, see :func:`read_input_file`.
+                      Defaults to None.
+    :type cache_dir: Optional[str]
+    :param cache_file_type: The format of cached files, see
+                            :func:`read_input_file`. Defaults to "parquet".
+    :type cache_file_type: str
+    :raises FileNotFoundError: If ``input_files`` is empty.
+    :return: A Polars LazyFrame over the rows of all files.
+    :rtype: pl.LazyFrame
+    """
+    if not input_files:
+        raise FileNotFoundError("No input files to scan.")
+
+    lfs = [
+        scan_input_file(
+            x, file_type, options, cache_dir=cache_dir, cache_file_type=cache_file_type
+        )
+        for x in input_files
+    ]
+    if hive_partitioning:
+        lfs = [_add_hive_partitions(lf, x) for lf, x in zip(lfs, input_files)]
+
+    return pl.concat(lfs, how="diagonal_relaxed")
 
 
 def read_input_file(
     input_file: str,
     file_type: Optional[str] = None,
     options: Optional[Dict[str, Any]] = None,
+    cache_dir: Optional[str] = None,
+    cache_file_type: str = "parquet",
 ) -> pl.DataFrame:
     """
     Read an input file into a Polars DataFrame, supporting formats such as
-    Parquet, TSV (optionally gzipped), and CSV (optionally gzipped).
+    Parquet, Arrow IPC (Feather), TSV (optionally gzipped), and CSV (optionally
+    gzipped).
 
-    :param input_file: The full path to the file to be read.
+    Arrow IPC files are memory-mapped by Polars when they are uncompressed, so
+    that processes reading the same file share the operating system's page
+    cache instead of holding private copies of the data.
+
+    :param input_file: The full path to the file to be read. A directory or a
+                       glob pattern is expanded with :func:`list_input_files`
+                       and read with :func:`read_input_files`.
     :type input_file: str
     :param file_type: The file format. Must be one of:
                       - "parquet"
+                      - "ipc"
                       - "tsv"
                       - "tsv.gz"
                       - "csv"
@@ -37,6 +495,15 @@ def read_input_file(
                     the Polars reading function (e.g., "has_header", "infer_schema_length").
                     Defaults to None.
     :type options: Optional[Dict[str, Any]]
+    :param cache_dir: If set, text files are converted once into cache files
+                      in this directory with :func:`get_cached_input_file`,
+                      and later reads use the cached copy. Defaults to None.
+    :type cache_dir: Optional[str]
+    :param cache_file_type: The format of cached files. With "ipc", Parquet
+                            files are cached as well, as uncompressed Arrow
+                            IPC files that can be memory-mapped. Defaults to
+                            "parquet".
+    :type cache_file_type: str
     :raises FileNotFoundError: If the specified ``input_file`` does not exist.
     :raises ValueError: If the file type cannot be inferred or is not supported.
     :return: A Polars DataFrame containing the contents of the file.
@@ -47,34 +514,36 @@ def read_input_file(
       >>> # Assuming 'data.parquet' and 'data.tsv.gz' exist for demonstration
       >>> # df = read_input_file("data.parquet")
       >>> # df2 = read_input_file("data.tsv.gz", file_type="tsv.gz", options={"has_header": True})
+      >>> # df3 = read_input_file("dataset/year=*/*.parquet")
     """
+    if is_multi_file_input(input_file):
+        return read_input_files(
+            list_input_files(input_file, file_type),
+            file_type,
+            options,
+            cache_dir=cache_dir,
+            cache_file_type=cache_file_type,
+        )
+
     if not os.path.exists(input_file):
         raise FileNotFoundError(f"File '{input_file}' does not exist.")
 
+    input_file, file_type, options = _resolve_cached_input(
+        input_file, file_type, options, cache_dir, cache_file_type
+    )
+
     if options is None:
         options = {}
 
     # Infer file type based on file extension if not provided.
     if not file_type:
-        filename = os.path.basename(input_file).lower()
-        if filename.endswith(".parquet"):
-            file_type = "parquet"
-        elif filename.endswith(".tsv.gz"):
-            file_type = "tsv.gz"
-        elif filename.endswith(".tsv"):
-            file_type = "tsv"
-        elif filename.endswith(".csv.gz"):
-            file_type = "csv.gz"
-        elif filename.endswith(".csv"):
-            file_type = "csv"
-        else:
-            raise ValueError(
-                "Could not infer file type automatically. Please specify 'file_type' explicitly."
-            )
+        file_type = _infer_file_type(input_file)
 
     # Read the file using the appropriate Polars function.
     if file_type == "parquet":
         df = pl.read_parquet(input_file, **options)
+    elif file_type == "ipc":
+        df = pl.read_ipc(input_file, **options)
     elif file_type in ("tsv", "tsv.gz"):
         df = pl.read_csv(input_file, separator="\t", **options)
     elif file_type in ("csv", "csv.gz"):
@@ -82,7 +551,464 @@ def read_input_file(
     else:
         raise ValueError(
             f"Unsupported file_type '{file_type}'. Must be one of: "
-            "'parquet', 'tsv', 'tsv.gz', 'csv', 'csv.gz'."
+            "'parquet', 'ipc', 'tsv', 'tsv.gz', 'csv', 'csv.gz'."
         )
 
     return df
+
+
+def scan_input_file(
+    input_file: str,
+    file_type: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None,
+    cache_dir: Optional[str] = None,
+    cache_file_type: str = "parquet",
+) -> pl.LazyFrame:
+    """
+    Lazily scan an input file into a Polars LazyFrame.
+
+    This is the lazy counterpart of :func:`read_input_file`. No data is read
+    until the returned LazyFrame is collected, which allows Polars to push
+    row filters and column selections down into the scan itself.
+
+    .. note::
+
+       Polars cannot scan gzipped text files lazily. For "tsv.gz" and
+       "csv.gz", the file is read eagerly and wrapped in a LazyFrame, so
+       later filters and selections still apply but do not reduce the
+       amount of data parsed.
+
+    When ``cache_dir`` is set, gzipped text files are scanned lazily from
+    their cached copy instead.
+
+    :param input_file: The full path to the file to be scanned. A directory or
+                       a glob pattern is expanded with :func:`list_input_files`
+                       and scanned with :func:`scan_input_files`.
+    :type input_file: str
+    :param file_type: The file format. Accepts the same values as
+                      :func:`read_input_file`. If set to None or an empty
+                      string, the file type is inferred from the file
+                      extension. Defaults to None.
+    :type file_type: Optional[str]
+    :param options: A dictionary of additional keyword arguments to pass to
+                    the Polars scanning function. Defaults to None.
+    :type options: Optional[Dict[str, Any]]
+    :param cache_dir: If set, text files are scanned from their cached copy,
+                      see :func:`read_input_file`. Defaults to None.
+    :type cache_dir: Optional[str]
+    :param cache_file_type: The format of cached files, see
+                            :func:`read_input_file`. Defaults to "parquet".
+    :type cache_file_type: str
+    :raises FileNotFoundError: If the specified ``input_file`` does not exist.
+    :raises ValueError: If the file type cannot be inferred or is not supported.
+    :return: A Polars LazyFrame over the contents of the file.
+    :rtype: pl.LazyFrame
+    """
+    if is_multi_file_input(input_file):
+        return scan_input_files(
+            list_input_files(input_file, file_type),
+            file_type,
+            options,
+            cache_dir=cache_dir,
+            cache_file_type=cache_file_type,
+        )
+
+    if not os.path.exists(input_file):
+        raise FileNotFoundError(f"File '{input_file}' does not exist.")
+
+    input_file, file_type, options = _resolve_cached_input(
+        input_file, file_type, options, cache_dir, cache_file_type
+    )
+
+    if options is None:
+        options = {}
+
+    if not file_type:
+        file_type = _infer_file_type(input_file)
+
+    if file_type == "parquet":
+        lf = pl.scan_parquet(input_file, **options)
+    elif file_type == "ipc":
+        lf = pl.scan_ipc(input_file, **options)
+    elif file_type == "tsv":
+        lf = pl.scan_csv(input_file, separator="\t", **options)
+    elif file_type == "csv":
+        lf = pl.scan_csv(input_file, **options)
+    elif file_type in ("tsv.gz", "csv.gz"):
+        lf = read_input_file(input_file, file_type, options).lazy()
+    else:
+        raise ValueError(
+            f"Unsupported file_type '{file_type}'. Must be one of: "
+            "'parquet', 'ipc', 'tsv', 'tsv.gz', 'csv', 'csv.gz'."
+        )
+
+    return lf
+
+
+def build_profile_index(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Build the profile index of a profile-clustered DataFrame.
+
+    The rows of each (``platform_code``, ``profile_no``) key must be stored
+    contiguously in ``df``, e.g. after sorting by these columns.
+
+    :param df: A DataFrame with ``platform_code`` and ``profile_no`` columns
+               whose rows are clustered by profile.
+    :type df: pl.DataFrame
+    :raises ValueError: If the rows of a profile are not contiguous.
+    :return: A DataFrame with ``platform_code``, ``profile_no``,
+             ``row_offset`` and ``row_count`` columns in row order.
+    :rtype: pl.DataFrame
+    """
+    profile_index = (
+        df.select("platform_code", "profile_no")
+        .with_row_index("row_offset")
+        .group_by(["platform_code", "profile_no"], maintain_order=True)
+        .agg(
+            pl.col("row_offset").first(),
+            pl.len().alias("row_count"),
+            (pl.col("row_offset").last() - pl.col("row_offset").first() + 1).alias(
+                "row_span"
+            ),
+        )
+    )
+    if (profile_index["row_span"] != profile_index["row_count"]).any():
+        raise ValueError("The rows of each profile must be stored contiguously.")
+
+    return profile_index.drop("row_span").with_columns(
+        pl.col("row_offset").cast(pl.Int64), pl.col("row_count").cast(pl.Int64)
+    )
+
+
+def write_profile_clustered_parquet(
+    df: pl.DataFrame,
+    profile_index: pl.DataFrame,
+    file_name: str,
+    row_group_size: int = 100000,
+) -> None:
+    """
+    Write profile-clustered data to a Parquet file with profile-aligned row groups.
+
+    Consecutive profiles are collected into a row group until it holds at
+    least ``row_group_size`` rows, so that no profile is split across row
+    groups and reading a profile by offset touches a single row group.
+
+    :param df: The profile-clustered DataFrame.
+    :type df: pl.DataFrame
+    :param profile_index: The profile index of ``df`` from :func:`build_profile_index`.
+    :type profile_index: pl.DataFrame
+    :param file_name: The path of the output Parquet file.
+    :type file_name: str
+    :param row_group_size: The minimum number of rows per row group, except for
+                           the last one. Defaults to 100000.
+    :type row_group_size: int
+    """
+    table = df.to_arrow()
+    with pq.ParquetWriter(file_name, table.schema) as writer:
+        start = 0
+        for row_offset, row_count in zip(
+            profile_index["row_offset"], profile_index["row_count"]
+        ):
+            end = row_offset + row_count
+            if end - start >= row_group_size:
+                writer.write_table(table.slice(start, end - start), end - start)
+                start = end
+        if start < table.num_rows or table.num_rows == 0:
+            length = table.num_rows - start
+            writer.write_table(table.slice(start, length), max(length, 1))
+
+
+def read_profile_rows(
+    input_file: str,
+    profile_index: pl.DataFrame,
+    profiles: pl.DataFrame,
+) -> pl.DataFrame:
+    """
+    Read the rows of selected profiles from a profile-clustered Parquet file.
+
+    The profiles are looked up in ``profile_index`` and every profile is read
+    as a slice of the file, so only the row groups holding the requested
+    profiles are decoded.
+
+    :param input_file: A Parquet file written by
+                       :func:`write_profile_clustered_parquet`.
+    :type input_file: str
+    :param profile_index: The profile index of ``input_file``.
+    :type profile_index: pl.DataFrame
+    :param profiles: A DataFrame with ``platform_code`` and ``profile_no``
+                     columns identifying the profiles to read.
+    :type profiles: pl.DataFrame
+    :return: The rows of the selected profiles in file order.
+    :rtype: pl.DataFrame
+    """
+    lf = pl.scan_parquet(input_file)
+    offsets = (
+        profile_index.join(
+            profiles.select("platform_code", "profile_no").unique(),
+            on=["platform_code", "profile_no"],
+            how="semi",
+        )
+        .sort("row_offset")
+        .select("row_offset", "row_count")
+    )
+    if offsets.is_empty():
+        return lf.head(0).collect()
+
+    return pl.concat(
+        [
+            lf.slice(x["row_offset"], x["row_count"])
+            for x in offsets.iter_rows(named=True)
+        ]
+    ).collect()
+
+
+def iter_input_file_batches(
+    input_file: str,
+    file_type: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None,
+    batch_size: int = 1000000,
+) -> Iterator[pl.DataFrame]:
+    """
+    Read a CSV, TSV (optionally gzipped) or Parquet file in batches.
+
+    The file is decompressed and split into batches of ``batch_size`` lines,
+    and each batch is parsed with :func:`polars.read_csv`. Only one batch is
+    held in memory at a time. Unless a ``schema`` option is given, the column
+    types are first inferred from all batches and widened to a common type,
+    so that every batch has the same schema even if, for example, a column
+    only has decimal values in a later batch. Text files are therefore read
+    twice. Types given in the ``schema_overrides`` option take precedence. Parquet
+    files are streamed in batches of ``batch_size`` rows with
+    :meth:`pyarrow.parquet.ParquetFile.iter_batches` unless options other
+    than ``columns`` are given. Other files are read with
+    :func:`read_input_file` as one batch.
+
+    .. note::
+
+       Lines are split without parsing quotes, so quoted fields must not
+       contain line breaks. The ``skip_rows`` and ``n_rows`` options are not
+       supported.
+
+    :param input_file: The full path to the file to be read.
+    :type input_file: str
+    :param file_type: The file format. Defaults to None, which infers it from
+                      the file extension.
+    :type file_type: Optional[str]
+    :param options: Additional keyword arguments passed to the Polars reader.
+    :type options: Optional[Dict[str, Any]]
+    :param batch_size: The number of lines per batch. Defaults to 1000000.
+    :type batch_size: int
+    :raises FileNotFoundError: If ``input_file`` does not exist.
+    :raises ValueError: If the file type is not supported or an unsupported
+                        option is given for a text file.
+    :return: An iterator over the parsed batches.
+    :rtype: Iterator[pl.DataFrame]
+    """
+    if not os.path.exists(input_file):
+        raise FileNotFoundError(f"File '{input_file}' does not exist.")
+
+    if not file_type:
+        file_type = _infer_file_type(input_file)
+    if file_type == "parquet" and set(options or {}) <= {"columns"}:
+        parquet_file = pq.ParquetFile(input_file)
+        for batch in parquet_file.iter_batches(
+            batch_size=batch_size, columns=(options or {}).get("columns")
+        ):
+            yield pl.from_arrow(batch)
+        return
+    if file_type not in _TEXT_FILE_TYPES:
+        yield read_input_file(input_file, file_type, options)
+        return
+
+    options = dict(options or {})
+    for option in ("skip_rows", "n_rows"):
+        if option in options:
+            raise ValueError(f"Option '{option}' is not supported for batched reading.")
+    if file_type in ("tsv", "tsv.gz"):
+        options["separator"] = "\t"
+
+    if "schema" not in options:
+        schema = None
+        for header, lines in _iter_line_batches(
+            input_file, file_type, options, batch_size
+        ):
+            batch_schema = _parse_lines(
+                header, lines, {**options, "infer_schema_length": None}
+            ).schema
+            schema = (
+                batch_schema
+                if schema is None
+                else pl.concat(
+                    [pl.DataFrame(schema=schema), pl.DataFrame(schema=batch_schema)],
+                    how="vertical_relaxed",
+                ).schema
+            )
+        options["schema_overrides"] = {
+            **dict(schema),
+            **options.get("schema_overrides", {}),
+        }
+
+    for header, lines in _iter_line_batches(input_file, file_type, options, batch_size):
+        yield _parse_lines(header, lines, options)
+
+
+def _iter_line_batches(
+    input_file: str, file_type: str, options: Dict[str, Any], batch_size: int
+) -> Iterator[Tuple[bytes, List[bytes]]]:
+    """
+    Split a text file into its header and batches of ``batch_size`` lines.
+
+    At least one batch is returned, so that an empty file still has a schema.
+
+    :return: An iterator over the header and the lines of every batch.
+    :rtype: Iterator[Tuple[bytes, List[bytes]]]
+    """
+    opener = gzip.open if file_type.endswith(".gz") else open
+    with opener(input_file, "rb") as f:
+        header = f.readline() if options.get("has_header", True) else b""
+        lines = []
+        n_batches = 0
+        for line in f:
+            lines.append(line)
+            if len(lines) >= batch_size:
+                yield header, lines
+                n_batches += 1
+                lines = []
+        if lines or n_batches == 0:
+            yield header, lines
+
+
+def _parse_lines(
+    header: bytes, lines: List[bytes], options: Dict[str, Any]
+) -> pl.DataFrame:
+    """
+    Parse a header and a batch of text lines with :func:`polars.read_csv`.
+
+    :return: The parsed batch.
+    :rtype: pl.DataFrame
+    """
+    return pl.read_csv(io.BytesIO(header + b"".join(lines)), **options)
+
+
+def stage_input_file(
+    input_file: str,
+    staging_file: str,
+    file_type: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None,
+    batch_size: int = 1000000,
+    transform: Optional[Callable[[pl.DataFrame], pl.DataFrame]] = None,
+    hive_partitioning: bool = True,
+) -> str:
+    """
+    Convert a large input file into a Parquet staging file batch by batch.
+
+    Every batch from :func:`iter_input_file_batches` gets its Hive partition
+    columns, is passed through ``transform`` (e.g. renaming and filtering),
+    and is appended to ``staging_file`` as a row group. Peak memory is
+    therefore bounded by the batch size rather than by the file size.
+
+    :param input_file: The full path to the file to be read.
+    :type input_file: str
+    :param staging_file: The path of the Parquet file to write.
+    :type staging_file: str
+    :param file_type: The file format. Defaults to None, which infers it from
+                      the file extension.
+    :type file_type: Optional[str]
+    :param options: Additional keyword arguments passed to the Polars reader.
+    :type options: Optional[Dict[str, Any]]
+    :param batch_size: The number of lines per batch. Defaults to 1000000.
+    :type batch_size: int
+    :param transform: A function applied to every batch. It must return
+                      batches with the same schema. Defaults to None.
+    :type transform: Optional[Callable[[pl.DataFrame], pl.DataFrame]]
+    :param hive_partitioning: If True, add the values of ``key=value``
+                              directories as columns. Defaults to True.
+    :type hive_partitioning: bool
+    :return: The path of the staging file.
+    :rtype: str
+    """
+    writer = None
+    try:
+        for batch in iter_input_file_batches(
+            input_file, file_type, options, batch_size
+        ):
+            if hive_partitioning:
+                batch = _add_hive_partitions(batch, input_file)
+            if transform is not None:
+                batch = transform(batch)
+            table = batch.to_arrow()
+            if writer is None:
+                writer = pq.ParquetWriter(staging_file, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return staging_file
+
+
+def get_file_fingerprint(input_file: str, content_hash: bool = False) -> Dict[str, Any]:
+    """
+    Describe a file cheaply enough to detect whether it has changed.
+
+    The fingerprint contains the absolute path, size and modification time.
+    For Parquet files, a hash of the footer metadata (row counts, row group
+    layout and column statistics) is added, which only needs the footer to be
+    read. If ``content_hash`` is True, a SHA-256 hash of the whole file is
+    added as well.
+
+    :param input_file: The path of the file.
+    :type input_file: str
+    :param content_hash: If True, hash the file content. Defaults to False.
+    :type content_hash: bool
+    :raises FileNotFoundError: If ``input_file`` does not exist.
+    :return: A dictionary describing the file.
+    :rtype: Dict[str, Any]
+    """
+    if not os.path.exists(input_file):
+        raise FileNotFoundError(f"File '{input_file}' does not exist.")
+
+    stat = os.stat(input_file)
+    fingerprint = {
+        "path": os.path.abspath(str(input_file)),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+    }
+
+    try:
+        is_parquet = _infer_file_type(str(input_file)) == "parquet"
+    except ValueError:
+        is_parquet = False
+    if is_parquet:
+        metadata = pq.ParquetFile(input_file).metadata
+        fingerprint["num_rows"] = metadata.num_rows
+        fingerprint["footer"] = hashlib.sha256(
+            json.dumps(metadata.to_dict(), sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    if content_hash:
+        sha256 = hashlib.sha256()
+        with open(input_file, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                sha256.update(block)
+        fingerprint["content"] = sha256.hexdigest()
+
+    return fingerprint
+
+
+def get_input_fingerprint(input_files: List[str], content_hash: bool = False) -> str:
+    """
+    Combine the fingerprints of several input files into one hash.
+
+    :param input_files: The list of input files.
+    :type input_files: List[str]
+    :param content_hash: If True, include a hash of each file's content.
+                         Defaults to False.
+    :type content_hash: bool
+    :return: A SHA-256 hex digest of the fingerprints from
+             :func:`get_file_fingerprint`.
+    :rtype: str
+    """
+    fingerprints = [get_file_fingerprint(x, content_hash) for x in sorted(input_files)]
+
+    return hashlib.sha256(json.dumps(fingerprints, sort_keys=True).encode()).hexdigest()
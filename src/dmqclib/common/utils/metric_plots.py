@@ -1,10 +1,31 @@
+import functools
 import os
+import threading
+
 import matplotlib.pyplot as plt
 import numpy as np
 import polars as pl
 from sklearn.metrics import auc, precision_recall_curve, roc_curve
 
+# pyplot keeps global state, so figures are created and saved one at a time
+# when several data sets are processed in parallel threads.
+_PLOT_LOCK = threading.Lock()
+
+
+def _with_plot_lock(func):
+    """
+    Run the decorated plotting function while holding :data:`_PLOT_LOCK`.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _PLOT_LOCK:
+            return func(*args, **kwargs)
+
+    return wrapper
+
 
+@_with_plot_lock
 def create_metric_plots(model) -> None:
     """
     Create and save ROC and Precision-Recall plots as an SVG file.
@@ -0,0 +1,237 @@
+"""
+This module provides mergeable sketches of numeric columns for summary
+statistics.
+
+A sketch keeps, per group and variable, the count, sum, sum of squares,
+minimum and maximum of the values together with a compressed list of
+weighted centroids. Two sketches of disjoint data can be merged without the
+original rows, so statistics can be updated incrementally or computed over
+data read in batches. The count-based statistics (min, max, mean and standard
+deviation) are exact; quantiles are estimated from the centroids, with a rank
+error of roughly ``1 / sketch_size``.
+"""
+
+from typing import Dict, List, Optional
+
+import polars as pl
+
+#: The default maximum number of centroids kept per group and variable.
+DEFAULT_SKETCH_SIZE: int = 2000
+
+#: The quantiles estimated by :func:`get_sketch_stats`, keyed by column name.
+SKETCH_QUANTILES: Dict[str, float] = {
+    "pct2.5": 0.025,
+    "pct25": 0.25,
+    "median": 0.5,
+    "pct75": 0.75,
+    "pct97.5": 0.975,
+}
+
+
+def create_sketch(
+    df: pl.DataFrame,
+    val_col_names: List[str],
+    group_col_names: Optional[List[str]] = None,
+    sketch_size: int = DEFAULT_SKETCH_SIZE,
+) -> pl.DataFrame:
+    """
+    Build sketches of the given columns of a DataFrame.
+
+    :param df: The data to summarise.
+    :type df: pl.DataFrame
+    :param val_col_names: The numeric columns to sketch.
+    :type val_col_names: List[str]
+    :param group_col_names: Columns defining separate sketches, such as
+                            ``platform_code`` and ``profile_no``. Defaults to
+                            None, which builds one sketch per column.
+    :type group_col_names: Optional[List[str]]
+    :param sketch_size: The maximum number of centroids per sketch.
+                        Defaults to :data:`DEFAULT_SKETCH_SIZE`.
+    :type sketch_size: int
+    :return: One row per group and variable with the columns ``count``,
+             ``sum``, ``sum_sq``, ``min``, ``max`` and ``centroids``.
+    :rtype: pl.DataFrame
+    """
+    group_col_names = group_col_names or []
+    values = (
+        df.select(group_col_names + val_col_names)
+        .unpivot(
+            index=group_col_names,
+            on=val_col_names,
+            variable_name="variable",
+            value_name="value",
+        )
+        .with_columns(pl.col("value").cast(pl.Float64), pl.lit(1.0).alias("weight"))
+        .drop_nulls("value")
+    )
+    key_col_names = group_col_names + ["variable"]
+    moments = values.group_by(key_col_names).agg(
+        pl.len().cast(pl.Int64).alias("count"),
+        pl.col("value").sum().alias("sum"),
+        (pl.col("value") ** 2).sum().alias("sum_sq"),
+        pl.col("value").min().alias("min"),
+        pl.col("value").max().alias("max"),
+    )
+
+    return moments.join(
+        _compress_centroids(values, key_col_names, sketch_size),
+        on=key_col_names,
+        how="left",
+    )
+
+
+def merge_sketches(
+    sketches: List[pl.DataFrame],
+    group_col_names: Optional[List[str]] = None,
+    sketch_size: int = DEFAULT_SKETCH_SIZE,
+) -> pl.DataFrame:
+    """
+    Merge sketches of disjoint data into one sketch per group and variable.
+
+    :param sketches: Sketches created by :func:`create_sketch` or this
+                     function, with the same group columns.
+    :type sketches: List[pl.DataFrame]
+    :param group_col_names: The group columns of the sketches. Defaults to None.
+    :type group_col_names: Optional[List[str]]
+    :param sketch_size: The maximum number of centroids per merged sketch.
+                        Defaults to :data:`DEFAULT_SKETCH_SIZE`.
+    :type sketch_size: int
+    :return: The merged sketch.
+    :rtype: pl.DataFrame
+    """
+    key_col_names = (group_col_names or []) + ["variable"]
+    sketch = pl.concat(sketches, how="vertical_relaxed")
+    moments = sketch.group_by(key_col_names).agg(
+        pl.col("count").sum(),
+        pl.col("sum").sum(),
+        pl.col("sum_sq").sum(),
+        pl.col("min").min(),
+        pl.col("max").max(),
+    )
+    centroids = (
+        sketch.select(key_col_names + ["centroids"])
+        .explode("centroids")
+        .unnest("centroids")
+    )
+
+    return moments.join(
+        _compress_centroids(centroids, key_col_names, sketch_size),
+        on=key_col_names,
+        how="left",
+    )
+
+
+def get_sketch_stats(
+    sketch: pl.DataFrame, group_col_names: Optional[List[str]] = None
+) -> pl.DataFrame:
+    """
+    Compute summary statistics from sketches.
+
+    ``min``, ``max``, ``mean`` and ``sd`` are derived exactly from the
+    moments. The quantiles of :data:`SKETCH_QUANTILES` are interpolated
+    linearly between the centroids and clipped to the minimum and maximum.
+
+    :param sketch: Sketches created by :func:`create_sketch` or
+                   :func:`merge_sketches`.
+    :type sketch: pl.DataFrame
+    :param group_col_names: The group columns of the sketches. Defaults to None.
+    :type group_col_names: Optional[List[str]]
+    :return: One row per group and variable with the columns ``min``, ``max``,
+             ``mean``, ``sd`` and the quantile columns.
+    :rtype: pl.DataFrame
+    """
+    key_col_names = (group_col_names or []) + ["variable"]
+    moments = sketch.select(
+        key_col_names
+        + [
+            pl.col("min"),
+            pl.col("max"),
+            (pl.col("sum") / pl.col("count")).alias("mean"),
+            pl.when(pl.col("count") > 1)
+            .then(
+                (
+                    (pl.col("sum_sq") - pl.col("sum") ** 2 / pl.col("count"))
+                    / (pl.col("count") - 1)
+                )
+                .clip(lower_bound=0)
+                .sqrt()
+            )
+            .alias("sd"),
+        ]
+    )
+    centroids = (
+        sketch.select(key_col_names + ["centroids"])
+        .explode("centroids")
+        .unnest("centroids")
+        .drop_nulls("value")
+        .with_columns(
+            (
+                (pl.col("weight").cum_sum() - pl.col("weight") / 2)
+                / pl.col("weight").sum()
+            )
+            .over(key_col_names)
+            .alias("rank")
+        )
+    )
+    quantiles = centroids.group_by(key_col_names).agg(
+        [_interpolate(q).alias(name) for name, q in SKETCH_QUANTILES.items()]
+    )
+
+    return moments.join(quantiles, on=key_col_names, how="left").with_columns(
+        pl.col(name).clip(pl.col("min"), pl.col("max")) for name in SKETCH_QUANTILES
+    )
+
+
+def _interpolate(q: float) -> pl.Expr:
+    """
+    Build an aggregation that interpolates the value at rank ``q`` between
+    the centroids of a group.
+    """
+    lower = pl.col("rank") <= q
+    upper = pl.col("rank") >= q
+    rank_lo = pl.col("rank").filter(lower).last()
+    rank_hi = pl.col("rank").filter(upper).first()
+    value_lo = pl.col("value").filter(lower).last()
+    value_hi = pl.col("value").filter(upper).first()
+
+    return (
+        pl.when(rank_hi > rank_lo)
+        .then(value_lo + (value_hi - value_lo) * (q - rank_lo) / (rank_hi - rank_lo))
+        .otherwise(pl.coalesce(value_lo, value_hi))
+    )
+
+
+def _compress_centroids(
+    values: pl.DataFrame, key_col_names: List[str], sketch_size: int
+) -> pl.DataFrame:
+    """
+    Merge neighbouring weighted values into at most ``sketch_size`` centroids
+    of similar weight per group.
+
+    :return: One row per group with a ``centroids`` list of
+             ``{value, weight}`` structs sorted by value.
+    :rtype: pl.DataFrame
+    """
+    return (
+        values.select(key_col_names + ["value", "weight"])
+        .sort(key_col_names + ["value"])
+        .with_columns(
+            (
+                (pl.col("weight").cum_sum() - pl.col("weight") / 2)
+                / pl.col("weight").sum()
+                * sketch_size
+            )
+            .floor()
+            .over(key_col_names)
+            .alias("bin")
+        )
+        .group_by(key_col_names + ["bin"], maintain_order=True)
+        .agg(
+            ((pl.col("value") * pl.col("weight")).sum() / pl.col("weight").sum()).alias(
+                "value"
+            ),
+            pl.col("weight").sum(),
+        )
+        .group_by(key_col_names, maintain_order=True)
+        .agg(pl.struct(["value", "weight"]).alias("centroids"))
+    )
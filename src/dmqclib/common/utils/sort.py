@@ -0,0 +1,120 @@
+"""
+This module provides utilities for input data whose rows are sorted by
+``platform_code``, ``profile_no`` and ``observation_no``.
+
+When this sort order is known, the rows of every profile are contiguous and
+ordered by observation, so one observation can be located by its position
+instead of through a hash table. :func:`join_sorted` uses this to replace the
+observation-level hash joins of the feature and locate steps with a binary
+search on a sorted integer key.
+"""
+
+from typing import List, Optional
+
+import polars as pl
+
+#: The columns defining the sort order of the input data.
+SORT_COL_NAMES: List[str] = ["platform_code", "profile_no", "observation_no"]
+
+
+def is_sorted_by(df: pl.DataFrame, col_names: Optional[List[str]] = None) -> bool:
+    """
+    Check whether the rows of a DataFrame are sorted by the given columns.
+
+    The columns are compared lexicographically in the given order, as in
+    :meth:`polars.DataFrame.sort`. Columns missing from ``df`` are ignored.
+
+    :param df: The DataFrame to check.
+    :type df: pl.DataFrame
+    :param col_names: The sort columns. Defaults to :data:`SORT_COL_NAMES`.
+    :type col_names: Optional[List[str]]
+    :return: True if the rows are sorted in ascending order.
+    :rtype: bool
+    """
+    col_names = [x for x in (col_names or SORT_COL_NAMES) if x in df.columns]
+    if not col_names or df.height < 2:
+        return True
+
+    return df.select(pl.struct(col_names)).to_series().is_sorted()
+
+
+def join_sorted(
+    left: pl.DataFrame,
+    right: pl.DataFrame,
+    check_sortedness: bool = True,
+) -> pl.DataFrame:
+    """
+    Inner join ``right`` onto ``left`` on :data:`SORT_COL_NAMES`, keeping the
+    row order of ``left``.
+
+    The result equals
+    ``left.join(right, on=SORT_COL_NAMES, maintain_order="left")`` when the
+    key is unique in ``right``. ``right`` must be sorted by
+    :data:`SORT_COL_NAMES`, such as the input data after the ``sort_order``
+    option of the input step. Each profile of ``right`` is numbered with
+    :meth:`polars.Expr.rle_id`, and the profile number and ``observation_no``
+    are combined into an integer key that is sorted across the whole frame.
+    The rows of ``left`` are then found with a binary search on this key, so
+    no hash table is built over ``right``.
+
+    If ``check_sortedness`` is True and the rows of a profile in ``right``
+    are not contiguous or not ordered by ``observation_no``, the function
+    falls back to the hash join.
+
+    :param left: The rows to look up, with the columns of
+                 :data:`SORT_COL_NAMES`.
+    :type left: pl.DataFrame
+    :param right: The sorted data providing the remaining columns.
+    :type right: pl.DataFrame
+    :param check_sortedness: Whether to verify the key order of ``right``.
+                             Defaults to True.
+    :type check_sortedness: bool
+    :return: The rows of ``left`` found in ``right``, with the columns of both.
+    :rtype: pl.DataFrame
+    """
+    profile_col_names = SORT_COL_NAMES[:2]
+    right = right.with_columns(
+        pl.struct(profile_col_names).rle_id().cast(pl.Int64).alias("_profile_rank")
+    ).with_columns(_row_key().alias("_row_key"))
+    row_keys = right.get_column("_row_key")
+    profiles = right.select(profile_col_names + ["_profile_rank"]).filter(
+        pl.col("_profile_rank").diff().fill_null(1) != 0
+    )
+    if right.height == 0 or (
+        check_sortedness
+        and (
+            not row_keys.is_sorted()
+            or profiles.select(profile_col_names).is_duplicated().any()
+        )
+    ):
+        return left.join(
+            right.drop(["_profile_rank", "_row_key"]),
+            on=SORT_COL_NAMES,
+            maintain_order="left",
+        )
+
+    left = left.join(
+        profiles, on=profile_col_names, how="left", maintain_order="left"
+    ).with_columns(_row_key().fill_null(-1).alias("_row_key"))
+    positions = (
+        row_keys.set_sorted()
+        .search_sorted(left.get_column("_row_key"), side="left")
+        .clip(0, right.height - 1)
+    )
+    matched = right.drop(SORT_COL_NAMES + ["_profile_rank"])[positions]
+
+    return (
+        pl.concat(
+            [left.drop("_profile_rank"), matched.rename({"_row_key": "_right_key"})],
+            how="horizontal",
+        )
+        .filter(pl.col("_row_key") == pl.col("_right_key"))
+        .drop(["_row_key", "_right_key"])
+    )
+
+
+def _row_key() -> pl.Expr:
+    """
+    Combine ``_profile_rank`` and ``observation_no`` into one integer key.
+    """
+    return pl.col("_profile_rank") * (1 << 32) + pl.col("observation_no").cast(pl.Int64)
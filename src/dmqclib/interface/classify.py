@@ -6,6 +6,10 @@ based on the parameters defined in a provided configuration object, ensuring a s
 and customizable data quality control process.
 """
 
+from typing import Optional
+
+import polars as pl
+
 from dmqclib.common.base.config_base import ConfigBase
 
 from dmqclib.common.loader.classify_loader import (
@@ -19,7 +23,9 @@ from dmqclib.common.loader.classify_loader import (
 )
 
 
-def classify_dataset(config: ConfigBase) -> None:
+def classify_dataset(
+    config: ConfigBase, input_data: Optional[pl.DataFrame] = None
+) -> None:
     """
     Execute a series of steps to classify all observations in the given data set, as defined
     by the provided configuration object.
@@ -37,6 +43,11 @@ def classify_dataset(config: ConfigBase) -> None:
     :param config: A configuration object specifying the classes and parameters
                    for each step in the dataset preparation and classification process.
     :type config: ConfigBase
+    :param input_data: Input data that has already been read and filtered,
+                       e.g. by :func:`dmqclib.interface.runner.run_data_sets`
+                       for several data sets sharing one input. If None, the
+                       input is read with the input step. Defaults to None.
+    :type input_data: Optional[pl.DataFrame]
     :return: None. The function performs I/O operations and modifies datasets based
              on the configuration but does not return a value.
     :rtype: None
@@ -48,10 +59,15 @@ def classify_dataset(config: ConfigBase) -> None:
       >>> classify_dataset(cfg)
     """
     ds_input = load_classify_step1_input_dataset(config)
-    ds_input.read_input_data()
+    if input_data is None:
+        ds_input.read_input_data()
+        if ds_input.profile_index is not None:
+            ds_input.write_profile_clustered_data()
+    else:
+        ds_input.input_data = input_data
 
     ds_summary = load_classify_step2_summary_dataset(config, ds_input.input_data)
-    ds_summary.calculate_stats()
+    ds_summary.calculate_stats_cached(ds_input)
     ds_summary.write_summary_stats()
 
     ds_select = load_classify_step3_select_dataset(config, ds_input.input_data)
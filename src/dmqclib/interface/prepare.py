@@ -7,6 +7,10 @@ entry point for initiating the multi-stage data pipeline, from raw input
 to final training and validation datasets.
 """
 
+from typing import Optional
+
+import polars as pl
+
 from dmqclib.common.base.config_base import ConfigBase
 from dmqclib.common.loader.dataset_loader import load_step1_input_dataset
 from dmqclib.common.loader.dataset_loader import load_step2_summary_dataset
@@ -16,7 +20,9 @@ from dmqclib.common.loader.dataset_loader import load_step5_extract_dataset
 from dmqclib.common.loader.dataset_loader import load_step6_split_dataset
 
 
-def create_training_dataset(config: ConfigBase) -> None:
+def create_training_dataset(
+    config: ConfigBase, input_data: Optional[pl.DataFrame] = None
+) -> None:
     """
     Execute a series of steps to produce a training dataset.
 
@@ -32,7 +38,8 @@ def create_training_dataset(config: ConfigBase) -> None:
     2.  **Summary Statistics Calculation:** Computes and stores aggregate
         statistics from the input data.
     3.  **Profile Selection:** Identifies and labels specific profiles or
-        data subsets based on criteria.
+        data subsets based on criteria. The input data is then restricted
+        once to the selected profiles for the next two steps.
     4.  **Target Row Location:** Pinpoints and extracts specific rows of interest
         within the selected profiles.
     5.  **Feature Extraction:** Derives and extracts relevant features for
@@ -45,6 +52,11 @@ def create_training_dataset(config: ConfigBase) -> None:
                    for each step in the dataset preparation process. This object
                    guides how each data loading and processing step is performed.
     :type config: dmqclib.common.base.config_base.ConfigBase
+    :param input_data: Input data that has already been read and filtered,
+                       e.g. by :func:`dmqclib.interface.runner.run_data_sets`
+                       for several data sets sharing one input. If None, the
+                       input is read with the input step. Defaults to None.
+    :type input_data: Optional[pl.DataFrame]
     :return: None. This function performs I/O operations (reading input, writing
              intermediate and final datasets) and does not return any value.
     :rtype: None
@@ -59,19 +71,27 @@ def create_training_dataset(config: ConfigBase) -> None:
         create_training_dataset(cfg)
     """
     ds_input = load_step1_input_dataset(config)
-    ds_input.read_input_data()
+    if input_data is None:
+        ds_input.read_input_data()
+        if ds_input.profile_index is not None:
+            ds_input.write_profile_clustered_data()
+    else:
+        ds_input.input_data = input_data
 
     ds_summary = load_step2_summary_dataset(config, ds_input.input_data)
-    ds_summary.calculate_stats()
+    ds_summary.calculate_stats_cached(ds_input)
     ds_summary.write_summary_stats()
 
     ds_select = load_step3_select_dataset(config, ds_input.input_data)
     ds_select.label_profiles()
     ds_select.write_selected_profiles()
+    ds_select.create_profile_input()
 
     ds_locate = load_step4_locate_dataset(
         config, ds_input.input_data, ds_select.selected_profiles
     )
+    ds_locate.profile_catalog = ds_select.profile_catalog
+    ds_locate.profile_input = ds_select.profile_input
     ds_locate.process_targets()
     ds_locate.write_selected_rows()
 
@@ -81,6 +101,7 @@ def create_training_dataset(config: ConfigBase) -> None:
         ds_select.selected_profiles,
         ds_locate.selected_rows,
         ds_summary.summary_stats,
+        ds_select.profile_input,
     )
     ds_extract.process_targets()
     ds_extract.write_target_features()
@@ -0,0 +1,209 @@
+"""
+This module runs the preparation or classification pipelines of several data
+sets from one YAML configuration file.
+
+Data sets in one file often read the same input file with different target or
+feature sets. :func:`run_data_sets` reads and filters each distinct input only
+once and then runs the pipelines of the data sets sharing it concurrently on
+the same in-memory DataFrame.
+"""
+
+import copy
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import polars as pl
+
+from dmqclib.common.base.config_base import ConfigBase
+from dmqclib.common.config.classify_config import ClassificationConfig
+from dmqclib.common.config.dataset_config import DataSetConfig
+from dmqclib.common.loader.classify_loader import load_classify_step1_input_dataset
+from dmqclib.common.loader.dataset_loader import load_step1_input_dataset
+from dmqclib.interface.classify import classify_dataset
+from dmqclib.interface.config import read_config
+from dmqclib.interface.prepare import create_training_dataset
+from dmqclib.prepare.step1_read_input.input_base import InputDataSetBase
+
+
+def run_data_sets(
+    file_name: str,
+    set_names: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    n_cpus: Optional[int] = None,
+) -> None:
+    """
+    Run the pipelines of several data sets defined in one configuration file.
+
+    The file must contain a ``data_sets`` section, whose sets are processed
+    with :func:`dmqclib.interface.prepare.create_training_dataset`, or a
+    ``classification_sets`` section, whose sets are processed with
+    :func:`dmqclib.interface.classify.classify_dataset`. See
+    :func:`run_configs` for how inputs are shared and how the CPU budget is
+    applied.
+
+    :param file_name: The path to the YAML configuration file.
+    :type file_name: str
+    :param set_names: The names of the data sets to run. Defaults to None,
+                      which runs all data sets in the file.
+    :type set_names: Optional[List[str]]
+    :param max_workers: The maximum number of data sets processed at the same
+                        time. Defaults to None, see :func:`run_configs`.
+    :type max_workers: Optional[int]
+    :param n_cpus: The number of CPUs shared by all data sets. Defaults to None.
+    :type n_cpus: Optional[int]
+    :raises ValueError: If the file does not contain ``data_sets`` or
+                        ``classification_sets``.
+    """
+    config = read_config(file_name, auto_select=False)
+    if not isinstance(config, (DataSetConfig, ClassificationConfig)):
+        raise ValueError(
+            "Only 'data_sets' and 'classification_sets' can be run with run_data_sets."
+        )
+
+    if set_names is None:
+        set_names = [x["name"] for x in config.full_config[config.section_name]]
+
+    configs = [read_config(file_name, set_name=x, auto_select=False) for x in set_names]
+    run_configs(configs, max_workers=max_workers, n_cpus=n_cpus)
+
+
+def run_configs(
+    configs: List[ConfigBase],
+    max_workers: Optional[int] = None,
+    n_cpus: Optional[int] = None,
+) -> None:
+    """
+    Run the pipelines of several selected configurations, sharing their inputs.
+
+    The configurations are grouped by :func:`get_input_key`. For every group,
+    the input is read and filtered once by the input step of the first
+    configuration, and the pipelines of all configurations in the group are
+    run concurrently in a thread pool on the shared DataFrame.
+
+    The number of concurrent pipelines is ``max_workers`` if it is set,
+    otherwise ``n_cpus`` if it is set, otherwise the number of CPUs of the
+    host, and never more than the number of configurations. If ``n_cpus`` is
+    set, ``n_cpus`` is split evenly across the concurrent pipelines and the
+    share is set as ``n_jobs`` in the ``model_params`` of classification
+    sets. The share is applied to copies of the configurations, so the
+    configurations passed in are not changed. Polars uses its own thread
+    pool, which is shared by all pipelines.
+
+    :param configs: Selected :class:`DataSetConfig` or
+                    :class:`ClassificationConfig` objects.
+    :type configs: List[ConfigBase]
+    :param max_workers: The maximum number of configurations processed at the
+                        same time. Defaults to None.
+    :type max_workers: Optional[int]
+    :param n_cpus: The number of CPUs shared by all configurations.
+                   Defaults to None.
+    :type n_cpus: Optional[int]
+    :raises ValueError: If a configuration is neither a :class:`DataSetConfig`
+                        nor a :class:`ClassificationConfig`.
+    """
+    if not configs:
+        return
+    pipelines = [_get_pipeline(x) for x in configs]
+
+    n_workers = min(max_workers or n_cpus or os.cpu_count() or 1, len(configs))
+    if n_cpus is not None:
+        n_jobs = max(1, n_cpus // n_workers)
+        configs = [copy.deepcopy(x) for x in configs]
+        for config in configs:
+            model_params = (
+                config.data["step_param_set"]["steps"]
+                .get("model", {})
+                .get("model_params")
+            )
+            if model_params is not None:
+                model_params["n_jobs"] = n_jobs
+
+    groups: Dict[str, List[int]] = {}
+    for i, config in enumerate(configs):
+        groups.setdefault(get_input_key(config), []).append(i)
+
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        futures = []
+        for idx in groups.values():
+            input_data = _read_shared_input([configs[i] for i in idx])
+            futures.extend(
+                executor.submit(pipelines[i], configs[i], input_data) for i in idx
+            )
+        for future in futures:
+            future.result()
+
+
+def get_input_key(config: ConfigBase) -> str:
+    """
+    Build a key that is equal for configurations that read the same input data.
+
+    The key consists of the resolved input file name, the input step class and
+    the input step parameters. If ``lazy_scan`` or ``compact_schema`` is
+    enabled, the result also depends on the target and feature columns, so
+    the used column names are added to the key.
+
+    :param config: A selected :class:`DataSetConfig` or
+                   :class:`ClassificationConfig`.
+    :type config: ConfigBase
+    :return: A JSON string identifying the input data.
+    :rtype: str
+    """
+    ds_input = _load_input_dataset(config)
+    input_params = config.get_step_params("input")
+    key = {
+        "input_file_name": os.path.abspath(str(ds_input.input_file_name)),
+        "base_class": config.get_base_class("input"),
+        "input_params": input_params,
+    }
+    if input_params.get("lazy_scan", False) or input_params["sub_steps"].get(
+        "compact_schema", False
+    ):
+        key["col_names"] = ds_input.get_used_col_names()
+
+    return json.dumps(key, sort_keys=True, default=str)
+
+
+def _get_pipeline(config: ConfigBase) -> Callable:
+    """
+    Return the pipeline function for a configuration.
+
+    :raises ValueError: If the configuration type is not supported.
+    """
+    if isinstance(config, DataSetConfig):
+        return create_training_dataset
+    if isinstance(config, ClassificationConfig):
+        return classify_dataset
+
+    raise ValueError(f"Configuration class {type(config).__name__} is not supported.")
+
+
+def _load_input_dataset(config: ConfigBase) -> InputDataSetBase:
+    """
+    Instantiate the input step of a configuration with the matching loader.
+    """
+    if isinstance(config, ClassificationConfig):
+        return load_classify_step1_input_dataset(config)
+
+    return load_step1_input_dataset(config)
+
+
+def _read_shared_input(configs: List[ConfigBase]) -> pl.DataFrame:
+    """
+    Read the input of the first configuration and write the profile-clustered
+    copy for every configuration if ``cluster_profiles`` is enabled.
+
+    :return: The input data shared by all configurations.
+    :rtype: pl.DataFrame
+    """
+    ds_input = _load_input_dataset(configs[0])
+    ds_input.read_input_data()
+    if ds_input.profile_index is not None:
+        for config in configs:
+            ds = _load_input_dataset(config)
+            ds.input_data = ds_input.input_data
+            ds.profile_index = ds_input.profile_index
+            ds.write_profile_clustered_data()
+
+    return ds_input.input_data
@@ -7,6 +7,7 @@ per-profile levels, and format the results for human-readable output.
 """
 
 import io
+import math
 import os
 import pprint
 from typing import List, Dict
@@ -16,9 +17,16 @@ import polars as pl
 from dmqclib.common.config.dataset_config import DataSetConfig
 from dmqclib.common.loader.dataset_loader import load_step1_input_dataset
 from dmqclib.common.loader.dataset_loader import load_step2_summary_dataset
+from dmqclib.common.utils.file import iter_input_file_batches
 
 
-def get_summary_stats(input_file: str, summary_type: str) -> pl.DataFrame:
+def get_summary_stats(
+    input_file: str,
+    summary_type: str,
+    approximate: bool = False,
+    rank_error: float = 0.01,
+    batch_size: int = 1000000,
+) -> pl.DataFrame:
     """Calculate and retrieve summary statistics from a dataset file.
 
     This function loads a dataset, computes global and per-profile summary
@@ -26,13 +34,30 @@ def get_summary_stats(input_file: str, summary_type: str) -> pl.DataFrame:
     It uses a built-in configuration template and dynamically sets the input
     path based on the provided file.
 
+    If ``approximate`` is True, the file is streamed in batches with
+    :func:`dmqclib.common.utils.file.iter_input_file_batches` and the
+    statistics are estimated with
+    :meth:`dmqclib.prepare.step2_calc_stats.summary_base.SummaryStatsBase.calculate_stats_from_batches`,
+    so that the whole file never has to be held in memory. Quantiles then
+    have a rank error of about ``rank_error``.
+
     :param input_file: The path to the input dataset file (e.g., a TSV or Parquet file).
     :type input_file: str
     :param summary_type: The type of summary to return. Supported values are
                          "profiles" (for per-profile stats) and "all" (for global stats).
     :type summary_type: str
+    :param approximate: Whether to estimate the statistics from batches.
+                        Defaults to False.
+    :type approximate: bool
+    :param rank_error: The approximate rank error of the quantiles in
+                       approximate mode. Defaults to 0.01.
+    :type rank_error: float
+    :param batch_size: The number of rows per batch in approximate mode.
+                       Defaults to 1000000.
+    :type batch_size: int
     :raises FileNotFoundError: If the ``input_file`` does not exist.
-    :raises ValueError: If the ``summary_type`` is not a supported value.
+    :raises ValueError: If the ``summary_type`` is not a supported value, or
+                        if ``rank_error`` is not between 0 and 1.
     :return: A Polars DataFrame containing the requested summary statistics.
     :rtype: polars.DataFrame
     """
@@ -44,10 +69,28 @@ def get_summary_stats(input_file: str, summary_type: str) -> pl.DataFrame:
     config.data["input_file_name"] = os.path.basename(input_file)
 
     ds_input = load_step1_input_dataset(config)
-    ds_input.read_input_data()
-
-    ds_summary = load_step2_summary_dataset(config, ds_input.input_data)
-    ds_summary.calculate_stats()
+    if approximate:
+        if not 0 < rank_error < 1:
+            raise ValueError("rank_error must be between 0 and 1.")
+        input_params = config.get_step_params("input")
+        batches = (
+            ds_input.process_batch(batch)
+            for file_name in ds_input.get_input_files()
+            for batch in iter_input_file_batches(
+                file_name,
+                input_params.get("file_type"),
+                input_params.get("read_file_options", {}),
+                batch_size=batch_size,
+            )
+        )
+        ds_summary = load_step2_summary_dataset(config)
+        ds_summary.calculate_stats_from_batches(
+            batches, sketch_size=math.ceil(1 / rank_error)
+        )
+    else:
+        ds_input.read_input_data()
+        ds_summary = load_step2_summary_dataset(config, ds_input.input_data)
+        ds_summary.calculate_stats()
     ds_summary.create_summary_stats_observation()
     ds_summary.create_summary_stats_profile()
 
@@ -91,22 +91,14 @@ class BasicValues(FeatureBase):
 
     def _add_features(self, col_name: str) -> None:
         """
-        Join the specified column from :attr:`filtered_input` onto :attr:`features`.
+        Join the specified column from :attr:`filtered_input` onto :attr:`features`
+        with :meth:`join_observation_values`.
 
         :param col_name: The name of the column to add as a feature.
         :type col_name: str
         """
-        self.features = self.features.join(
-            (
-                self.filtered_input.select(
-                    pl.col("platform_code"),
-                    pl.col("profile_no"),
-                    pl.col("observation_no"),
-                    pl.col(col_name),
-                )
-            ),
-            on=["platform_code", "profile_no", "observation_no"],
-            maintain_order="left",
+        self.features = self.join_observation_values(self.features, col_name).rename(
+            {"value": col_name}
         )
 
     def _clean_features(self) -> None:
@@ -144,16 +144,7 @@ class FlankDown(FeatureBase):
         :type col_name: str
         """
         self._feature_wide = (
-            self._expanded_observations.join(
-                self.filtered_input.select(
-                    pl.col("platform_code"),
-                    pl.col("profile_no"),
-                    pl.col("observation_no"),
-                    pl.col(col_name).alias("value"),
-                ),
-                on=["platform_code", "profile_no", "observation_no"],
-                maintain_order="left",
-            )
+            self.join_observation_values(self._expanded_observations, col_name)
             .with_columns(
                 pl.concat_str(
                     [
@@ -5,11 +5,12 @@ from Polars DataFrames. It is designed to extract, transform, and optionally
 scale statistical features based on pre-computed summary data.
 """
 
-from typing import Optional, Dict
+from typing import Dict, List, Optional, Tuple
 
 import polars as pl
 
 from dmqclib.common.base.feature_base import FeatureBase
+from dmqclib.prepare.step2_calc_stats.summary_base import SummaryStatsBase
 
 
 class ProfileSummaryStats(FeatureBase):
@@ -96,9 +97,8 @@ class ProfileSummaryStats(FeatureBase):
 
           1. :meth:`_filter_selected_rows_cols` - initialize :attr:`features` by selecting
              base columns (row_id, platform_code, profile_no).
-          2. For each top-level key and subkey in :attr:`feature_info["stats"]`,
-             call :meth:`_extract_single_summary` to join in the corresponding
-             metric from :attr:`summary_stats`.
+          2. Call :meth:`_extract_summaries` to join every requested metric of
+             every variable from the wide per-profile statistics at once.
           3. Drop columns (platform_code, profile_no) that are no longer needed in
              the final feature set.
         """
@@ -109,8 +109,7 @@ class ProfileSummaryStats(FeatureBase):
             for variable_name in self.feature_info["col_names"]
             for metric_name in self.feature_info["summary_stats_names"]
         ]
-        for variable_name, metric_name in variables_and_metrics:
-            self._extract_single_summary(variable_name, metric_name)
+        self._extract_summaries(variables_and_metrics)
 
         self.features = self.features.drop(["platform_code", "profile_no"])
 
@@ -123,24 +122,38 @@ class ProfileSummaryStats(FeatureBase):
             ["row_id", "platform_code", "profile_no"]
         )
 
-    def _extract_single_summary(self, variable_name: str, metric_name: str) -> None:
+    def _extract_summaries(self, variables_and_metrics: List[Tuple[str, str]]) -> None:
         """
-        Join a single summary statistic (e.g., min, mean, max) from :attr:`summary_stats`
-        onto :attr:`features`.
-
-        :param variable_name: The variable category key (e.g., "temp", "psal") in
-                              :attr:`summary_stats`. This was previously named `target_name`.
-        :type variable_name: str
-        :param metric_name: The specific metric key (e.g., "min", "mean", "max")
-                            under the variable category. This was previously named `var_name`.
-        :type metric_name: str
+        Join several summary statistics onto :attr:`features` with one join.
+
+        The statistics are taken from :attr:`summary_stats_wide` if the
+        extract step has provided it; otherwise :attr:`summary_stats` is
+        reshaped with
+        :meth:`dmqclib.prepare.step2_calc_stats.summary_base.SummaryStatsBase.pivot_summary_stats`.
+
+        :param variables_and_metrics: Pairs of variable and metric names,
+                                      such as ``("temp", "mean")``.
+        :type variables_and_metrics: List[Tuple[str, str]]
         """
+        summary_stats_wide = self.summary_stats_wide
+        if summary_stats_wide is None:
+            summary_stats_wide = SummaryStatsBase.pivot_summary_stats(
+                self.summary_stats
+            )
+
+        col_names = [f"{x}_{y}" for x, y in variables_and_metrics]
+        missing_col_names = [
+            x for x in col_names if x not in summary_stats_wide.columns
+        ]
+        if missing_col_names:
+            # No profile has statistics of these variables, so no row matches,
+            # as with a separate join per statistic.
+            summary_stats_wide = summary_stats_wide.clear().with_columns(
+                pl.lit(None, dtype=pl.Float64).alias(x) for x in missing_col_names
+            )
+
         self.features = self.features.join(
-            self.summary_stats.filter(pl.col("variable") == variable_name).select(
-                pl.col("platform_code"),
-                pl.col("profile_no"),
-                pl.col(metric_name).alias(f"{variable_name}_{metric_name}"),
-            ),
+            summary_stats_wide.select(["platform_code", "profile_no"] + col_names),
             on=["platform_code", "profile_no"],
             maintain_order="left",
         )
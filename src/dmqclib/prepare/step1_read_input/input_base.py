@@ -6,13 +6,28 @@ and filtering rows based on configurable parameters, serving as a base for
 domain-specific input data handling.
 """
 
-from typing import Optional
+import hashlib
+import os
+import tempfile
+import warnings
+from typing import List, Optional
 
 import polars as pl
 
 from dmqclib.common.base.config_base import ConfigBase
 from dmqclib.common.base.dataset_base import DataSetBase
-from dmqclib.common.utils.file import read_input_file
+from dmqclib.common.utils.file import (
+    build_profile_index,
+    get_hive_partitions,
+    get_input_fingerprint,
+    is_multi_file_input,
+    list_input_files,
+    read_input_files,
+    scan_input_files,
+    stage_input_file,
+    write_profile_clustered_parquet,
+)
+from dmqclib.common.utils.sort import SORT_COL_NAMES, is_sorted_by
 
 
 class InputDataSetBase(DataSetBase):
@@ -26,10 +41,24 @@ class InputDataSetBase(DataSetBase):
     and :meth:`filter_rows` to handle domain-specific requirements.
 
     :ivar input_file_name: The absolute or resolved file path from which data will be read.
+        It may also be a directory, a glob pattern, or a Hive-partitioned dataset.
     :vartype input_file_name: str
     :ivar input_data: Polars DataFrame holding the loaded input data. Defaults to None
         until :meth:`read_input_data` is called.
     :vartype input_data: Optional[polars.DataFrame]
+    :ivar key_col_names: Columns that identify profiles and observations. They are
+        always kept when :meth:`select_columns` limits the input columns.
+    :vartype key_col_names: List[str]
+    :ivar profile_index: Row offset and row count of every profile in
+        :attr:`input_data`, set by :meth:`cluster_profiles`. Defaults to None.
+    :vartype profile_index: Optional[polars.DataFrame]
+    :ivar output_file_name: The path of the profile-clustered copy of the input
+        written by :meth:`write_profile_clustered_data`. It is placed in the
+        ``profile_index`` folder of the data set, not next to the raw input.
+    :vartype output_file_name: str
+    :ivar index_file_name: The path of the profile index written alongside
+        :attr:`output_file_name`.
+    :vartype index_file_name: str
     """
 
     def __init__(self, config: ConfigBase) -> None:
@@ -52,31 +81,460 @@ class InputDataSetBase(DataSetBase):
             folder_name_auto=False,
         )
         self.input_data: Optional[pl.DataFrame] = None
+        self.key_col_names: List[str] = [
+            "platform_code",
+            "profile_no",
+            "profile_timestamp",
+            "longitude",
+            "latitude",
+            "observation_no",
+            "pres",
+        ]
+        self.profile_index: Optional[pl.DataFrame] = None
+        self.output_file_name: str = self.config.get_full_file_name(
+            step_name="profile_index",
+            default_file_name="profile_clustered_input.parquet",
+        )
+        self.index_file_name: str = self.config.get_full_file_name(
+            step_name="profile_index", default_file_name="profile_index.parquet"
+        )
 
     def read_input_data(self) -> None:
         """
         Load data from the configured file into :attr:`input_data`.
 
         The method retrieves ``file_type`` and ``read_file_options`` from the config
-        and uses :func:`dmqclib.common.utils.file.read_input_file` to read the file
-        specified by :attr:`input_file_name`.
+        and uses :func:`dmqclib.common.utils.file.read_input_files` to read the
+        files returned by :meth:`get_input_files`. A directory, glob pattern or
+        Hive-partitioned dataset is read concurrently, using at most
+        ``max_workers`` threads if it is set in the input step parameters.
+        If ``cache_dir`` is set, CSV and TSV files are read from copies cached in
+        that directory, in the format given by ``cache_file_type``.
+
+        After reading the data, it optionally calls :meth:`rename_columns`,
+        :meth:`filter_rows`, :meth:`compact_schema`, :meth:`cluster_profiles`
+        and :meth:`verify_sort_order` to modify the DataFrame.
 
-        After reading the data, it optionally calls :meth:`rename_columns` and
-        :meth:`filter_rows` to modify the DataFrame.
+        If ``lazy_scan`` is enabled in the input step parameters, the files are
+        scanned with :func:`dmqclib.common.utils.file.scan_input_files` instead.
+        Renaming, year filtering and :meth:`select_columns` are then applied to
+        the LazyFrame, so that the year predicate and the column projection are
+        pushed into the scan before the data is collected.
+
+        If ``batch_size`` is set, the files are read in batches with
+        :meth:`read_input_data_batched` instead, which bounds peak memory
+        for very large text files.
 
         :raises FileNotFoundError: If the specified file cannot be found.
         :raises polars.exceptions.NoDataError: If the file is empty or cannot be parsed.
         :raises Exception: For other errors during file reading or processing.
         """
-        input_file = self.input_file_name
-        file_type = self.config.get_step_params("input").get("file_type")
-        read_file_options = self.config.get_step_params("input").get(
-            "read_file_options", {}
-        )
+        input_params = self.config.get_step_params("input")
+        file_type = input_params.get("file_type")
+        read_file_options = input_params.get("read_file_options", {})
+        input_files = self.get_input_files()
+        hive_partitioning = is_multi_file_input(self.input_file_name)
 
-        self.input_data = read_input_file(input_file, file_type, read_file_options)
+        if input_params.get("batch_size"):
+            self.read_input_data_batched(input_files, hive_partitioning)
+            self.compact_schema()
+            self.cluster_profiles()
+            self.verify_sort_order()
+        elif input_params.get("lazy_scan", False):
+            self.input_data = scan_input_files(
+                input_files,
+                file_type,
+                read_file_options,
+                hive_partitioning=hive_partitioning,
+                cache_dir=input_params.get("cache_dir"),
+                cache_file_type=input_params.get("cache_file_type", "parquet"),
+            )
+            self.rename_columns()
+            self.filter_rows()
+            self.select_columns()
+            self.compact_schema()
+            self.input_data = self.input_data.collect()
+            self.cluster_profiles()
+            self.verify_sort_order()
+        else:
+            self.input_data = read_input_files(
+                input_files,
+                file_type,
+                read_file_options,
+                max_workers=input_params.get("max_workers"),
+                hive_partitioning=hive_partitioning,
+                cache_dir=input_params.get("cache_dir"),
+                cache_file_type=input_params.get("cache_file_type", "parquet"),
+            )
+            self.rename_columns()
+            self.filter_rows()
+            self.compact_schema()
+            self.cluster_profiles()
+            self.verify_sort_order()
+
+    def read_input_data_batched(
+        self, input_files: List[str], hive_partitioning: bool = False
+    ) -> None:
+        """
+        Load data into :attr:`input_data` by staging the files batch by batch.
+
+        Every file is read in batches of ``batch_size`` lines with
+        :func:`dmqclib.common.utils.file.stage_input_file`, each batch is
+        passed through :meth:`process_batch`, and the result is written to a
+        Parquet staging file. The staging files are created in ``staging_dir``
+        from the input step parameters (the system temporary directory by
+        default) and removed after they have been read.
+
+        :param input_files: The list of files to read.
+        :type input_files: List[str]
+        :param hive_partitioning: If True, add the values of ``key=value``
+                                  directories as columns. Defaults to False.
+        :type hive_partitioning: bool
+        """
+        input_params = self.config.get_step_params("input")
+        staging_dir = input_params.get("staging_dir")
+        if staging_dir:
+            os.makedirs(staging_dir, exist_ok=True)
+
+        with tempfile.TemporaryDirectory(dir=staging_dir) as tmp_dir:
+            staging_files = [
+                stage_input_file(
+                    file_name,
+                    os.path.join(tmp_dir, f"part-{i}.parquet"),
+                    input_params.get("file_type"),
+                    input_params.get("read_file_options", {}),
+                    batch_size=input_params["batch_size"],
+                    transform=self.process_batch,
+                    hive_partitioning=hive_partitioning,
+                )
+                for i, file_name in enumerate(input_files)
+            ]
+            self.input_data = read_input_files(
+                staging_files,
+                "parquet",
+                max_workers=input_params.get("max_workers"),
+                hive_partitioning=False,
+            )
+
+    def process_batch(self, batch: pl.DataFrame) -> pl.DataFrame:
+        """
+        Apply :meth:`rename_columns` and :meth:`filter_rows` to one batch.
+
+        If ``lazy_scan`` is enabled, :meth:`select_columns` is applied as well,
+        so that unused columns are dropped before the batch is staged.
+
+        :param batch: A batch of input rows.
+        :type batch: pl.DataFrame
+        :return: The processed batch.
+        :rtype: pl.DataFrame
+        """
+        self.input_data = batch
         self.rename_columns()
         self.filter_rows()
+        if self.config.get_step_params("input").get("lazy_scan", False):
+            self.select_columns()
+
+        return self.input_data
+
+    def get_input_fingerprint(self, content_hash: Optional[bool] = None) -> str:
+        """
+        Compute a fingerprint of the files returned by :meth:`get_input_files`.
+
+        The fingerprint is built from the size, modification time and Parquet
+        footer of every file with
+        :func:`dmqclib.common.utils.file.get_input_fingerprint`, so it can be
+        computed without reading the data.
+
+        :param content_hash: If True, also hash the file contents. Defaults to
+                             None, which uses ``content_hash`` from the input
+                             step parameters (False if absent).
+        :type content_hash: Optional[bool]
+        :raises FileNotFoundError: If no input file can be found.
+        :return: A SHA-256 hex digest.
+        :rtype: str
+        """
+        if content_hash is None:
+            content_hash = self.config.get_step_params("input").get(
+                "content_hash", False
+            )
+
+        return get_input_fingerprint(self.get_input_files(), content_hash)
+
+    def get_cache_key(
+        self, keys: Optional[List[str]] = None, content_hash: Optional[bool] = None
+    ) -> str:
+        """
+        Build a cache key from the input fingerprint and the configuration.
+
+        The key changes if the input files or the selected part of the
+        configuration change, so a step can skip work when its key matches
+        the key stored with earlier results.
+
+        :param keys: Top-level configuration keys passed to
+                     :meth:`dmqclib.common.base.config_base.ConfigBase.get_config_hash`.
+                     Defaults to None, which uses the whole configuration.
+        :type keys: Optional[List[str]]
+        :param content_hash: Passed to :meth:`get_input_fingerprint`.
+        :type content_hash: Optional[bool]
+        :return: A SHA-256 hex digest.
+        :rtype: str
+        """
+        key = self.get_input_fingerprint(content_hash) + self.config.get_config_hash(
+            keys
+        )
+
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def get_input_files(self) -> List[str]:
+        """
+        Resolve :attr:`input_file_name` into the list of files to be read.
+
+        A single file is returned as is. A directory or glob pattern is expanded
+        with :func:`dmqclib.common.utils.file.list_input_files`, and files in
+        Hive partitions excluded by the year filter are skipped via
+        :meth:`prune_partitions`.
+
+        :raises FileNotFoundError: If no input file can be found.
+        :return: A list of file paths.
+        :rtype: List[str]
+        """
+        file_type = self.config.get_step_params("input").get("file_type")
+        input_files = list_input_files(self.input_file_name, file_type)
+        if is_multi_file_input(self.input_file_name):
+            input_files = self.prune_partitions(input_files)
+
+        return input_files
+
+    def prune_partitions(self, input_files: List[str]) -> List[str]:
+        """
+        Remove files whose ``year`` Hive partition is excluded by the year filter.
+
+        The ``remove_years`` and ``keep_years`` entries of ``filter_method_dict``
+        are applied to the ``year=...`` partition value of each file, so that
+        whole files are skipped before reading. Files without a ``year``
+        partition are always kept. Row-level filtering in :meth:`filter_rows`
+        is still applied afterwards.
+
+        :param input_files: The list of candidate files.
+        :type input_files: List[str]
+        :return: The files that may contain rows passing the year filter.
+        :rtype: List[str]
+        """
+        input_params = self.config.get_step_params("input")
+        if (
+            not input_params["sub_steps"]["filter_rows"]
+            or "filter_method_dict" not in input_params
+        ):
+            return input_files
+        remove_years = input_params["filter_method_dict"].get("remove_years") or []
+        keep_years = input_params["filter_method_dict"].get("keep_years") or []
+
+        pruned_files = []
+        for file_name in input_files:
+            year = get_hive_partitions(file_name).get("year")
+            if year is not None and (
+                year in remove_years or (len(keep_years) > 0 and year not in keep_years)
+            ):
+                continue
+            pruned_files.append(file_name)
+
+        return pruned_files
+
+    def get_used_col_names(self) -> List[str]:
+        """
+        Collect the names of the input columns that the configuration uses.
+
+        These are :attr:`key_col_names`, the target value and flag columns
+        from ``target_set``, and the ``col_names`` of every entry in
+        ``feature_param_set``.
+
+        :return: A de-duplicated list of column names in order of first appearance.
+        :rtype: List[str]
+        """
+        col_names = list(self.key_col_names)
+        for target in self.config.get_target_variables():
+            col_names.extend([target["name"], target["flag"]])
+        for feature_param in self.config.data["feature_param_set"]["params"]:
+            col_names.extend(feature_param.get("col_names", []))
+
+        return list(dict.fromkeys(col_names))
+
+    def select_columns(self) -> None:
+        """
+        Restrict :attr:`input_data` to the columns returned by
+        :meth:`get_used_col_names`.
+
+        The original column order of the input is preserved. Columns that the
+        configuration refers to but that are absent from the input are ignored
+        here and surface later in the step that needs them.
+        """
+        used_col_names = set(self.get_used_col_names())
+        input_col_names = self.input_data.collect_schema().names()
+        self.input_data = self.input_data.select(
+            [x for x in input_col_names if x in used_col_names]
+        )
+
+    def compact_schema(self) -> None:
+        """
+        Downcast :attr:`input_data` to a compact in-memory layout.
+
+        If ``sub_steps.compact_schema`` is enabled, the target value columns
+        and ``longitude``/``latitude`` are cast to ``Float32``, the target flag
+        columns to ``Int8``, and ``platform_code`` to ``Categorical`` with the
+        global string cache enabled, so that categorical keys created in later
+        steps can be joined with each other. Columns that are absent or
+        already have a different type class are left untouched.
+
+        :raises polars.exceptions.InvalidOperationError: If a flag value does not
+                                                       fit into ``Int8``.
+        """
+        if not self.config.get_step_params("input")["sub_steps"].get(
+            "compact_schema", False
+        ):
+            return
+
+        # Newer Polars versions share categories globally and deprecate the
+        # string cache, in which case enabling it is a no-op.
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            pl.enable_string_cache()
+
+        schema = self.input_data.collect_schema()
+        value_col_names = ["longitude", "latitude"] + self.config.get_target_names()
+        flag_col_names = [x["flag"] for x in self.config.get_target_variables()]
+
+        exprs = [
+            pl.col(x).cast(pl.Float32)
+            for x in dict.fromkeys(value_col_names)
+            if x in schema and schema[x].is_float()
+        ]
+        exprs.extend(
+            pl.col(x).cast(pl.Int8)
+            for x in dict.fromkeys(flag_col_names)
+            if x in schema and schema[x].is_integer()
+        )
+        if "platform_code" in schema and schema["platform_code"] == pl.String:
+            exprs.append(pl.col("platform_code").cast(pl.Categorical))
+
+        self.input_data = self.input_data.with_columns(exprs)
+
+    def cluster_profiles(self) -> None:
+        """
+        Store the rows of each profile contiguously and index them.
+
+        If ``sub_steps.cluster_profiles`` is enabled, :attr:`input_data` is
+        sorted by ``platform_code``, ``profile_no`` and ``observation_no``, and
+        :attr:`profile_index` is built with
+        :func:`dmqclib.common.utils.file.build_profile_index`.
+        """
+        if not self.config.get_step_params("input")["sub_steps"].get(
+            "cluster_profiles", False
+        ):
+            return
+
+        sort_col_names = [
+            x
+            for x in ["platform_code", "profile_no", "observation_no"]
+            if x in self.input_data.columns
+        ]
+        self.input_data = self.input_data.sort(sort_col_names, maintain_order=True)
+        self.profile_index = build_profile_index(self.input_data)
+
+    def verify_sort_order(self) -> None:
+        """
+        Check or enforce the sort order of :attr:`input_data`.
+
+        If ``sort_order`` is set in the input step parameters, the rows must be
+        sorted by ``platform_code``, ``profile_no`` and ``observation_no``.
+        With ``"check"``, a ValueError is raised if they are not; with
+        ``"enforce"``, unsorted data is sorted. ``platform_code`` is then
+        marked as sorted, and the extract step looks up observations with
+        :func:`dmqclib.common.utils.sort.join_sorted` instead of hash joins.
+
+        :raises ValueError: If ``sort_order`` is ``"check"`` and the data is
+                            not sorted, if ``sort_order`` is not one of
+                            ``"check"`` and ``"enforce"``, or if the data has
+                            none of the sort columns.
+        """
+        sort_order = self.config.get_step_params("input").get("sort_order")
+        if sort_order is None:
+            return
+        if sort_order not in ("check", "enforce"):
+            raise ValueError(
+                f"Unsupported sort_order '{sort_order}'. "
+                "Must be one of: 'check', 'enforce'."
+            )
+
+        sort_col_names = [x for x in SORT_COL_NAMES if x in self.input_data.columns]
+        if not sort_col_names:
+            raise ValueError(
+                f"Input data has none of the sort columns: {', '.join(SORT_COL_NAMES)}."
+            )
+        if not is_sorted_by(self.input_data, sort_col_names):
+            if sort_order == "check":
+                raise ValueError(
+                    f"Input data is not sorted by {', '.join(sort_col_names)}."
+                )
+            self.input_data = self.input_data.sort(sort_col_names, maintain_order=True)
+
+        self.input_data = self.input_data.with_columns(
+            pl.col(sort_col_names[0]).set_sorted()
+        )
+
+    def get_profile_rows(self, profiles: pl.DataFrame) -> pl.DataFrame:
+        """
+        Return the rows of the given profiles by slicing :attr:`input_data`.
+
+        The profiles are looked up in :attr:`profile_index`, so no join with
+        the full input data is needed.
+
+        :param profiles: A DataFrame with ``platform_code`` and ``profile_no``
+                         columns identifying the profiles.
+        :type profiles: pl.DataFrame
+        :raises ValueError: If :attr:`profile_index` has not been built.
+        :return: The rows of the selected profiles in :attr:`input_data` order.
+        :rtype: pl.DataFrame
+        """
+        if self.profile_index is None:
+            raise ValueError("Member variable 'profile_index' must not be empty.")
+
+        offsets = self.profile_index.join(
+            profiles.select("platform_code", "profile_no").unique(),
+            on=["platform_code", "profile_no"],
+            how="semi",
+        ).sort("row_offset")
+        row_idx = offsets.select(
+            pl.int_ranges(
+                pl.col("row_offset"), pl.col("row_offset") + pl.col("row_count")
+            ).explode()
+        ).to_series()
+
+        return self.input_data[row_idx]
+
+    def write_profile_clustered_data(self) -> None:
+        """
+        Write the profile-clustered input data and its profile index.
+
+        The data is written to :attr:`output_file_name` with row groups that
+        end on profile boundaries and hold at least ``row_group_size`` rows
+        (from the input step parameters, 100000 by default). The index is
+        written to :attr:`index_file_name`.
+
+        :raises ValueError: If :attr:`profile_index` is None, i.e. the
+                            ``cluster_profiles`` sub-step is disabled.
+        """
+        if self.profile_index is None:
+            raise ValueError("Member variable 'profile_index' must not be empty.")
+
+        os.makedirs(os.path.dirname(self.output_file_name), exist_ok=True)
+        write_profile_clustered_parquet(
+            self.input_data,
+            self.profile_index,
+            self.output_file_name,
+            self.config.get_step_params("input").get("row_group_size", 100000),
+        )
+        os.makedirs(os.path.dirname(self.index_file_name), exist_ok=True)
+        self.profile_index.write_parquet(self.index_file_name)
 
     def rename_columns(self) -> None:
         """
@@ -135,12 +593,8 @@ class InputDataSetBase(DataSetBase):
         years = self.config.get_step_params("input")["filter_method_dict"][
             "remove_years"
         ]
-        self.input_data = (
-            self.input_data.with_columns(
-                pl.col("profile_timestamp").dt.year().alias("year")
-            )
-            .filter(~pl.col("year").is_in(years))
-            .drop("year")
+        self.input_data = self.input_data.filter(
+            ~pl.col("profile_timestamp").dt.year().is_in(years)
         )
 
     def keep_years(self) -> None:
@@ -155,10 +609,6 @@ class InputDataSetBase(DataSetBase):
                                                      present in :attr:`input_data`.
         """
         years = self.config.get_step_params("input")["filter_method_dict"]["keep_years"]
-        self.input_data = (
-            self.input_data.with_columns(
-                pl.col("profile_timestamp").dt.year().alias("year")
-            )
-            .filter(pl.col("year").is_in(years))
-            .drop("year")
+        self.input_data = self.input_data.filter(
+            pl.col("profile_timestamp").dt.year().is_in(years)
         )
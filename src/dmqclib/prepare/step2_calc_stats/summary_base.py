@@ -6,13 +6,24 @@ It facilitates the computation of both global and per-profile statistics for
 specified numeric columns and handles the output of these statistics to a file.
 """
 
+import glob
+import hashlib
+import json
 import os
-from typing import Optional, List
+import tempfile
+from typing import Dict, Iterable, List, Optional
 
 import polars as pl
 
 from dmqclib.common.base.config_base import ConfigBase
 from dmqclib.common.base.dataset_base import DataSetBase
+from dmqclib.prepare.step1_read_input.input_base import InputDataSetBase
+from dmqclib.common.utils.sketch import (
+    DEFAULT_SKETCH_SIZE,
+    create_sketch,
+    get_sketch_stats,
+    merge_sketches,
+)
 
 
 class SummaryStatsBase(DataSetBase):
@@ -39,8 +50,28 @@ class SummaryStatsBase(DataSetBase):
     :ivar summary_stats_profile: DataFrame holding aggregated per-profile statistics
                                  for key variables.
     :vartype summary_stats_profile: polars.DataFrame or None
+    :ivar summary_stats_wide: DataFrame holding the per-profile statistics
+                              with one row per profile and one
+                              ``<variable>_<statistic>`` column per variable
+                              and statistic.
+    :vartype summary_stats_wide: polars.DataFrame or None
+    :ivar sketch_file_name: The path of the sketch file used by the
+                            incremental mode.
+    :vartype sketch_file_name: str
+    :ivar summary_sketch: Mergeable sketches of the global statistics,
+                          computed in incremental mode.
+    :vartype summary_sketch: polars.DataFrame or None
     :ivar val_col_names: List of numeric columns for which to compute statistics.
     :vartype val_col_names: list[str]
+    :ivar required_stats: The statistics needed by the feature set, keyed by
+                          variable, if ``stats_mode`` is ``required``.
+                          None computes every statistic of every column in
+                          :attr:`val_col_names`.
+    :vartype required_stats: dict[str, list[str]] or None
+    :ivar cache_dir: The directory of the summary statistics cache, from the
+                     ``cache_dir`` summary step parameter. None disables
+                     the cache.
+    :vartype cache_dir: str or None
     :ivar stats_col_names: The schema (column names) for the output statistics
                            DataFrame.
     :vartype stats_col_names: list[str]
@@ -64,7 +95,8 @@ class SummaryStatsBase(DataSetBase):
         :raises NotImplementedError: If ``expected_class_name`` is not defined by
                                      a subclass upon instantiation.
         :raises ValueError: If the configuration's ``base_class`` does not match
-                            the ``expected_class_name``.
+                            the ``expected_class_name``, or if ``stats_mode``
+                            is neither ``full`` nor ``required``.
         """
         super().__init__(step_name="summary", config=config)
 
@@ -76,6 +108,11 @@ class SummaryStatsBase(DataSetBase):
         self.summary_stats: Optional[pl.DataFrame] = None
         self.summary_stats_observation: Optional[pl.DataFrame] = None
         self.summary_stats_profile: Optional[pl.DataFrame] = None
+        self.summary_stats_wide: Optional[pl.DataFrame] = None
+        self.sketch_file_name: str = self.config.get_full_file_name(
+            step_name="summary", default_file_name="summary_sketch.parquet"
+        )
+        self.summary_sketch: Optional[pl.DataFrame] = None
 
         self.val_col_names = [
             "longitude",
@@ -97,17 +134,61 @@ class SummaryStatsBase(DataSetBase):
         ]
         self.profile_col_names = ["platform_code", "profile_no"]
 
+        stats_mode = self.config.get_step_params("summary").get("stats_mode", "full")
+        if stats_mode not in ("full", "required"):
+            raise ValueError(
+                f"Summary stats_mode '{stats_mode}' is not supported. "
+                "Use 'full' or 'required'."
+            )
+        self.required_stats: Optional[Dict[str, List[str]]] = (
+            self.get_required_stats() if stats_mode == "required" else None
+        )
+        self.cache_dir: Optional[str] = self.config.get_step_params("summary").get(
+            "cache_dir"
+        )
+
+    def get_required_stats(self) -> Dict[str, List[str]]:
+        """Collect the statistics used by the features of the configuration.
+
+        Only ``profile_summary_stats`` features read :attr:`summary_stats`, so
+        the result combines their ``col_names`` and ``summary_stats_names``.
+
+        :returns: The required statistic names keyed by variable, in the order
+                  of the feature parameters.
+        :rtype: dict[str, list[str]]
+        """
+        required_stats: Dict[str, List[str]] = {}
+        for feature_info in self.config.data["feature_param_set"]["params"]:
+            if feature_info.get("feature") != "profile_summary_stats":
+                continue
+            for variable in feature_info["col_names"]:
+                stats_names = required_stats.setdefault(variable, [])
+                stats_names.extend(
+                    x
+                    for x in feature_info["summary_stats_names"]
+                    if x not in stats_names
+                )
+
+        return required_stats
+
     @staticmethod
-    def get_stats_expression(val_col_name: str) -> List[pl.Expr]:
+    def get_stats_expression(
+        val_col_name: str, stats_names: Optional[List[str]] = None
+    ) -> List[pl.Expr]:
         """Build a list of Polars expressions to compute summary statistics.
 
         :param val_col_name: The name of the column to analyze.
         :type val_col_name: str
+        :param stats_names: The statistics to compute. The other statistics
+                            are returned as null literals, so that the output
+                            keeps the same columns. Defaults to None, which
+                            computes all statistics.
+        :type stats_names: list[str] or None
         :returns: A list of Polars expressions for calculating min, max, mean,
                   median, quantiles, and standard deviation.
         :rtype: list[polars.Expr]
         """
-        return [
+        exprs = [
             pl.col(val_col_name).min().cast(pl.Float64).alias("min"),
             pl.col(val_col_name).max().cast(pl.Float64).alias("max"),
             pl.col(val_col_name).mean().cast(pl.Float64).alias("mean"),
@@ -118,6 +199,17 @@ class SummaryStatsBase(DataSetBase):
             pl.col(val_col_name).quantile(0.975).cast(pl.Float64).alias("pct97.5"),
             pl.col(val_col_name).std().cast(pl.Float64).alias("sd"),
         ]
+        if stats_names is None:
+            return exprs
+
+        return [
+            (
+                x
+                if x.meta.output_name() in stats_names
+                else pl.lit(None, dtype=pl.Float64).alias(x.meta.output_name())
+            )
+            for x in exprs
+        ]
 
     def calculate_global_stats(self, val_col_name: str) -> pl.DataFrame:
         """Compute global summary statistics for a specified column.
@@ -134,7 +226,9 @@ class SummaryStatsBase(DataSetBase):
         return (
             self.input_data.select(self.get_stats_expression(val_col_name))
             .with_columns(
-                pl.lit("all").alias("platform_code"),
+                pl.lit("all")
+                .cast(self.input_data.schema["platform_code"])
+                .alias("platform_code"),
                 pl.lit(0).alias("profile_no"),
                 pl.lit(val_col_name).alias("variable"),
             )
@@ -152,11 +246,20 @@ class SummaryStatsBase(DataSetBase):
         :param val_col_name: The name of the column for which to calculate
                              per-profile stats.
         :type val_col_name: str
-        :returns: A DataFrame containing statistics for each profile.
+        :returns: A DataFrame containing statistics for each profile. If
+                  :attr:`required_stats` is set and does not contain the
+                  column, the DataFrame is empty.
         :rtype: polars.DataFrame
         """
+        if self.required_stats is None:
+            stats_names = None
+        else:
+            stats_names = self.required_stats.get(val_col_name)
+            if stats_names is None:
+                return self.get_empty_stats()
+
         return (
-            grouped_df.agg(self.get_stats_expression(val_col_name))
+            grouped_df.agg(self.get_stats_expression(val_col_name, stats_names))
             .with_columns(pl.lit(val_col_name).alias("variable"))
             .select(self.stats_col_names)
         )
@@ -167,21 +270,468 @@ class SummaryStatsBase(DataSetBase):
         This method computes statistics for each column in :attr:`val_col_names`
         at both the global and per-profile level, then concatenates them into
         a single DataFrame stored in :attr:`summary_stats`.
+
+        If ``fused`` is enabled in the summary step parameters,
+        :meth:`calculate_stats_fused` is used instead. If ``incremental`` is
+        enabled, :meth:`calculate_stats_incremental` is used.
+
+        If :attr:`required_stats` is set, only the per-profile statistics in
+        it are computed and the global rows are omitted, as only
+        ``profile_summary_stats`` features read :attr:`summary_stats` in the
+        pipeline. Statistics that are not required are null.
         """
+        summary_params = self.config.get_step_params("summary")
+        if summary_params.get("incremental", False):
+            self.calculate_stats_incremental()
+            return
+        if summary_params.get("fused", False):
+            self.calculate_stats_fused()
+            return
+
+        grouped_df = self.input_data.group_by(self.profile_col_names)
+        if self.required_stats is not None:
+            self.summary_stats = pl.concat(
+                [self.get_empty_stats()]
+                + [
+                    self.calculate_profile_stats(grouped_df, x)
+                    for x in self.required_stats
+                ]
+            )
+            return
+
         global_stats = pl.concat(
             [self.calculate_global_stats(x) for x in self.val_col_names]
         )
-        grouped_df = self.input_data.group_by(self.profile_col_names)
         profile_stats = pl.concat(
             [self.calculate_profile_stats(grouped_df, x) for x in self.val_col_names]
         )
 
         self.summary_stats = global_stats.vstack(profile_stats)
 
+    def get_empty_stats(self) -> pl.DataFrame:
+        """Create an empty DataFrame with the schema of :attr:`summary_stats`.
+
+        :returns: A DataFrame with the columns of :attr:`stats_col_names` and
+                  no rows.
+        :rtype: polars.DataFrame
+        """
+        return pl.DataFrame(
+            schema={
+                "platform_code": self.input_data.schema["platform_code"],
+                "profile_no": self.input_data.schema["profile_no"],
+                "variable": pl.String,
+            }
+            | {x: pl.Float64 for x in self.stats_col_names[3:]}
+        )
+
+    def get_cache_key(self, input_fingerprint: str) -> str:
+        """Build the cache key of the summary statistics.
+
+        The key combines the input fingerprint with the parts of the
+        configuration that change the statistics: the input and summary step
+        classes and parameters, the variables in :attr:`val_col_names` and
+        :attr:`required_stats`. Other settings, such as feature or model
+        parameters, do not invalidate the cache.
+
+        :param input_fingerprint: The fingerprint of the input files, from
+                                  :meth:`dmqclib.prepare.step1_read_input.input_base.InputDataSetBase.get_input_fingerprint`.
+        :type input_fingerprint: str
+        :returns: A SHA-256 hex digest.
+        :rtype: str
+        """
+        summary_params = {
+            k: v
+            for k, v in self.config.get_step_params("summary").items()
+            if k not in ("cache_dir", "force_recompute")
+        }
+        key = {
+            "input_fingerprint": input_fingerprint,
+            "input_class": self.config.get_base_class("input"),
+            "input_params": self.config.get_step_params("input"),
+            "summary_class": self.config.get_base_class("summary"),
+            "summary_params": summary_params,
+            "val_col_names": self.val_col_names,
+            "required_stats": self.required_stats,
+        }
+
+        return hashlib.sha256(
+            json.dumps(key, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def get_cache_file_name(self, input_fingerprint: str) -> str:
+        """Build the name of the cache file in :attr:`cache_dir`.
+
+        The file name consists of a hash of :attr:`output_file_name`, which
+        identifies the data set, followed by a hash from
+        :meth:`get_cache_key`.
+
+        :param input_fingerprint: The fingerprint of the input files.
+        :type input_fingerprint: str
+        :returns: The full path of the cache file.
+        :rtype: str
+        """
+        key_hash = self.get_cache_key(input_fingerprint)[:16]
+
+        return os.path.join(
+            str(self.cache_dir), f"{self._get_cache_prefix()}_{key_hash}.parquet"
+        )
+
+    def calculate_stats_cached(self, ds_input: InputDataSetBase) -> None:
+        """Read the statistics from the cache or calculate and cache them.
+
+        If :attr:`cache_dir` is set and a cache file for the key of
+        :meth:`get_cache_key` exists, :attr:`summary_stats` is read from it.
+        Otherwise, :meth:`calculate_stats` is called and its result is
+        written to the cache, replacing the cache files of earlier keys of
+        the same data set. Setting ``force_recompute`` in the summary step
+        parameters always recalculates and overwrites the cached file.
+
+        Without :attr:`cache_dir`, or in ``incremental`` mode, which reuses
+        earlier results on its own, this method only calls
+        :meth:`calculate_stats`.
+
+        :param ds_input: The input step providing the input fingerprint.
+        :type ds_input: dmqclib.prepare.step1_read_input.input_base.InputDataSetBase
+        """
+        summary_params = self.config.get_step_params("summary")
+        if not self.cache_dir or summary_params.get("incremental", False):
+            self.calculate_stats()
+            return
+
+        cache_file = self.get_cache_file_name(ds_input.get_input_fingerprint())
+        if os.path.exists(cache_file) and not summary_params.get(
+            "force_recompute", False
+        ):
+            self.summary_stats = pl.read_parquet(cache_file)
+            return
+
+        self.calculate_stats()
+        os.makedirs(str(self.cache_dir), exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=str(self.cache_dir), suffix=".tmp")
+        os.close(fd)
+        try:
+            self.summary_stats.write_parquet(tmp_file)
+            os.replace(tmp_file, cache_file)
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+        for stale_file in self.list_cache_files():
+            if stale_file != cache_file:
+                os.remove(stale_file)
+
+    def list_cache_files(self) -> List[str]:
+        """List the cache files of this data set in :attr:`cache_dir`.
+
+        :returns: The paths of the cached statistics for any key.
+        :rtype: list[str]
+        """
+        if not self.cache_dir:
+            return []
+
+        return glob.glob(
+            os.path.join(str(self.cache_dir), f"{self._get_cache_prefix()}_*.parquet")
+        )
+
+    def clear_cache(self) -> None:
+        """Remove the cached statistics of this data set from :attr:`cache_dir`."""
+        for cache_file in self.list_cache_files():
+            os.remove(cache_file)
+
+    def _get_cache_prefix(self) -> str:
+        """Hash :attr:`output_file_name` to identify the data set in the cache."""
+        return hashlib.sha256(
+            os.path.abspath(self.output_file_name).encode()
+        ).hexdigest()[:16]
+
+    def calculate_stats_fused(self) -> None:
+        """Calculate global and per-profile statistics in a single pass each.
+
+        The statistics of all columns in :attr:`val_col_names` are computed
+        with one global aggregation and one ``group_by`` aggregation, which
+        Polars runs together with :func:`polars.collect_all`. The wide results
+        are then reshaped to the long layout of :attr:`stats_col_names`, so
+        :attr:`summary_stats` holds the same rows as with
+        :meth:`calculate_stats`.
+        """
+        lazy_input = self.input_data.lazy()
+        if self.required_stats is not None:
+            exprs = [
+                expr.name.prefix(f"{x}/")
+                for x, stats_names in self.required_stats.items()
+                for expr in self.get_stats_expression(x, stats_names)
+            ]
+            profile_stats = (
+                lazy_input.group_by(self.profile_col_names).agg(exprs).collect()
+            )
+            self.summary_stats = pl.concat(
+                [self.get_empty_stats()]
+                + [
+                    self.reshape_fused_stats(profile_stats, x)
+                    for x in self.required_stats
+                ]
+            )
+            return
+
+        exprs = [
+            expr.name.prefix(f"{x}/")
+            for x in self.val_col_names
+            for expr in self.get_stats_expression(x)
+        ]
+        global_stats, profile_stats = pl.collect_all(
+            [
+                lazy_input.select(exprs).with_columns(
+                    pl.lit("all")
+                    .cast(self.input_data.schema["platform_code"])
+                    .alias("platform_code"),
+                    pl.lit(0).alias("profile_no"),
+                ),
+                lazy_input.group_by(self.profile_col_names).agg(exprs),
+            ]
+        )
+
+        self.summary_stats = pl.concat(
+            [
+                self.reshape_fused_stats(df, x)
+                for df in [global_stats, profile_stats]
+                for x in self.val_col_names
+            ]
+        )
+
+    def calculate_stats_incremental(self) -> None:
+        """Update the statistics of a previous run with new profiles only.
+
+        If :attr:`output_file_name` and :attr:`sketch_file_name` exist from a
+        previous run, per-profile statistics are only computed for profiles
+        that are not in the previous output, and their rows are appended to
+        the previous per-profile rows. The global rows are derived from the
+        stored sketch merged with a sketch of the new rows (see
+        :mod:`dmqclib.common.utils.sketch`), so min, max, mean and standard
+        deviation are exact and the quantiles are approximate. Without a
+        previous run, all profiles are treated as new.
+
+        If :attr:`required_stats` is set, only the required per-profile
+        statistics are computed and the global rows are omitted, as in
+        :meth:`calculate_stats`. The sketch is still updated, so that later
+        runs can switch back to the full statistics.
+
+        The merged sketch is stored in :attr:`summary_sketch` and written by
+        :meth:`write_summary_stats`.
+        """
+        summary_params = self.config.get_step_params("summary")
+        sketch_size = summary_params.get("sketch_size", DEFAULT_SKETCH_SIZE)
+        previous_stats = self.read_previous_stats()
+        if previous_stats is None:
+            new_data = self.input_data
+            previous_profile_stats = None
+        else:
+            previous_profile_stats = previous_stats.filter(
+                pl.col("platform_code") != "all"
+            )
+            new_data = self.input_data.join(
+                previous_profile_stats.select(self.profile_col_names).unique(),
+                on=self.profile_col_names,
+                how="anti",
+            )
+
+        sketch = create_sketch(new_data, self.val_col_names, sketch_size=sketch_size)
+        if previous_stats is not None:
+            sketch = merge_sketches(
+                [pl.read_parquet(self.sketch_file_name), sketch],
+                sketch_size=sketch_size,
+            )
+        self.summary_sketch = sketch
+
+        global_stats = (
+            get_sketch_stats(sketch)
+            .with_columns(
+                pl.lit("all")
+                .cast(self.input_data.schema["platform_code"])
+                .alias("platform_code"),
+                pl.lit(0)
+                .cast(self.input_data.schema["profile_no"])
+                .alias("profile_no"),
+            )
+            .join(
+                pl.DataFrame({"variable": self.val_col_names}).with_row_index("order"),
+                on="variable",
+            )
+            .sort("order")
+            .select(self.stats_col_names)
+        )
+        grouped_df = new_data.group_by(self.profile_col_names)
+        profile_stats = [
+            self.calculate_profile_stats(grouped_df, x)
+            for x in (
+                self.val_col_names
+                if self.required_stats is None
+                else self.required_stats
+            )
+        ]
+        if previous_profile_stats is not None:
+            profile_stats.insert(0, previous_profile_stats)
+        if self.required_stats is not None:
+            global_stats = self.get_empty_stats()
+
+        self.summary_stats = pl.concat(
+            [global_stats] + profile_stats, how="vertical_relaxed"
+        )
+
+    def calculate_stats_from_batches(
+        self,
+        batches: Iterable[pl.DataFrame],
+        sketch_size: int = DEFAULT_SKETCH_SIZE,
+    ) -> None:
+        """Estimate global and per-profile statistics from batches of rows.
+
+        Every batch is reduced to a global sketch and one sketch per profile
+        (see :mod:`dmqclib.common.utils.sketch`). The global sketch is merged
+        into the sketch of the previous batches. The profile sketches are
+        kept in a keyed accumulator: the sketches of the profiles that
+        continue into the current batch are merged with it, and the others
+        are set aside without being joined again. Before the statistics are
+        derived, the sketches of profiles that appear in several places of
+        the input are merged by ``platform_code`` and ``profile_no``, so the
+        input does not need to be sorted. :attr:`summary_stats` is derived in
+        the layout of :attr:`stats_col_names`: min, max, mean and standard
+        deviation are exact, while the quantiles have a rank error of about
+        ``1 / sketch_size``.
+
+        Memory scales with one batch plus one sketch per profile and
+        variable, each with at most ``sketch_size`` centroids, but not with
+        the number of rows. If the rows of each profile are contiguous, as in
+        input sorted by profile (see
+        :meth:`dmqclib.prepare.step1_read_input.input_base.InputDataSetBase.verify_sort_order`),
+        the work per batch only depends on the size of the batch and no
+        profiles need to be merged at the end.
+
+        :param batches: Batches of input rows with the same schema.
+        :type batches: Iterable[polars.DataFrame]
+        :param sketch_size: The maximum number of centroids per sketch.
+                            Defaults to
+                            :data:`dmqclib.common.utils.sketch.DEFAULT_SKETCH_SIZE`.
+        :type sketch_size: int
+        :raises ValueError: If ``batches`` is empty.
+        """
+        schema = None
+        global_sketch = None
+        open_sketch = None
+        finished_sketches = []
+        for batch in batches:
+            schema = schema or batch.schema
+            batch_global_sketch = create_sketch(
+                batch, self.val_col_names, sketch_size=sketch_size
+            )
+            batch_profile_sketch = create_sketch(
+                batch, self.val_col_names, self.profile_col_names, sketch_size
+            )
+            if global_sketch is None:
+                global_sketch = batch_global_sketch
+                open_sketch = batch_profile_sketch
+                continue
+
+            global_sketch = merge_sketches(
+                [global_sketch, batch_global_sketch], sketch_size=sketch_size
+            )
+            profiles = batch_profile_sketch.select(self.profile_col_names).unique()
+            finished_sketches.append(
+                open_sketch.join(profiles, on=self.profile_col_names, how="anti")
+            )
+            open_sketch = merge_sketches(
+                [
+                    open_sketch.join(profiles, on=self.profile_col_names, how="semi"),
+                    batch_profile_sketch,
+                ],
+                self.profile_col_names,
+                sketch_size,
+            )
+
+        if schema is None:
+            raise ValueError("At least one batch is required.")
+
+        profile_sketch = pl.concat(
+            finished_sketches + [open_sketch], how="vertical_relaxed"
+        )
+        is_split = pl.struct(self.profile_col_names + ["variable"]).is_duplicated()
+        if profile_sketch.select(is_split.any()).item():
+            profile_sketch = pl.concat(
+                [
+                    profile_sketch.filter(~is_split),
+                    merge_sketches(
+                        [profile_sketch.filter(is_split)],
+                        self.profile_col_names,
+                        sketch_size,
+                    ),
+                ],
+                how="vertical_relaxed",
+            )
+        profile_stats = get_sketch_stats(profile_sketch, self.profile_col_names)
+
+        global_stats = get_sketch_stats(global_sketch).with_columns(
+            pl.lit("all").cast(schema["platform_code"]).alias("platform_code"),
+            pl.lit(0).cast(schema["profile_no"]).alias("profile_no"),
+        )
+        variable_order = pl.DataFrame({"variable": self.val_col_names}).with_row_index(
+            "order"
+        )
+        self.summary_stats = pl.concat(
+            [
+                x.join(variable_order, on="variable")
+                .sort("order", maintain_order=True)
+                .select(self.stats_col_names)
+                for x in [global_stats, profile_stats]
+            ]
+        )
+
+    def read_previous_stats(self) -> Optional[pl.DataFrame]:
+        """Read the statistics written by a previous incremental run.
+
+        :returns: The previous statistics with the key columns cast to the
+                  types of :attr:`input_data`, or None if
+                  :attr:`output_file_name` or :attr:`sketch_file_name` does
+                  not exist.
+        :rtype: polars.DataFrame or None
+        """
+        if not (
+            os.path.exists(self.output_file_name)
+            and os.path.exists(self.sketch_file_name)
+        ):
+            return None
+
+        return pl.read_csv(
+            self.output_file_name,
+            separator="\t",
+            schema_overrides={"platform_code": pl.String},
+        ).with_columns(
+            pl.col("platform_code").cast(self.input_data.schema["platform_code"]),
+            pl.col("profile_no").cast(self.input_data.schema["profile_no"]),
+            pl.exclude(["platform_code", "profile_no", "variable"]).cast(pl.Float64),
+        )
+
+    def reshape_fused_stats(self, df: pl.DataFrame, val_col_name: str) -> pl.DataFrame:
+        """Select the statistics of one column from a fused result.
+
+        :param df: A wide DataFrame from :meth:`calculate_stats_fused`, with
+                   one ``<column>/<statistic>`` column per column and statistic.
+        :type df: polars.DataFrame
+        :param val_col_name: The name of the column to select.
+        :type val_col_name: str
+        :returns: The statistics of the column in the layout of
+                  :attr:`stats_col_names`.
+        :rtype: polars.DataFrame
+        """
+        return df.select(
+            pl.col(self.profile_col_names),
+            pl.lit(val_col_name).alias("variable"),
+            pl.col(f"^{val_col_name}/.*$").name.map(lambda x: x.split("/", 1)[1]),
+        ).select(self.stats_col_names)
+
     def write_summary_stats(self) -> None:
         """Write the computed summary statistics to a TSV file.
 
-        The output path is determined by :attr:`output_file_name`.
+        The output path is determined by :attr:`output_file_name`. In
+        incremental mode, :attr:`summary_sketch` is also written to
+        :attr:`sketch_file_name`.
 
         :raises ValueError: If :attr:`summary_stats` has not been calculated yet.
         """
@@ -190,6 +740,8 @@ class SummaryStatsBase(DataSetBase):
 
         os.makedirs(os.path.dirname(self.output_file_name), exist_ok=True)
         self.summary_stats.write_csv(self.output_file_name, separator="\t")
+        if self.summary_sketch is not None:
+            self.summary_sketch.write_parquet(self.sketch_file_name)
 
     def create_summary_stats_observation(self):
         """Create a summarized view of global observation statistics.
@@ -240,3 +792,45 @@ class SummaryStatsBase(DataSetBase):
             .rename({"pct97_5": "pct97.5"})
             .sort(["variable", "stats"])
         )
+
+    def create_summary_stats_wide(self):
+        """Create a wide view of per-profile statistics.
+
+        The per-profile rows of :attr:`summary_stats` are reshaped with
+        :meth:`pivot_summary_stats` and stored in :attr:`summary_stats_wide`.
+
+        :raises ValueError: If :attr:`summary_stats` has not been calculated yet.
+        """
+        if self.summary_stats is None:
+            raise ValueError("Member variable 'summary_stats' must not be empty.")
+
+        self.summary_stats_wide = self.pivot_summary_stats(self.summary_stats)
+
+    @staticmethod
+    def pivot_summary_stats(summary_stats: pl.DataFrame) -> pl.DataFrame:
+        """Reshape long per-profile statistics to one row per profile.
+
+        The global rows (``platform_code == "all"``) are dropped, and every
+        statistic of every variable becomes a column named
+        ``<variable>_<statistic>``, such as ``temp_mean`` or ``psal_sd``.
+
+        :param summary_stats: Statistics in the long layout of
+                              :attr:`stats_col_names`.
+        :type summary_stats: polars.DataFrame
+        :returns: The wide per-profile statistics, keyed by ``platform_code``
+                  and ``profile_no``.
+        :rtype: polars.DataFrame
+        """
+        index_col_names = ["platform_code", "profile_no", "variable"]
+        return (
+            summary_stats.filter(pl.col("platform_code") != "all")
+            .unpivot(index=index_col_names, variable_name="stats")
+            .with_columns(
+                pl.concat_str(["variable", "stats"], separator="_").alias("col_name")
+            )
+            .pivot(
+                "col_name",
+                index=["platform_code", "profile_no"],
+                values="value",
+            )
+        )
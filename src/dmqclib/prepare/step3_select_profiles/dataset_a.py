@@ -9,13 +9,12 @@ based on QC flags, and then pairs them temporally to construct a labeled dataset
 suitable for quality control machine learning applications.
 """
 
-import operator
-from functools import reduce
 from typing import Optional, List
 
 import polars as pl
 
 from dmqclib.common.base.config_base import ConfigBase
+from dmqclib.common.utils.catalog import has_any_bad, has_only_good
 from dmqclib.prepare.step3_select_profiles.select_base import ProfileSelectionBase
 
 
@@ -80,19 +79,18 @@ class SelectDataSetA(ProfileSelectionBase):
         its measurements have a QC flag defined as a positive flag in the
         configuration (e.g., a flag of 4). The resulting unique profiles
         are stored in the :attr:`pos_profile_df` attribute.
+
+        Profiles are taken from :attr:`profile_catalog`, which is created
+        first if necessary.
         """
-        conditions = reduce(
-            operator.or_,
-            [
-                pl.col(param["flag"]).is_in(param.get("pos_flag_values", [4]))
-                for param in self.config.get_target_dict().values()
-            ],
-        )
+        if self.profile_catalog is None:
+            self.create_profile_catalog()
 
         self.pos_profile_df = (
-            self.input_data.filter(conditions)
+            self.profile_catalog.filter(
+                has_any_bad(list(self.config.get_target_dict().keys()))
+            )
             .select(self.key_col_names)
-            .unique()
             .sort(["platform_code", "profile_no"])
             .with_row_index("profile_id", offset=1)
             .with_columns(
@@ -108,20 +106,18 @@ class SelectDataSetA(ProfileSelectionBase):
         none of its measurements have a "bad" flag and at least one has a "good"
         flag. The resulting unique profiles are stored in the
         :attr:`neg_profile_df` attribute.
+
+        Profiles are taken from :attr:`profile_catalog`, which is created
+        first if necessary.
         """
-        exprs = reduce(
-            operator.and_,
-            [
-                (~pl.col(param["flag"]).is_in(param.get("pos_flag_values", [4])).any())
-                & (pl.col(param["flag"]).is_in(param.get("neg_flag_values", [1])).any())
-                for param in self.config.get_target_dict().values()
-            ],
-        )
+        if self.profile_catalog is None:
+            self.create_profile_catalog()
 
         self.neg_profile_df = (
-            self.input_data.filter(exprs.over(self.key_col_names))
+            self.profile_catalog.filter(
+                has_only_good(list(self.config.get_target_dict().keys()))
+            )
             .select(self.key_col_names)
-            .unique()
             .sort(["platform_code", "profile_no"])
             .with_row_index("profile_id", offset=self.pos_profile_df.shape[0] + 1)
             .with_columns(
@@ -136,25 +132,20 @@ class SelectDataSetA(ProfileSelectionBase):
         are the nearest in time to a positive profile. This helps create a
         more balanced and comparable dataset for training or analysis.
 
+        Each positive profile is paired with the ``neg_pos_ratio`` negative
+        profiles with the smallest absolute difference in day of year, ties
+        being broken by the negative ``profile_id`` (see
+        :meth:`match_negative_profiles`). As the day of year takes at most 366
+        values, the search runs on negative profiles grouped by day (see
+        :meth:`find_closest_neg_ids`), so memory grows with the number of
+        profiles instead of the number of positive and negative combinations.
+
         This method updates :attr:`pos_profile_df` by adding ``label`` and
         ``neg_profile_id`` columns. It also updates :attr:`neg_profile_df`
         by filtering it to the matched profiles and adding corresponding labels.
         """
         neg_pos_ratio = self.config.get_step_params("select").get("neg_pos_ratio", 1)
-
-        closest_neg_id = (
-            self.pos_profile_df.join(self.neg_profile_df, how="cross", suffix="_neg")
-            .with_columns(
-                (pl.col("pos_day_of_year") - pl.col("neg_day_of_year"))
-                .abs()
-                .alias("day_diff")
-            )
-            .rename({"profile_id": "pos_profile_id"})
-            .sort(["pos_profile_id", "day_diff", "profile_id_neg"])
-            .group_by("pos_profile_id")
-            .agg(pl.col("profile_id_neg").head(neg_pos_ratio).alias("profile_id"))
-            .explode("profile_id")
-        )
+        closest_neg_id = self.match_negative_profiles(neg_pos_ratio)
 
         self.pos_profile_df = self.pos_profile_df.with_columns(
             pl.col("profile_id").alias("pos_profile_id"), pl.lit(1).alias("label")
@@ -172,18 +163,104 @@ class SelectDataSetA(ProfileSelectionBase):
             .drop("neg_day_of_year")
         )
 
+    def match_negative_profiles(self, n_neg: int) -> pl.DataFrame:
+        """Match every positive profile with its closest negative profiles.
+
+        Profiles are compared by the absolute difference in day of year, using
+        :meth:`find_closest_neg_ids`. Subclasses can override this method to
+        use another distance.
+
+        :param n_neg: The number of negative profiles per positive profile.
+        :type n_neg: int
+        :returns: A DataFrame with one row per pair, with the columns
+                  ``pos_profile_id`` and ``profile_id`` (of the negative profile).
+        :rtype: polars.DataFrame
+        """
+        return (
+            self.pos_profile_df.select(
+                pl.col("profile_id").alias("pos_profile_id"), "pos_day_of_year"
+            )
+            .join(
+                self.find_closest_neg_ids(n_neg),
+                on="pos_day_of_year",
+                how="inner",
+            )
+            .drop("pos_day_of_year")
+            .explode("profile_id")
+        )
+
+    def find_closest_neg_ids(self, n_neg: int) -> pl.DataFrame:
+        """Find the closest negative profiles for every positive day of year.
+
+        The negative profiles are counted per day of year. For each distinct
+        positive day, the negative days are ranked by their absolute
+        difference, and only the days needed to reach ``n_neg`` profiles are
+        kept. The sorted profile IDs of those days are joined in afterwards,
+        so the day pairs carry only counts and the ID lists are attached to
+        at most the selected days. The result is the same as ranking all
+        positive and negative pairs by ``day_diff`` and ``profile_id``.
+
+        :param n_neg: The number of negative profiles per positive day.
+        :type n_neg: int
+        :returns: A DataFrame with ``pos_day_of_year`` and a ``profile_id``
+                  list of the closest negative profile IDs.
+        :rtype: polars.DataFrame
+        """
+        neg_ids = self.neg_profile_df.group_by("neg_day_of_year").agg(
+            pl.col("profile_id").sort()
+        )
+        day_pairs = (
+            self.pos_profile_df.select(pl.col("pos_day_of_year").unique())
+            .join(
+                self.neg_profile_df.group_by("neg_day_of_year").agg(
+                    pl.len().alias("n_day")
+                ),
+                how="cross",
+            )
+            .with_columns(
+                (pl.col("pos_day_of_year") - pl.col("neg_day_of_year"))
+                .abs()
+                .alias("day_diff")
+            )
+        )
+        # Number of negative profiles strictly closer than each day difference.
+        n_closer = (
+            day_pairs.group_by(["pos_day_of_year", "day_diff"])
+            .agg(pl.col("n_day").sum())
+            .sort(["pos_day_of_year", "day_diff"])
+            .with_columns(
+                (pl.col("n_day").cum_sum() - pl.col("n_day"))
+                .over("pos_day_of_year")
+                .alias("n_closer")
+            )
+            .drop("n_day")
+        )
+
+        return (
+            day_pairs.join(n_closer, on=["pos_day_of_year", "day_diff"])
+            .filter(pl.col("n_closer") < n_neg)
+            .join(neg_ids, on="neg_day_of_year")
+            .with_columns(pl.col("profile_id").list.head(n_neg - pl.col("n_closer")))
+            .explode("profile_id")
+            .sort(["pos_day_of_year", "day_diff", "profile_id"])
+            .group_by("pos_day_of_year", maintain_order=True)
+            .agg(pl.col("profile_id").head(n_neg))
+        )
+
     def label_profiles(self) -> None:
         """Execute the full profile selection and labeling workflow.
 
         This method orchestrates the process by calling, in order:
 
-        1. :meth:`select_positive_profiles`
-        2. :meth:`select_negative_profiles`
-        3. :meth:`find_profile_pairs`
+        1. :meth:`create_profile_catalog`
+        2. :meth:`select_positive_profiles`
+        3. :meth:`select_negative_profiles`
+        4. :meth:`find_profile_pairs`
 
         The final combined DataFrame of labeled profiles is stored in the
         :attr:`selected_profiles` attribute of the base class.
         """
+        self.create_profile_catalog()
         self.select_positive_profiles()
         self.select_negative_profiles()
         self.find_profile_pairs()
@@ -9,15 +9,22 @@ based on QC flags, and then pairs them temporally to construct a labeled dataset
 suitable for quality control machine learning applications.
 """
 
-import operator
-from functools import reduce
-from typing import Optional, List
+from typing import Dict, List, Optional
 
+import numpy as np
 import polars as pl
 
 from dmqclib.common.base.config_base import ConfigBase
+from dmqclib.common.utils.catalog import has_any_bad, has_only_good
 from dmqclib.prepare.step3_select_profiles.select_base import ProfileSelectionBase
 
+#: The strata available to the ``stratify_by`` parameter of the select step.
+STRATUM_EXPRESSIONS: Dict[str, pl.Expr] = {
+    "year": pl.col("profile_timestamp").dt.year().alias("_stratum_year"),
+    "month": pl.col("profile_timestamp").dt.month().alias("_stratum_month"),
+    "platform": pl.col("platform_code").alias("_stratum_platform"),
+}
+
 
 class SelectDataSetAll(ProfileSelectionBase):
     """Selects positive/negative profiles from Copernicus CTD data.
@@ -33,6 +40,19 @@ class SelectDataSetAll(ProfileSelectionBase):
     3.  **Combine Data**: Merge the labeled positive and negative profiles into a
         single DataFrame.
 
+    All positive profiles are kept. The negative profiles can be sampled with
+    the following parameters of the select step:
+
+    *   ``max_neg_pos_ratio``: The maximum number of negative profiles per
+        positive profile.
+    *   ``max_negatives``: The maximum number of negative profiles.
+    *   ``stratify_by``: ``year``, ``month``, ``platform`` or a list of them.
+        Each stratum keeps a share of the sample proportional to its number
+        of negative profiles.
+    *   ``seed``: The seed of the random sample. Defaults to 0.
+
+    See :meth:`sample_negative_profiles` for details.
+
     :ivar expected_class_name: The expected name of the class, used for
         configuration validation.
     :vartype expected_class_name: str
@@ -42,6 +62,9 @@ class SelectDataSetAll(ProfileSelectionBase):
     :vartype neg_profile_df: Optional[polars.DataFrame]
     :ivar key_col_names: Column names used as unique identifiers for profiles.
     :vartype key_col_names: List[str]
+    :ivar stratify_by: The strata of the negative sample, from the
+                       ``stratify_by`` select step parameter.
+    :vartype stratify_by: List[str]
     """
 
     expected_class_name: str = "SelectDataSetAll"
@@ -58,6 +81,8 @@ class SelectDataSetAll(ProfileSelectionBase):
                            of profiles from which to select examples. If None,
                            it is expected to be loaded by the base class.
         :type input_data: Optional[polars.DataFrame]
+        :raises ValueError: If ``stratify_by`` contains a value other than
+                            ``year``, ``month`` or ``platform``.
         """
         super().__init__(config=config, input_data=input_data)
 
@@ -71,6 +96,17 @@ class SelectDataSetAll(ProfileSelectionBase):
             "latitude",
         ]
 
+        stratify_by = self.config.get_step_params("select").get("stratify_by") or []
+        self.stratify_by: List[str] = (
+            [stratify_by] if isinstance(stratify_by, str) else list(stratify_by)
+        )
+        unknown_strata = [x for x in self.stratify_by if x not in STRATUM_EXPRESSIONS]
+        if unknown_strata:
+            raise ValueError(
+                f"Select stratify_by {unknown_strata} is not supported. "
+                f"Use {list(STRATUM_EXPRESSIONS)}."
+            )
+
     def select_positive_profiles(self) -> None:
         """Select profiles with "bad" QC flags.
 
@@ -78,19 +114,18 @@ class SelectDataSetAll(ProfileSelectionBase):
         its measurements have a QC flag defined as a positive flag in the
         configuration (e.g., a flag of 4). The resulting unique profiles
         are stored in the :attr:`pos_profile_df` attribute.
+
+        Profiles are taken from :attr:`profile_catalog`, which is created
+        first if necessary.
         """
-        conditions = reduce(
-            operator.or_,
-            [
-                pl.col(param["flag"]).is_in(param.get("pos_flag_values", [4]))
-                for param in self.config.get_target_dict().values()
-            ],
-        )
+        if self.profile_catalog is None:
+            self.create_profile_catalog()
 
         self.pos_profile_df = (
-            self.input_data.filter(conditions)
+            self.profile_catalog.filter(
+                has_any_bad(list(self.config.get_target_dict().keys()))
+            )
             .select(self.key_col_names)
-            .unique()
             .sort(["platform_code", "profile_no"])
             .with_row_index("profile_id", offset=1)
             .with_columns(
@@ -105,23 +140,25 @@ class SelectDataSetAll(ProfileSelectionBase):
         A profile is considered "negative" (i.e., contains only good data)
         if, for every monitored parameter (e.g., temperature, salinity),
         none of its measurements have a "bad" flag and at least one has a "good"
-        flag. The resulting unique profiles are stored in the
+        flag. The resulting unique profiles, sampled by
+        :meth:`sample_negative_profiles`, are stored in the
         :attr:`neg_profile_df` attribute.
+
+        Profiles are taken from :attr:`profile_catalog`, which is created
+        first if necessary.
         """
-        exprs = reduce(
-            operator.and_,
-            [
-                (~pl.col(param["flag"]).is_in(param.get("pos_flag_values", [4])).any())
-                & (pl.col(param["flag"]).is_in(param.get("neg_flag_values", [1])).any())
-                for param in self.config.get_target_dict().values()
-            ],
-        )
+        if self.profile_catalog is None:
+            self.create_profile_catalog()
 
-        self.neg_profile_df = (
-            self.input_data.filter(exprs.over(self.key_col_names))
+        neg_profile_df = (
+            self.profile_catalog.filter(
+                has_only_good(list(self.config.get_target_dict().keys()))
+            )
             .select(self.key_col_names)
-            .unique()
             .sort(["platform_code", "profile_no"])
+        )
+        self.neg_profile_df = (
+            self.sample_negative_profiles(neg_profile_df)
             .with_row_index("profile_id", offset=self.pos_profile_df.shape[0] + 1)
             .with_columns(
                 pl.lit(0, dtype=pl.UInt32).alias("neg_profile_id"),
@@ -129,17 +166,79 @@ class SelectDataSetAll(ProfileSelectionBase):
             )
         )
 
+    def get_max_negatives(self) -> Optional[int]:
+        """Get the maximum number of negative profiles from the select step.
+
+        The limit is the smaller of ``max_negatives`` and ``max_neg_pos_ratio``
+        times the number of positive profiles.
+
+        :returns: The maximum number of negative profiles, or None if neither
+                  parameter is set.
+        :rtype: Optional[int]
+        """
+        params = self.config.get_step_params("select")
+        limits = []
+        if params.get("max_negatives") is not None:
+            limits.append(int(params["max_negatives"]))
+        if params.get("max_neg_pos_ratio") is not None:
+            limits.append(
+                int(params["max_neg_pos_ratio"] * self.pos_profile_df.shape[0])
+            )
+
+        return max(min(limits), 0) if limits else None
+
+    def sample_negative_profiles(self, neg_profile_df: pl.DataFrame) -> pl.DataFrame:
+        """Draw a reproducible random sample of negative profiles.
+
+        Every profile is given a uniform random key from a generator seeded
+        with the ``seed`` select step parameter, and the profiles with the
+        smallest keys are kept, which is equivalent to reservoir sampling in
+        one pass over the profiles. With :attr:`stratify_by`, the keys are
+        replaced by the mid-rank of each key within its stratum divided by
+        the stratum size, so that the kept profiles are spread over the strata
+        in proportion to their sizes.
+
+        :param neg_profile_df: The negative profiles, sorted by
+                               ``platform_code`` and ``profile_no``.
+        :type neg_profile_df: polars.DataFrame
+        :returns: The sampled profiles in their original order, or
+                  ``neg_profile_df`` if no limit is set or it is not exceeded.
+        :rtype: polars.DataFrame
+        """
+        max_negatives = self.get_max_negatives()
+        if max_negatives is None or max_negatives >= neg_profile_df.shape[0]:
+            return neg_profile_df
+
+        seed = self.config.get_step_params("select").get("seed", 0)
+        rng = np.random.default_rng(seed)
+        sample_key = pl.col("_sample_key")
+        if self.stratify_by:
+            strata = [STRATUM_EXPRESSIONS[x] for x in self.stratify_by]
+            sample_key = (sample_key.rank("ordinal") - 0.5).over(
+                strata
+            ) / pl.len().over(strata)
+
+        return (
+            neg_profile_df.with_columns(
+                pl.Series("_sample_key", rng.random(neg_profile_df.shape[0]))
+            )
+            .filter(sample_key.rank("ordinal") <= max_negatives)
+            .drop("_sample_key")
+        )
+
     def label_profiles(self) -> None:
         """Execute the full profile selection and labeling workflow.
 
         This method orchestrates the process by calling, in order:
 
-        1. :meth:`select_positive_profiles`
-        2. :meth:`select_negative_profiles`
+        1. :meth:`create_profile_catalog`
+        2. :meth:`select_positive_profiles`
+        3. :meth:`select_negative_profiles`
 
         The final combined DataFrame of labeled profiles is stored in the
         :attr:`selected_profiles` attribute of the base class.
         """
+        self.create_profile_catalog()
         self.select_positive_profiles()
         self.select_negative_profiles()
 
@@ -0,0 +1,148 @@
+"""Selects and labels oceanographic profiles paired by time and location.
+
+This module defines the `SelectDataSetNearest` class, a variant of
+:class:`~.dataset_a.SelectDataSetA` that pairs every positive profile with the
+negative profiles closest in both day of year and position, instead of day of
+year alone.
+
+The search uses a :class:`sklearn.neighbors.BallTree` over an embedding of the
+profiles, so it scales to millions of negative profiles.
+"""
+
+from typing import Optional
+
+import numpy as np
+import polars as pl
+from sklearn.neighbors import BallTree
+
+from dmqclib.common.base.config_base import ConfigBase
+from dmqclib.prepare.step3_select_profiles.dataset_a import SelectDataSetA
+
+#: The mean radius of the Earth in kilometres.
+EARTH_RADIUS_KM: float = 6371.0
+
+#: The number of days per year used to place the day of year on a circle.
+DAYS_PER_YEAR: float = 365.25
+
+
+class SelectDataSetNearest(SelectDataSetA):
+    """Selects positive/negative profiles paired by day of year and location.
+
+    Positive and negative profiles are selected as in
+    :class:`~.dataset_a.SelectDataSetA`. Each positive profile is then paired
+    with the ``neg_pos_ratio`` negative profiles that minimise the distance
+
+    .. math::
+
+        d = \\sqrt{d_{geo}^2 + (w \\, d_{day})^2}
+
+    where :math:`d_{geo}` is the distance in kilometres between the profile
+    positions, :math:`d_{day}` is the circular difference in day of year, so
+    that 31 December and 1 January are one day apart, and :math:`w` is the
+    ``km_per_day`` parameter of the select step (10 by default).
+
+    Positions are mapped to points on a sphere with the radius of the Earth
+    and days of year to points on a circle with a circumference of
+    :data:`DAYS_PER_YEAR` times :math:`w`, and the neighbours are found with a
+    :class:`sklearn.neighbors.BallTree` on these points. Both distances are
+    therefore measured as chords, which are within 1% of the great-circle
+    distance and the circular day difference for separations up to about
+    3000 km or four weeks.
+
+    Profiles without a position are not paired.
+
+    :ivar expected_class_name: The expected name of the class, used for
+        configuration validation.
+    :vartype expected_class_name: str
+    """
+
+    expected_class_name: str = "SelectDataSetNearest"
+
+    def __init__(
+        self, config: ConfigBase, input_data: Optional[pl.DataFrame] = None
+    ) -> None:
+        """Initialize the selection and labeling process.
+
+        :param config: The configuration object containing paths, parameters,
+                       and QC flag definitions for the selection process.
+        :type config: dmqclib.common.base.config_base.ConfigBase
+        :param input_data: A Polars DataFrame containing the full set
+                           of profiles from which to select examples. If None,
+                           it is expected to be loaded by the base class.
+        :type input_data: Optional[polars.DataFrame]
+        """
+        super().__init__(config=config, input_data=input_data)
+
+    def match_negative_profiles(self, n_neg: int) -> pl.DataFrame:
+        """Match every positive profile with its closest negative profiles.
+
+        :param n_neg: The number of negative profiles per positive profile.
+        :type n_neg: int
+        :returns: A DataFrame with one row per pair, with the columns
+                  ``pos_profile_id`` and ``profile_id`` (of the negative profile).
+        :rtype: polars.DataFrame
+        """
+        km_per_day = self.config.get_step_params("select").get("km_per_day", 10.0)
+        pos_df = self.pos_profile_df.drop_nulls(["longitude", "latitude"])
+        neg_df = self.neg_profile_df.drop_nulls(["longitude", "latitude"])
+        n_neg = min(n_neg, neg_df.height)
+        if n_neg == 0 or pos_df.height == 0:
+            return pl.DataFrame(
+                schema={
+                    "pos_profile_id": self.pos_profile_df.schema["profile_id"],
+                    "profile_id": self.neg_profile_df.schema["profile_id"],
+                }
+            )
+
+        tree = BallTree(embed_profiles(neg_df, "neg_day_of_year", km_per_day))
+        idx = tree.query(
+            embed_profiles(pos_df, "pos_day_of_year", km_per_day),
+            k=n_neg,
+            return_distance=False,
+        )
+
+        return pl.DataFrame(
+            {
+                "pos_profile_id": np.repeat(
+                    pos_df.get_column("profile_id").to_numpy(), n_neg
+                ),
+                "profile_id": neg_df.get_column("profile_id").to_numpy()[idx.ravel()],
+            }
+        )
+
+
+def embed_profiles(
+    df: pl.DataFrame, day_col_name: str, km_per_day: float
+) -> np.ndarray:
+    """
+    Map the position and day of year of profiles to points in five dimensions.
+
+    The first three coordinates place the position on a sphere with the radius
+    of the Earth and the last two place the day of year on a circle whose
+    arcs measure ``km_per_day`` kilometres per day, so Euclidean distances
+    combine both as in :class:`SelectDataSetNearest`.
+
+    :param df: Profiles with ``longitude``, ``latitude`` and ``day_col_name``.
+    :type df: pl.DataFrame
+    :param day_col_name: The column with the day of year.
+    :type day_col_name: str
+    :param km_per_day: The distance in kilometres equivalent to one day.
+    :type km_per_day: float
+    :return: An array of shape ``(df.height, 5)``.
+    :rtype: np.ndarray
+    """
+    lon = np.radians(df.get_column("longitude").cast(pl.Float64).to_numpy())
+    lat = np.radians(df.get_column("latitude").cast(pl.Float64).to_numpy())
+    day = df.get_column(day_col_name).cast(pl.Float64).to_numpy()
+    angle = 2 * np.pi * day / DAYS_PER_YEAR
+    day_radius = km_per_day * DAYS_PER_YEAR / (2 * np.pi)
+
+    return np.column_stack(
+        [
+            EARTH_RADIUS_KM * np.cos(lat) * np.cos(lon),
+            EARTH_RADIUS_KM * np.cos(lat) * np.sin(lon),
+            EARTH_RADIUS_KM * np.sin(lat),
+            day_radius * np.cos(angle),
+            day_radius * np.sin(angle),
+        ]
+    )
@@ -15,6 +15,7 @@ import polars as pl
 
 from dmqclib.common.base.config_base import ConfigBase
 from dmqclib.common.base.dataset_base import DataSetBase
+from dmqclib.common.utils.catalog import build_profile_catalog, filter_profiles
 
 
 class ProfileSelectionBase(DataSetBase):
@@ -43,6 +44,14 @@ class ProfileSelectionBase(DataSetBase):
                              selection and labeling, typically including a
                              "group_label" column.
     :vartype selected_profiles: Optional[polars.DataFrame]
+    :ivar profile_catalog: A Polars DataFrame with one row per profile and the
+                           QC flag counts of every target, created by
+                           :meth:`create_profile_catalog`.
+    :vartype profile_catalog: Optional[polars.DataFrame]
+    :ivar profile_input: The rows of :attr:`input_data` that belong to the
+                         selected profiles, created by
+                         :meth:`create_profile_input`.
+    :vartype profile_input: Optional[polars.DataFrame]
     """
 
     def __init__(
@@ -73,6 +82,8 @@ class ProfileSelectionBase(DataSetBase):
         )
         self.input_data: Optional[pl.DataFrame] = input_data
         self.selected_profiles: Optional[pl.DataFrame] = None
+        self.profile_catalog: Optional[pl.DataFrame] = None
+        self.profile_input: Optional[pl.DataFrame] = None
 
     @abstractmethod
     def label_profiles(self) -> None:
@@ -87,6 +98,34 @@ class ProfileSelectionBase(DataSetBase):
         """
         pass  # pragma: no cover
 
+    def create_profile_catalog(self) -> None:
+        """
+        Count the QC flags of every target per profile in one pass.
+
+        Profiles are identified by the ``key_col_names`` attribute of the
+        subclass. The result is stored in :attr:`profile_catalog`; see
+        :func:`dmqclib.common.utils.catalog.build_profile_catalog` for its
+        columns.
+        """
+        self.profile_catalog = build_profile_catalog(
+            self.input_data, self.config.get_target_dict(), self.key_col_names
+        )
+
+    def create_profile_input(self) -> None:
+        """
+        Restrict :attr:`input_data` to the rows of the selected profiles.
+
+        The result is stored in :attr:`profile_input`, to be shared by the
+        locate and extract steps instead of joining the full input data
+        with the selected profiles in each of them.
+
+        :raises ValueError: If :attr:`selected_profiles` is None.
+        """
+        if self.selected_profiles is None:
+            raise ValueError("Member variable 'selected_profiles' must not be empty.")
+
+        self.profile_input = filter_profiles(self.input_data, self.selected_profiles)
+
     def write_selected_profiles(self) -> None:
         """
         Write the selected profiles to a Parquet file.
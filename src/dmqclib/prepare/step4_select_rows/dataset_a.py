@@ -10,13 +10,16 @@ It extends :class:`dmqclib.prepare.step4_select_rows.locate_base.LocatePositionB
 and utilizes Polars DataFrames for efficient data manipulation.
 """
 
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 import polars as pl
 
 from dmqclib.common.base.config_base import ConfigBase
 from dmqclib.prepare.step4_select_rows.locate_base import LocatePositionBase
 
+#: The columns of a positive observation identified by ``pair_id``.
+PAIR_KEY_COL_NAMES: List[str] = ["platform_code", "profile_no", "observation_no"]
+
 
 class LocateDataSetA(LocatePositionBase):
     """
@@ -72,37 +75,75 @@ class LocateDataSetA(LocatePositionBase):
         Identify and collect positive rows for a given target. Positive rows are
         defined as observations within profiles that have a specific "bad" QC flag.
 
+        If :attr:`profile_catalog` is set, positive profiles without a "bad"
+        flag of this target are dropped before the input data is joined.
+
         :param target_name: The name (key) of the target in the config's target dictionary.
         :type target_name: str
         :param target_value: A dictionary of target metadata, including the QC flag
                              variable name that indicates a "bad" observation (e.g., flag=4).
         :type target_value: Dict[str, any]
         """
+        self.positive_rows[target_name] = self.get_positive_rows_query(
+            target_name, target_value, self.get_profile_input().lazy()
+        ).collect()
+
+    def get_positive_rows_query(
+        self, target_name: str, target_value: Dict, input_query: pl.LazyFrame
+    ) -> pl.LazyFrame:
+        """
+        Build the lazy query of :meth:`select_positive_rows`.
+
+        Each positive observation is identified by ``pair_id``, a dense
+        integer rank of its :data:`PAIR_KEY_COL_NAMES` starting at 1, which
+        is shared with its negative rows. The rank does not depend on the
+        row order, so the same query always assigns the same ids.
+        :meth:`decode_pair_ids` maps the ids back to the observations.
+
+        :param target_name: The name (key) of the target in the config's target dictionary.
+        :type target_name: str
+        :param target_value: A dictionary of target metadata, including the QC flag
+                             variable name that indicates a "bad" observation (e.g., flag=4).
+        :type target_value: Dict[str, any]
+        :param input_query: The input data.
+        :type input_query: polars.LazyFrame
+        :return: A query returning the positive rows of the target.
+        :rtype: polars.LazyFrame
+        """
         pos_flag_values = target_value.get("pos_flag_values", [4])
-        self.positive_rows[target_name] = (
-            self.selected_profiles.filter(pl.col("label") == 1)
+        pos_profiles = (
+            self.selected_profiles.lazy()
+            .filter(pl.col("label") == 1)
             .select(["profile_id", "pos_profile_id", "platform_code", "profile_no"])
-            .join(
-                (
-                    self.input_data.filter(
-                        pl.col(target_value["flag"]).is_in(pos_flag_values)
-                    ).select(
-                        pl.col("platform_code"),
-                        pl.col("profile_no"),
-                        pl.col("observation_no"),
-                        pl.col("pres"),
-                        pl.col(target_value["flag"]).alias("flag"),
-                    )
-                ),
+        )
+        if self.profile_catalog is not None:
+            pos_profiles = pos_profiles.join(
+                self.profile_catalog.lazy()
+                .filter(pl.col(f"{target_name}_has_bad"))
+                .select(["platform_code", "profile_no"]),
                 on=["platform_code", "profile_no"],
+                how="semi",
             )
-            .with_columns(
-                pl.concat_str(
-                    ["platform_code", "profile_no", "observation_no"],
-                    separator="|",
-                ).alias("pair_id"),
-                pl.lit(1).alias("label"),
-            )
+
+        return pos_profiles.join(
+            (
+                input_query.filter(
+                    pl.col(target_value["flag"]).is_in(pos_flag_values)
+                ).select(
+                    pl.col("platform_code"),
+                    pl.col("profile_no"),
+                    pl.col("observation_no"),
+                    pl.col("pres"),
+                    pl.col(target_value["flag"]).alias("flag"),
+                )
+            ),
+            on=["platform_code", "profile_no"],
+        ).with_columns(
+            pl.struct(PAIR_KEY_COL_NAMES)
+            .rank("dense")
+            .cast(pl.UInt32)
+            .alias("pair_id"),
+            pl.lit(1).alias("label"),
         )
 
     def select_negative_rows(self, target_name: str, target_value: Dict) -> None:
@@ -131,83 +172,96 @@ class LocateDataSetA(LocatePositionBase):
         forming pairs where possible. Negative rows are typically "good"
         observations from nearby profiles, matched by pressure.
 
+        The rows are computed by :meth:`get_closest_day_query`.
+
+        :param target_name: The target name used to locate the corresponding positive rows.
+        :type target_name: str
+        :param target_value: A dictionary of target metadata, including the QC flag
+                             variable name used for selecting negative observations
+                             (e.g., flag=1 or any "good" flag).
+        :type target_value: Dict[str, any]
+        """
+        self.negative_rows[target_name] = self.get_closest_day_query(
+            target_value,
+            self.positive_rows[target_name].lazy(),
+            self.get_profile_input().lazy(),
+        ).collect()
+
+    def get_closest_day_query(
+        self,
+        target_value: Dict,
+        positive_rows: pl.LazyFrame,
+        input_query: pl.LazyFrame,
+    ) -> pl.LazyFrame:
+        """
+        Build the lazy query of :meth:`select_negative_rows_closest_day`.
+
         The alignment process involves:
 
         1. Selecting positive rows.
         2. Joining with negative profiles.
-        3. Joining with the full input data to get observation details.
-        4. Calculating pressure differences with corresponding positive observations.
-        5. Selecting the negative observation that best matches in pressure
-           for each positive observation to form a pair.
+        3. Selecting the "good" observations of the negative profiles from
+           the input data.
+        4. Matching each positive observation with the negative observation
+           of each paired profile that is closest in pressure, using a
+           nearest as-of join on ``pres`` by profile.
+
+        The as-of join searches the observations of each negative profile
+        sorted by pressure, so memory grows with the number of pairs instead
+        of the number of pairs times the observations per profile. If two
+        observations are equally close, the one with the higher pressure is
+        taken. Observations without a pressure are not paired.
 
-        :param target_name: The target name used to locate the corresponding positive rows.
-        :type target_name: str
         :param target_value: A dictionary of target metadata, including the QC flag
                              variable name used for selecting negative observations
                              (e.g., flag=1 or any "good" flag).
         :type target_value: Dict[str, any]
+        :param positive_rows: The positive rows of the target.
+        :type positive_rows: polars.LazyFrame
+        :param input_query: The input data.
+        :type input_query: polars.LazyFrame
+        :return: A query returning the negative rows of the target.
+        :rtype: polars.LazyFrame
         """
-        neg_flag_values = target_value.get("neg_flag_values", [1])
-        negative_rows = (
-            self.positive_rows[target_name]
+        neg_profiles = (
+            self.selected_profiles.lazy()
+            .filter(pl.col("label") == 0)
             .select(
-                pl.col("platform_code").alias("pos_platform_code"),
-                pl.col("profile_no").alias("pos_profile_no"),
+                pl.col("profile_id"),
+                pl.col("pos_profile_id"),
+                pl.col("platform_code"),
+                pl.col("profile_no"),
+            )
+        )
+        neg_obs = (
+            self.get_negative_obs_query(target_value, input_query)
+            .join(neg_profiles, on=["platform_code", "profile_no"], how="semi")
+            .drop_nulls("pres")
+            .sort("pres")
+        )
+
+        return (
+            positive_rows.select(
                 pl.col("pos_profile_id"),
-                pl.col("observation_no").alias("pos_observation_no"),
                 pl.col("pres").alias("pos_pres"),
                 pl.col("pair_id"),
             )
-            .join(
-                self.selected_profiles.filter(pl.col("label") == 0).select(
-                    pl.col("profile_id"),
-                    pl.col("pos_profile_id"),
-                    pl.col("platform_code"),
-                    pl.col("profile_no"),
-                ),
-                how="inner",
-                on="pos_profile_id",
-            )
-            .join(
-                self.input_data.filter(
-                    pl.col(target_value["flag"]).is_in(neg_flag_values)
-                ).select(
-                    pl.col("platform_code"),
-                    pl.col("profile_no"),
-                    pl.col("observation_no"),
-                    pl.col("pres"),
-                    pl.col(target_value["flag"]).alias("flag"),
-                ),
-                how="inner",
-                on=["platform_code", "profile_no"],
-            )
-            .with_columns(
-                (pl.col("pos_pres") - pl.col("pres")).abs().alias("pres_diff")
-            )
-            .group_by(
-                [
-                    "pos_profile_id",
-                    "pos_observation_no",
-                    "profile_id",
-                ]
-            )
-            .agg(pl.all().sort_by("pres_diff").first())
-            .select(
-                [
-                    pl.col("profile_id"),
-                    pl.col("platform_code"),
-                    pl.col("profile_no"),
-                    pl.col("observation_no"),
-                    pl.col("pres"),
-                    pl.col("flag"),
-                    pl.col("pair_id"),
-                    pl.lit(0).alias("label"),
-                ]
+            .join(neg_profiles, how="inner", on="pos_profile_id")
+            .drop_nulls("pos_pres")
+            .sort("pos_pres")
+            .join_asof(
+                neg_obs,
+                left_on="pos_pres",
+                right_on="pres",
+                by=["platform_code", "profile_no"],
+                strategy="nearest",
+                coalesce=False,
+                check_sortedness=False,
             )
+            .drop_nulls("observation_no")
+            .select(self.get_negative_row_exprs())
         )
 
-        self.negative_rows[target_name] = negative_rows
-
     def select_negative_rows_neighbor_n(
         self, target_name: str, target_value: Dict
     ) -> None:
@@ -216,12 +270,8 @@ class LocateDataSetA(LocatePositionBase):
         forming pairs where possible. Negative rows are typically "good"
         observations from nearby profiles, matched by pressure.
 
-        The alignment process involves:
-
-        1. Selecting positive profiles.
-        2. Generating neighbouring observation numbers.
-        3. Joining with the full input data to get observation details.
-        4. Selecting the negative observations.
+        The neighbouring observations are selected by
+        :meth:`get_neighbor_n_query`.
 
         :param target_name: The target name used to locate the corresponding positive rows.
         :type target_name: str
@@ -230,67 +280,164 @@ class LocateDataSetA(LocatePositionBase):
                              (e.g., flag=1 or any "good" flag).
         :type target_value: Dict[str, any]
         """
+        negative_rows = self.get_neighbor_n_query(
+            target_value,
+            self.positive_rows[target_name].lazy(),
+            self.get_profile_input().lazy(),
+        ).collect()
+
+        self.negative_rows[target_name] = self.negative_rows[target_name].vstack(
+            negative_rows
+        )
+
+    def get_neighbor_n_query(
+        self,
+        target_value: Dict,
+        positive_rows: pl.LazyFrame,
+        input_query: pl.LazyFrame,
+    ) -> pl.LazyFrame:
+        """
+        Build the lazy query of :meth:`select_negative_rows_neighbor_n`.
+
+        The "good" observations up to ``neighbor_n`` observation numbers above
+        and below each positive observation of the same profile are selected
+        as follows:
+
+        1. The input data is restricted to the profiles with positive rows and
+           sorted by ``observation_no`` within each profile.
+        2. The ``pair_id`` and ``profile_id`` of the positive rows are joined
+           to these rows.
+        3. For each offset ``j`` from 1 to ``neighbor_n`` in both directions,
+           the columns of the positive rows are shifted by ``j`` rows within
+           each profile. A row is a neighbour of the positive row ``j`` rows
+           away if their observation numbers differ by at most
+           ``neighbor_n`` in the same direction.
+        4. The neighbours without a "good" flag are dropped, which also
+           excludes the positive rows.
+
+        As observation numbers increase within a profile, each neighbour is
+        found at exactly one offset, so no table of candidate observation
+        numbers is built and the input data is not joined again.
+
+        :param target_value: A dictionary of target metadata, including the QC flag
+                             variable name used for selecting negative observations
+                             (e.g., flag=1 or any "good" flag).
+        :type target_value: Dict[str, any]
+        :param positive_rows: The positive rows of the target.
+        :type positive_rows: polars.LazyFrame
+        :param input_query: The input data.
+        :type input_query: polars.LazyFrame
+        :return: A query returning the neighbouring negative rows of the target.
+        :rtype: polars.LazyFrame
+        """
         neighbor_n = self.config.get_step_params("locate").get("neighbor_n", 0)
-        neighbor_no = list(range(1, neighbor_n + 1)) + [
-            -x for x in range(1, neighbor_n + 1)
-        ]
         neg_flag_values = target_value.get("neg_flag_values", [1])
+        profile_col_names = ["platform_code", "profile_no"]
 
-        negative_rows = (
-            self.positive_rows[target_name]
-            .select(
-                pl.col("profile_id"),
+        profile_rows = (
+            input_query.select(
                 pl.col("platform_code"),
                 pl.col("profile_no"),
                 pl.col("observation_no"),
-                pl.col("pair_id"),
+                pl.col("pres"),
+                pl.col(target_value["flag"]).alias("flag"),
             )
             .join(
-                pl.DataFrame({"neighbor_no": neighbor_no}),
-                how="cross",
-            )
-            .with_columns(
-                (pl.col("observation_no") + pl.col("neighbor_no"))
-                .cast(pl.Int32)
-                .alias("observation_no")
+                positive_rows.select(profile_col_names).unique(),
+                on=profile_col_names,
+                how="semi",
             )
             .join(
-                self.input_data.filter(
-                    pl.col(target_value["flag"]).is_in(neg_flag_values)
-                ).select(
-                    pl.col("platform_code"),
-                    pl.col("profile_no"),
-                    pl.col("observation_no"),
-                    pl.col("pres"),
-                    pl.col(target_value["flag"]).alias("flag"),
-                ),
-                how="inner",
-                on=["platform_code", "profile_no", "observation_no"],
-            )
-            .select(
-                [
-                    pl.col("profile_id"),
-                    pl.col("platform_code"),
-                    pl.col("profile_no"),
-                    pl.col("observation_no"),
-                    pl.col("pres"),
-                    pl.col("flag"),
-                    pl.col("pair_id"),
-                    pl.lit(0).alias("label"),
-                ]
+                positive_rows.select(
+                    ["pair_id", "profile_id"] + PAIR_KEY_COL_NAMES
+                ).rename({"profile_id": "pos_profile_id"}),
+                on=PAIR_KEY_COL_NAMES,
+                how="left",
             )
+            .sort(PAIR_KEY_COL_NAMES)
         )
-        self.negative_rows[target_name] = self.negative_rows[target_name].vstack(
-            negative_rows
+
+        offset_rows = []
+        for offset in list(range(1, neighbor_n + 1)) + [
+            -x for x in range(1, neighbor_n + 1)
+        ]:
+            obs_diff = (pl.col("observation_no") - pl.col("pos_observation_no")) * (
+                1 if offset > 0 else -1
+            )
+            offset_rows.append(
+                profile_rows.with_columns(
+                    pl.col("pair_id").shift(offset).over(profile_col_names),
+                    pl.col("pos_profile_id")
+                    .shift(offset)
+                    .over(profile_col_names)
+                    .alias("profile_id"),
+                    pl.col("observation_no")
+                    .shift(offset)
+                    .over(profile_col_names)
+                    .alias("pos_observation_no"),
+                ).filter(
+                    pl.col("pair_id").is_not_null()
+                    & obs_diff.is_between(1, neighbor_n)
+                    & pl.col("flag").is_in(neg_flag_values)
+                )
+            )
+
+        return pl.concat(offset_rows).select(self.get_negative_row_exprs())
+
+    @staticmethod
+    def get_negative_obs_query(
+        target_value: Dict, input_query: pl.LazyFrame
+    ) -> pl.LazyFrame:
+        """
+        Select the observations with a "good" flag of a target.
+
+        :param target_value: A dictionary of target metadata, including the QC flag
+                             variable name used for selecting negative observations
+                             (e.g., flag=1 or any "good" flag).
+        :type target_value: Dict[str, any]
+        :param input_query: The input data.
+        :type input_query: polars.LazyFrame
+        :return: A query with the observation keys, ``pres`` and ``flag``.
+        :rtype: polars.LazyFrame
+        """
+        neg_flag_values = target_value.get("neg_flag_values", [1])
+
+        return input_query.filter(
+            pl.col(target_value["flag"]).is_in(neg_flag_values)
+        ).select(
+            pl.col("platform_code"),
+            pl.col("profile_no"),
+            pl.col("observation_no"),
+            pl.col("pres"),
+            pl.col(target_value["flag"]).alias("flag"),
         )
 
+    @staticmethod
+    def get_negative_row_exprs() -> List[pl.Expr]:
+        """
+        Get the columns of the negative rows.
+
+        :return: The expressions selecting the columns of :attr:`negative_rows`.
+        :rtype: List[polars.Expr]
+        """
+        return [
+            pl.col("profile_id"),
+            pl.col("platform_code"),
+            pl.col("profile_no"),
+            pl.col("observation_no"),
+            pl.col("pres"),
+            pl.col("flag"),
+            pl.col("pair_id"),
+            pl.lit(0).alias("label"),
+        ]
+
     def locate_target_rows(self, target_name: str, target_value: Dict) -> None:
         """
         Locate training data rows by consolidating positive and negative subsets.
         This method first calls :meth:`select_positive_rows` and
         :meth:`select_negative_rows` to gather the respective dataframes,
-        then stacks them, adds a unique row index, and creates a `pair_id`
-        for linking paired observations.
+        then stacks them and adds a unique row index. Paired observations
+        share the integer ``pair_id`` of the positive observation.
 
         :param target_name: Name of the target variable (e.g., 'TEMP_QC').
         :type target_name: str
@@ -307,3 +454,60 @@ class LocateDataSetA(LocatePositionBase):
             .vstack(self.negative_rows[target_name])
             .with_row_index("row_id", offset=1)
         )
+
+    def locate_target_rows_lazy(
+        self, target_name: str, target_value: Dict, input_query: pl.LazyFrame
+    ) -> pl.LazyFrame:
+        """
+        Build a lazy query for the rows of :meth:`locate_target_rows`.
+
+        :attr:`positive_rows` and :attr:`negative_rows` are not set.
+        Neighbouring observations are selected with the windowed shifts of
+        :meth:`get_neighbor_n_query`.
+
+        :param target_name: Name of the target variable (e.g., 'TEMP_QC').
+        :type target_name: str
+        :param target_value: A dictionary of target metadata, including the QC flag
+                             variable name used for both positive and negative selection.
+        :type target_value: Dict[str, any]
+        :param input_query: The shared input from :meth:`get_input_query`.
+        :type input_query: polars.LazyFrame
+        :return: A query returning the selected rows of the target.
+        :rtype: polars.LazyFrame
+        """
+        positive_rows = self.get_positive_rows_query(
+            target_name, target_value, input_query
+        )
+        row_queries = [
+            positive_rows.drop("pos_profile_id"),
+            self.get_closest_day_query(target_value, positive_rows, input_query),
+        ]
+        if self.config.get_step_params("locate").get("neighbor_n", 0) > 0:
+            row_queries.append(
+                self.get_neighbor_n_query(target_value, positive_rows, input_query)
+            )
+
+        return pl.concat(row_queries).with_row_index("row_id", offset=1)
+
+    def decode_pair_ids(self, target_name: str) -> pl.DataFrame:
+        """
+        Map the ``pair_id`` of a target to its positive observation, for
+        debugging.
+
+        :param target_name: Name of the target variable.
+        :type target_name: str
+        :return: One row per ``pair_id`` with the columns of
+                 :data:`PAIR_KEY_COL_NAMES` and ``pair_key``, which joins them
+                 with ``|``.
+        :rtype: polars.DataFrame
+        """
+        return (
+            self.selected_rows[target_name]
+            .filter(pl.col("label") == 1)
+            .select(
+                ["pair_id"]
+                + PAIR_KEY_COL_NAMES
+                + [pl.concat_str(PAIR_KEY_COL_NAMES, separator="|").alias("pair_key")]
+            )
+            .sort("pair_id")
+        )
@@ -79,15 +79,70 @@ class LocateDataSetAll(LocatePositionBase):
         if self.input_data is None:
             raise ValueError("Member variable 'input_data' must not be empty.")
 
+        self.selected_rows[target_name] = self.locate_target_rows_lazy(
+            target_name, target_value, self.get_input_query()
+        ).collect()
+
+    def locate_target_rows(self, target_name: str, target_value: Dict) -> None:
+        """
+        Locate target rows for training or evaluation by calling :meth:`select_all_rows`.
+
+        This method acts as a wrapper, ensuring all rows are considered for the target
+        based on the provided QC flag.
+
+        :param target_name: Name of the target variable.
+        :type target_name: str
+        :param target_value: A dictionary of target metadata, including
+                             the QC flag variable name used for labeling
+                             (e.g., ``{"flag": "TEMP_QC_FLAG"}``).
+        :type target_value: dict
+        """
+        self.select_all_rows(target_name, target_value)
+
+    def get_input_query(self) -> pl.LazyFrame:
+        """
+        Build the lazy input shared by the targets, numbering the rows of
+        :meth:`get_profile_input` with ``row_id`` before they are filtered.
+
+        :return: A lazy view of the input data of the selected profiles with
+                 ``row_id``.
+        :rtype: polars.LazyFrame
+        """
+        return (
+            self.get_profile_input()
+            .lazy()
+            .with_row_index("row_id", offset=1)
+            .select(["row_id"] + self.get_input_col_names())
+        )
+
+    def locate_target_rows_lazy(
+        self, target_name: str, target_value: Dict, input_query: pl.LazyFrame
+    ) -> pl.LazyFrame:
+        """
+        Build a lazy query for the rows of :meth:`select_all_rows`.
+
+        :param target_name: Name of the target variable.
+        :type target_name: str
+        :param target_value: A dictionary of target metadata, including
+                             the QC flag variable name used for labeling
+                             (e.g., ``{"flag": "TEMP_QC_FLAG"}``).
+        :type target_value: dict
+        :param input_query: The shared input from :meth:`get_input_query`.
+        :type input_query: polars.LazyFrame
+        :return: A query returning the selected rows of the target.
+        :rtype: polars.LazyFrame
+        """
         pos_flag_values = target_value.get("pos_flag_values", [4])
         neg_flag_values = target_value.get("neg_flag_values", [1])
         flag_var_name = target_value["flag"]
-        self.selected_rows[target_name] = (
-            self.input_data.with_row_index("row_id", offset=1)
-            .filter(pl.col(flag_var_name).is_in(pos_flag_values + neg_flag_values))
+
+        return (
+            input_query.filter(
+                pl.col(flag_var_name).is_in(pos_flag_values + neg_flag_values)
+            )
             .with_columns(
                 pl.lit(0, dtype=pl.UInt32).alias("profile_id"),
-                pl.lit("").alias("pair_id"),
+                pl.lit(0, dtype=pl.UInt32).alias("pair_id"),
                 pl.when(pl.col(flag_var_name).is_in(pos_flag_values))
                 .then(1)
                 .when(pl.col(flag_var_name).is_in(neg_flag_values))
@@ -107,19 +162,3 @@ class LocateDataSetAll(LocatePositionBase):
                 pl.col("pair_id"),
             )
         )
-
-    def locate_target_rows(self, target_name: str, target_value: Dict) -> None:
-        """
-        Locate target rows for training or evaluation by calling :meth:`select_all_rows`.
-
-        This method acts as a wrapper, ensuring all rows are considered for the target
-        based on the provided QC flag.
-
-        :param target_name: Name of the target variable.
-        :type target_name: str
-        :param target_value: A dictionary of target metadata, including
-                             the QC flag variable name used for labeling
-                             (e.g., ``{"flag": "TEMP_QC_FLAG"}``).
-        :type target_value: dict
-        """
-        self.select_all_rows(target_name, target_value)
@@ -9,12 +9,13 @@ leveraging configuration settings and handling data I/O.
 
 import os
 from abc import abstractmethod
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 import polars as pl
 
 from dmqclib.common.base.config_base import ConfigBase
 from dmqclib.common.base.dataset_base import DataSetBase
+from dmqclib.common.utils.catalog import filter_profiles
 
 
 class LocatePositionBase(DataSetBase):
@@ -85,6 +86,18 @@ class LocatePositionBase(DataSetBase):
         #: target rows for each target as a Polars DataFrame, keyed by target name.
         self.selected_rows: Dict[str, pl.DataFrame] = {}
 
+        #: Optional[:class:`polars.DataFrame`]: The per-profile QC flag counts
+        #: of the select step (see
+        #: :func:`dmqclib.common.utils.catalog.build_profile_catalog`), used to
+        #: skip profiles without flags of a target. Set by the caller.
+        self.profile_catalog: Optional[pl.DataFrame] = None
+
+        #: Optional[:class:`polars.DataFrame`]: The rows of :attr:`input_data`
+        #: that belong to the selected profiles. The caller may set it to the
+        #: ``profile_input`` of the select step; otherwise it is created by
+        #: :meth:`get_profile_input` on first use.
+        self.profile_input: Optional[pl.DataFrame] = None
+
     def process_targets(self) -> None:
         """
         Iterate over all defined targets and call :meth:`locate_target_rows` on each.
@@ -93,10 +106,115 @@ class LocatePositionBase(DataSetBase):
         the configuration object (:attr:`config`) and then sequentially processes
         each target. The concrete logic for identifying rows per target is
         implemented in subclasses via the abstract :meth:`locate_target_rows` method.
+
+        If ``fused`` is enabled in the locate step parameters,
+        :meth:`process_targets_fused` is used instead.
         """
+        if self.config.get_step_params("locate").get("fused", False):
+            self.process_targets_fused()
+            return
+
         for target_name, target_info in self.config.get_target_dict().items():
             self.locate_target_rows(target_name, target_info)
 
+    def process_targets_fused(self) -> None:
+        """
+        Locate the rows of all targets with one lazy query per target, executed
+        together with :func:`polars.collect_all`.
+
+        Every query starts from the same :meth:`get_input_query`, so the
+        subplans shared by the targets, such as the join with the selected
+        profiles and the projection of the key columns, are computed once.
+        Targets for which :meth:`locate_target_rows_lazy` returns None are
+        processed with :meth:`locate_target_rows`.
+        """
+        input_query = self.get_input_query()
+        queries = {}
+        for target_name, target_info in self.config.get_target_dict().items():
+            query = self.locate_target_rows_lazy(target_name, target_info, input_query)
+            if query is None:
+                self.locate_target_rows(target_name, target_info)
+            else:
+                queries[target_name] = query
+
+        self.selected_rows.update(
+            zip(queries.keys(), pl.collect_all(list(queries.values())))
+        )
+
+    def get_profile_input(self) -> pl.DataFrame:
+        """
+        Get the input data to locate rows in: the rows of :attr:`input_data`
+        that belong to :attr:`selected_profiles`.
+
+        If :attr:`profile_input` is not set, it is created from
+        :attr:`input_data` and :attr:`selected_profiles` with
+        :func:`dmqclib.common.utils.catalog.filter_profiles`, so the result
+        does not depend on whether the caller shares the input of the select
+        step. Without :attr:`selected_profiles`, :attr:`input_data` is used.
+
+        :return: The input data of the selected profiles.
+        :rtype: polars.DataFrame
+        """
+        if self.profile_input is None:
+            if self.selected_profiles is None:
+                return self.input_data
+            self.profile_input = filter_profiles(
+                self.input_data, self.selected_profiles
+            )
+
+        return self.profile_input
+
+    def get_input_col_names(self) -> List[str]:
+        """
+        Get the columns of :attr:`input_data` used to locate the rows of all
+        targets: the profile and observation keys, ``pres`` and the flag
+        column of every target.
+
+        :return: The column names, without duplicates.
+        :rtype: List[str]
+        """
+        col_names = ["platform_code", "profile_no", "observation_no", "pres"] + [
+            x["flag"] for x in self.config.get_target_dict().values()
+        ]
+
+        return list(dict.fromkeys(col_names))
+
+    def get_input_query(self) -> pl.LazyFrame:
+        """
+        Build the lazy input shared by the queries of
+        :meth:`process_targets_fused`.
+
+        The default implementation projects :meth:`get_profile_input` to
+        :meth:`get_input_col_names`.
+
+        :return: A lazy view of the input data.
+        :rtype: polars.LazyFrame
+        """
+        return self.get_profile_input().lazy().select(self.get_input_col_names())
+
+    def locate_target_rows_lazy(
+        self, target_name: str, target_value: Dict, input_query: pl.LazyFrame
+    ) -> Optional[pl.LazyFrame]:
+        """
+        Build a lazy query for the rows of a target, equivalent to
+        :meth:`locate_target_rows`, for :meth:`process_targets_fused`.
+
+        The default implementation returns None, which processes the target
+        with :meth:`locate_target_rows` instead.
+
+        :param target_name: The name of the target variable.
+        :type target_name: str
+        :param target_value: A dictionary containing metadata or specific criteria
+                             for the target, as defined in the configuration.
+        :type target_value: Dict
+        :param input_query: The shared input from :meth:`get_input_query`.
+        :type input_query: polars.LazyFrame
+        :return: A query returning the value of :attr:`selected_rows` for the
+                 target, or None.
+        :rtype: Optional[polars.LazyFrame]
+        """
+        return None
+
     @abstractmethod
     def locate_target_rows(self, target_name: str, target_value: Dict) -> None:
         """
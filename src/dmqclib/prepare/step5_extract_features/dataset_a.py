@@ -34,6 +34,7 @@ class ExtractDataSetA(ExtractFeatureBase):
         selected_profiles: Optional[pl.DataFrame] = None,
         selected_rows: Optional[Dict[str, pl.DataFrame]] = None,
         summary_stats: Optional[pl.DataFrame] = None,
+        profile_input: Optional[pl.DataFrame] = None,
     ) -> None:
         """
         Initializes the feature extraction workflow for Copernicus CTD data.
@@ -62,6 +63,11 @@ class ExtractDataSetA(ExtractFeatureBase):
                               (e.g., mean, standard deviation) that may guide scaling
                               or normalization of features. Defaults to None.
         :type summary_stats: :class:`polars.DataFrame` or None
+        :param profile_input: An optional Polars DataFrame with the rows of
+                              ``input_data`` that belong to the selected profiles.
+                              If given, the input data is not joined with
+                              ``selected_profiles`` again. Defaults to None.
+        :type profile_input: :class:`polars.DataFrame` or None
         """
         super().__init__(
             config=config,
@@ -69,4 +75,5 @@ class ExtractDataSetA(ExtractFeatureBase):
             selected_profiles=selected_profiles,
             selected_rows=selected_rows,
             summary_stats=summary_stats,
+            profile_input=profile_input,
         )
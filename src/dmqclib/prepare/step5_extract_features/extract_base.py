@@ -9,6 +9,7 @@ to Parquet files.
 """
 
 import os
+from functools import cached_property
 from typing import Dict, Optional
 
 import polars as pl
@@ -16,6 +17,9 @@ import polars as pl
 from dmqclib.common.base.config_base import ConfigBase
 from dmqclib.common.base.dataset_base import DataSetBase
 from dmqclib.common.loader.feature_loader import load_feature_class
+from dmqclib.common.utils.catalog import filter_profiles
+from dmqclib.common.utils.sort import is_sorted_by
+from dmqclib.prepare.step2_calc_stats.summary_base import SummaryStatsBase
 
 
 class ExtractFeatureBase(DataSetBase):
@@ -36,6 +40,7 @@ class ExtractFeatureBase(DataSetBase):
         selected_profiles: Optional[pl.DataFrame] = None,
         selected_rows: Optional[Dict[str, pl.DataFrame]] = None,
         summary_stats: Optional[pl.DataFrame] = None,
+        profile_input: Optional[pl.DataFrame] = None,
     ) -> None:
         """
         Initialize the feature extraction base class.
@@ -57,6 +62,12 @@ class ExtractFeatureBase(DataSetBase):
         :param summary_stats: A Polars DataFrame containing summary statistics that
                               might guide feature scaling, defaults to None.
         :type summary_stats: Optional[pl.DataFrame]
+        :param profile_input: The rows of ``input_data`` that belong to the
+                              selected profiles, from the select step. If
+                              given, it is used as :attr:`filtered_input`
+                              instead of joining ``input_data`` with
+                              ``selected_profiles``. Defaults to None.
+        :type profile_input: Optional[pl.DataFrame]
         :raises NotImplementedError: If the subclass does not define
                                      ``expected_class_name`` (when instantiating a real subclass).
         :raises ValueError: If the provided YAML config does not match this class's
@@ -74,12 +85,23 @@ class ExtractFeatureBase(DataSetBase):
 
         self.input_data: Optional[pl.DataFrame] = input_data
         self.selected_profiles: Optional[pl.DataFrame] = selected_profiles
-
         # Filter input data if both input_data and selected_profiles are present
-        if input_data is not None and selected_profiles is not None:
+        if profile_input is not None:
+            self.filtered_input: Optional[pl.DataFrame] = profile_input
+        elif input_data is not None and selected_profiles is not None:
             self._filter_input()
         else:
-            self.filtered_input: Optional[pl.DataFrame] = None
+            self.filtered_input = None
+
+        #: Whether :attr:`filtered_input` is sorted by ``platform_code``,
+        #: ``profile_no`` and ``observation_no``. It is only checked if
+        #: ``sort_order`` is set in the input step parameters, and passed on
+        #: to the feature classes to enable sorted lookups.
+        self.sorted_input: bool = (
+            self.config.get_step_params("input").get("sort_order") is not None
+            and self.filtered_input is not None
+            and is_sorted_by(self.filtered_input)
+        )
 
         #: A dict of Polars DataFrames, one per target, indicating rows to be used.
         self.selected_rows: Optional[Dict[str, pl.DataFrame]] = selected_rows
@@ -95,6 +117,24 @@ class ExtractFeatureBase(DataSetBase):
         #: will be dropped from the final feature set.
         self.drop_col_names: list[str] = []
 
+    @cached_property
+    def summary_stats_wide(self) -> Optional[pl.DataFrame]:
+        """
+        The per-profile rows of :attr:`summary_stats` with one row per profile.
+
+        They are reshaped on first use and shared by all
+        ``profile_summary_stats`` features, so that they are reshaped at most
+        once and not at all if no such feature is configured.
+
+        :return: The wide statistics, or None if :attr:`summary_stats` is not
+                 in the long layout of the summary step.
+        :rtype: Optional[pl.DataFrame]
+        """
+        if self.summary_stats is None or "variable" not in self.summary_stats.columns:
+            return None
+
+        return SummaryStatsBase.pivot_summary_stats(self.summary_stats)
+
     def _filter_input(self) -> None:
         """
         Filter the input data by joining with the selected profiles.
@@ -108,13 +148,7 @@ class ExtractFeatureBase(DataSetBase):
                                                 from the input DataFrames, or if
                                                 the join operation fails.
         """
-        self.filtered_input = self.input_data.join(
-            self.selected_profiles.select(
-                pl.col("platform_code"),
-                pl.col("profile_no"),
-            ).unique(),
-            on=["platform_code", "profile_no"],
-        )
+        self.filtered_input = filter_profiles(self.input_data, self.selected_profiles)
 
     def process_targets(self) -> None:
         """
@@ -194,6 +228,9 @@ class ExtractFeatureBase(DataSetBase):
             self.selected_rows,
             self.summary_stats,
         )
+        ds.sorted_input = self.sorted_input
+        if feature_info.get("feature") == "profile_summary_stats":
+            ds.summary_stats_wide = self.summary_stats_wide
 
         ds.scale_first()
         ds.extract_features()
@@ -360,3 +360,45 @@ class TestBaseConfigSummaryStats(unittest.TestCase):
         for x in ds.data["feature_param_set"]["params"]:
             if "stats_set" in x:
                 self.assertIn("stats", x)
+
+
+class TestBaseConfigHash(unittest.TestCase):
+    """A suite of tests that verify the configuration hash used for cache keys."""
+
+    def setUp(self):
+        """Set up a reference to the test configuration file (test_dataset_001.yaml)."""
+        self.config_file_path = (
+            Path(__file__).resolve().parent
+            / "data"
+            / "config"
+            / "test_dataset_001.yaml"
+        )
+
+    def test_config_hash_stable(self):
+        """Confirm that two loads of the same configuration have the same hash."""
+        ds1 = DataSetConfig(str(self.config_file_path))
+        ds1.select("NRT_BO_001")
+        ds2 = DataSetConfig(str(self.config_file_path))
+        ds2.select("NRT_BO_001")
+
+        self.assertEqual(ds1.get_config_hash(), ds2.get_config_hash())
+        self.assertEqual(64, len(ds1.get_config_hash()))
+
+    def test_config_hash_changes(self):
+        """Confirm that the hash only changes when the selected keys change."""
+        ds = DataSetConfig(str(self.config_file_path))
+        ds.select("NRT_BO_001")
+        full_hash = ds.get_config_hash()
+        target_hash = ds.get_config_hash(["target_set"])
+
+        ds.get_step_params("split")["k_fold"] = 5
+        self.assertNotEqual(full_hash, ds.get_config_hash())
+        self.assertEqual(target_hash, ds.get_config_hash(["target_set"]))
+
+    def test_config_hash_invalid_key(self):
+        """Ensure that an unknown key raises a KeyError."""
+        ds = DataSetConfig(str(self.config_file_path))
+        ds.select("NRT_BO_001")
+
+        with self.assertRaises(KeyError):
+            ds.get_config_hash(["invalid_key"])
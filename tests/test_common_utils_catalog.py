@@ -0,0 +1,90 @@
+"""
+Unit tests for the profile catalog in dmqclib.common.utils.catalog, verifying
+the per-profile QC flag counts and the selection filters built on them.
+"""
+
+import unittest
+
+import polars as pl
+
+from dmqclib.common.utils.catalog import (
+    build_profile_catalog,
+    filter_profiles,
+    has_any_bad,
+    has_only_good,
+)
+
+
+class TestProfileCatalog(unittest.TestCase):
+    """
+    Tests for build_profile_catalog, has_any_bad, has_only_good and
+    filter_profiles.
+    """
+
+    def setUp(self):
+        """
+        Create three profiles with different combinations of QC flags.
+        """
+        self.input_data = pl.DataFrame(
+            {
+                "platform_code": ["A", "A", "A", "B", "B", "C", "C"],
+                "profile_no": [1, 1, 1, 1, 1, 1, 1],
+                "temp_qc": [1, 4, 1, 1, 1, 1, 1],
+                "psal_qc": [1, 1, None, 1, 1, 1, 3],
+            }
+        )
+        self.target_dict = {
+            "temp": {"flag": "temp_qc"},
+            "psal": {"flag": "psal_qc", "pos_flag_values": [3, 4]},
+        }
+        self.catalog = build_profile_catalog(
+            self.input_data, self.target_dict, ["platform_code", "profile_no"]
+        ).sort("platform_code")
+
+    def test_counts(self):
+        """
+        Check the row and flag counts of every profile.
+        """
+        self.assertEqual(self.catalog.shape, (3, 11))
+        self.assertEqual(self.catalog["n_rows"].to_list(), [3, 2, 2])
+        self.assertEqual(self.catalog["temp_n_bad"].to_list(), [1, 0, 0])
+        self.assertEqual(self.catalog["temp_n_good"].to_list(), [2, 2, 2])
+        self.assertEqual(self.catalog["psal_n_bad"].to_list(), [0, 0, 1])
+        self.assertEqual(self.catalog["psal_n_good"].to_list(), [2, 2, 1])
+
+    def test_bits(self):
+        """
+        Check the derived flag bits of every profile.
+        """
+        self.assertEqual(self.catalog["temp_has_bad"].to_list(), [True, False, False])
+        self.assertEqual(self.catalog["psal_has_good"].to_list(), [True, True, True])
+
+    def test_filters(self):
+        """
+        Check that the positive and negative filters select the expected profiles.
+        """
+        target_names = list(self.target_dict.keys())
+        self.assertEqual(
+            self.catalog.filter(has_any_bad(target_names))["platform_code"].to_list(),
+            ["A", "C"],
+        )
+        self.assertEqual(
+            self.catalog.filter(has_only_good(target_names))["platform_code"].to_list(),
+            ["B"],
+        )
+
+    def test_filter_profiles(self):
+        """
+        Check that the rows of the given profiles are kept once and in order.
+        """
+        profiles = pl.DataFrame(
+            {
+                "platform_code": ["C", "A", "C"],
+                "profile_no": [1, 1, 1],
+                "label": [0, 1, 0],
+            }
+        )
+        df = filter_profiles(self.input_data, profiles)
+        self.assertEqual(df.columns, self.input_data.columns)
+        self.assertEqual(df["platform_code"].to_list(), ["A", "A", "A", "C", "C"])
+        self.assertEqual(df["psal_qc"].to_list(), [1, 1, None, 1, 3])
@@ -1,5 +1,5 @@
 """
-Module for testing the `read_input_file` utility function.
+Module for testing the `read_input_file` and `scan_input_file` utility functions.
 
 This module contains a series of unit tests for the `read_input_file` function,
 covering various scenarios such as reading different file types (parquet, csv, tsv,
@@ -7,12 +7,32 @@ and gzipped versions), inferring file types, handling unsupported file types,
 managing non-existent files, and passing additional reader options.
 """
 
+import gzip
+import os
+import shutil
+import tempfile
 import unittest
 from pathlib import Path
 
 import polars as pl
+import pyarrow.parquet as pq
 
-from dmqclib.common.utils.file import read_input_file
+from dmqclib.common.utils.file import (
+    build_profile_index,
+    get_cache_file_name,
+    get_cached_input_file,
+    get_file_fingerprint,
+    get_hive_partitions,
+    get_input_fingerprint,
+    iter_input_file_batches,
+    list_input_files,
+    read_profile_rows,
+    read_input_file,
+    read_input_files,
+    scan_input_file,
+    stage_input_file,
+    write_profile_clustered_parquet,
+)
 
 
 class TestReadInputFile(unittest.TestCase):
@@ -40,6 +60,7 @@ class TestReadInputFile(unittest.TestCase):
             ("nrt_cora_bo_test_2023_row1.tsv", 1, "tsv"),
             ("nrt_cora_bo_test_2023_row1.csv.gz", 1, "csv.gz"),
             ("nrt_cora_bo_test_2023_row1.tsv.gz", 1, "tsv.gz"),
+            ("nrt_cora_bo_test_2023_row1.arrow", 1, "ipc"),
         ]
         for file_name, expected_rows, file_type in test_cases:
             with self.subTest(file_name=file_name, file_type=file_type):
@@ -60,6 +81,7 @@ class TestReadInputFile(unittest.TestCase):
             ("nrt_cora_bo_test_2023_row1.tsv", 1),
             ("nrt_cora_bo_test_2023_row1.csv.gz", 1),
             ("nrt_cora_bo_test_2023_row1.tsv.gz", 1),
+            ("nrt_cora_bo_test_2023_row1.arrow", 1),
         ]
         for file_name, expected_rows in test_cases:
             with self.subTest(file_name=file_name):
@@ -118,3 +140,580 @@ class TestReadInputFile(unittest.TestCase):
         file_path = self.test_data_dir / file_name
         with self.assertRaises(ValueError):
             _ = read_input_file(file_path)
+
+
+class TestScanInputFile(unittest.TestCase):
+    """
+    A suite of tests verifying that 'scan_input_file' returns LazyFrames
+    for all supported file types.
+    """
+
+    def setUp(self):
+        """
+        Set the directory where test data files are located.
+        """
+        self.test_data_dir = Path(__file__).resolve().parent / "data" / "input"
+
+    def test_scan_input_file_infer_type(self):
+        """
+        Tests scanning various file types when 'file_type' is inferred from the file extension.
+        """
+        test_cases = [
+            ("nrt_cora_bo_test.parquet", 132342),
+            ("nrt_cora_bo_test_2023_row1.csv", 1),
+            ("nrt_cora_bo_test_2023_row1.tsv", 1),
+            ("nrt_cora_bo_test_2023_row1.csv.gz", 1),
+            ("nrt_cora_bo_test_2023_row1.tsv.gz", 1),
+            ("nrt_cora_bo_test_2023_row1.arrow", 1),
+        ]
+        for file_name, expected_rows in test_cases:
+            with self.subTest(file_name=file_name):
+                file_path = self.test_data_dir / file_name
+                lf = scan_input_file(file_path, file_type=None, options={})
+                self.assertIsInstance(lf, pl.LazyFrame)
+                df = lf.collect()
+                self.assertEqual(df.shape[0], expected_rows)
+                self.assertEqual(df.shape[1], 30)
+
+    def test_scan_with_projection(self):
+        """
+        Tests that a column selection on the scanned LazyFrame is applied.
+        """
+        file_path = self.test_data_dir / "nrt_cora_bo_test.parquet"
+        df = (
+            scan_input_file(file_path).select(["platform_code", "profile_no"]).collect()
+        )
+        self.assertEqual(df.columns, ["platform_code", "profile_no"])
+
+    def test_unsupported_file_type(self):
+        """
+        Verifies that passing an explicitly unsupported 'file_type' raises a ValueError.
+        """
+        file_path = self.test_data_dir / "nrt_cora_bo_test.parquet"
+        with self.assertRaises(ValueError) as context:
+            _ = scan_input_file(file_path, file_type="foo", options={})
+        self.assertIn("Unsupported file_type 'foo'", str(context.exception))
+
+    def test_non_existent_file(self):
+        """
+        Verifies that attempting to scan a non-existent file raises a FileNotFoundError.
+        """
+        with self.assertRaises(FileNotFoundError):
+            _ = scan_input_file(Path("non_existent_file.csv"), file_type="csv")
+
+
+class TestMultiFileInput(unittest.TestCase):
+    """
+    A suite of tests verifying that directories, glob patterns and
+    Hive-partitioned data sets can be read as a single input.
+    """
+
+    def setUp(self):
+        """
+        Write the test data into a temporary Hive-partitioned directory.
+        """
+        self.test_data_file = (
+            Path(__file__).resolve().parent
+            / "data"
+            / "input"
+            / "nrt_cora_bo_test.parquet"
+        )
+        self.test_dir = tempfile.mkdtemp()
+        df = pl.read_parquet(self.test_data_file)
+        for year in [2022, 2023]:
+            part_dir = os.path.join(self.test_dir, f"year={year}")
+            os.makedirs(part_dir)
+            df.filter(pl.col("profile_timestamp").dt.year() == year).write_parquet(
+                os.path.join(part_dir, "part-0.parquet")
+            )
+        open(os.path.join(self.test_dir, "_SUCCESS"), "w").close()
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.test_dir)
+
+    def test_list_input_files_directory(self):
+        """
+        Tests that a directory is searched recursively and non-data files are ignored.
+        """
+        input_files = list_input_files(self.test_dir)
+        self.assertEqual(len(input_files), 2)
+        self.assertTrue(all(x.endswith(".parquet") for x in input_files))
+
+    def test_list_input_files_glob(self):
+        """
+        Tests that a glob pattern is expanded.
+        """
+        input_files = list_input_files(os.path.join(self.test_dir, "year=2023", "*"))
+        self.assertEqual(len(input_files), 1)
+
+    def test_list_input_files_no_match(self):
+        """
+        Tests that a glob pattern without matches raises a FileNotFoundError.
+        """
+        with self.assertRaises(FileNotFoundError):
+            _ = list_input_files(os.path.join(self.test_dir, "*.csv"))
+
+    def test_get_hive_partitions(self):
+        """
+        Tests that partition values are parsed and converted.
+        """
+        self.assertEqual(
+            get_hive_partitions("/data/year=2022/month=05/grid=a1/part-0.parquet"),
+            {"year": 2022, "month": 5, "grid": "a1"},
+        )
+
+    def test_read_input_file_directory(self):
+        """
+        Tests that a directory is read with its partition values as columns.
+        """
+        df = read_input_file(self.test_dir)
+        self.assertEqual(df.shape[0], 16470 + 19480)
+        self.assertEqual(df.shape[1], 31)
+        self.assertEqual(sorted(df["year"].unique().to_list()), [2022, 2023])
+
+    def test_read_input_files_without_partitions(self):
+        """
+        Tests that partition columns can be omitted.
+        """
+        df = read_input_files(
+            list_input_files(self.test_dir), max_workers=1, hive_partitioning=False
+        )
+        self.assertEqual(df.shape[1], 30)
+
+    def test_scan_input_file_directory(self):
+        """
+        Tests that a directory can be scanned lazily.
+        """
+        lf = scan_input_file(self.test_dir)
+        self.assertIsInstance(lf, pl.LazyFrame)
+        self.assertEqual(lf.collect().shape[0], 16470 + 19480)
+
+
+class TestParquetCache(unittest.TestCase):
+    """
+    A suite of tests verifying that text inputs are converted once into cached
+    Parquet files and that the cache is refreshed when the source changes.
+    """
+
+    def setUp(self):
+        """
+        Copy a gzipped TSV test file and create an empty cache directory.
+        """
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.test_dir, "cache")
+        self.input_file = os.path.join(self.test_dir, "input.tsv.gz")
+        shutil.copy(
+            Path(__file__).resolve().parent
+            / "data"
+            / "input"
+            / "nrt_cora_bo_test_2023_row1.tsv.gz",
+            self.input_file,
+        )
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.test_dir)
+
+    def test_cache_file_created(self):
+        """
+        Check that the first read writes a Parquet file with the same content.
+        """
+        df = read_input_file(self.input_file, cache_dir=self.cache_dir)
+        cache_file = get_cache_file_name(self.input_file, self.cache_dir)
+        self.assertTrue(os.path.exists(cache_file))
+        self.assertTrue(pl.read_parquet(cache_file).equals(df))
+        self.assertTrue(df.equals(read_input_file(self.input_file)))
+
+    def test_cache_file_reused(self):
+        """
+        Check that a second read uses the existing cache file.
+        """
+        cache_file = get_cached_input_file(self.input_file, self.cache_dir)
+        mtime = os.stat(cache_file).st_mtime_ns
+        self.assertEqual(
+            get_cached_input_file(self.input_file, self.cache_dir), cache_file
+        )
+        self.assertEqual(os.stat(cache_file).st_mtime_ns, mtime)
+
+    def test_cache_key_options(self):
+        """
+        Check that different read options use different cache files.
+        """
+        file1 = get_cache_file_name(self.input_file, self.cache_dir)
+        file2 = get_cache_file_name(
+            self.input_file, self.cache_dir, options={"infer_schema_length": 10}
+        )
+        self.assertNotEqual(file1, file2)
+
+    def test_cache_invalidated(self):
+        """
+        Check that a changed source replaces the old cache file.
+        """
+        old_file = get_cached_input_file(self.input_file, self.cache_dir)
+        df = read_input_file(self.input_file)
+        with gzip.open(self.input_file, "wt") as f:
+            f.write(pl.concat([df, df]).write_csv(separator="\t"))
+        os.utime(self.input_file, ns=(0, os.stat(old_file).st_mtime_ns + 10**9))
+
+        new_file = get_cached_input_file(self.input_file, self.cache_dir)
+        self.assertNotEqual(old_file, new_file)
+        self.assertFalse(os.path.exists(old_file))
+        self.assertEqual(pl.read_parquet(new_file).shape[0], 2)
+
+    def test_cache_invalidated_keeps_other_caches(self):
+        """
+        Check that a refreshed cache keeps the caches of other read options
+        and cache formats.
+        """
+        options = {"infer_schema_length": 10}
+        old_file = get_cached_input_file(self.input_file, self.cache_dir)
+        options_file = get_cached_input_file(
+            self.input_file, self.cache_dir, options=options
+        )
+        ipc_file = get_cached_input_file(
+            self.input_file, self.cache_dir, cache_file_type="ipc"
+        )
+        os.utime(self.input_file, ns=(0, os.stat(old_file).st_mtime_ns + 10**9))
+
+        new_file = get_cached_input_file(self.input_file, self.cache_dir)
+        self.assertFalse(os.path.exists(old_file))
+        self.assertTrue(os.path.exists(new_file))
+        self.assertTrue(os.path.exists(options_file))
+        self.assertTrue(os.path.exists(ipc_file))
+
+    def test_scan_with_cache(self):
+        """
+        Check that scanning with a cache directory returns the same data.
+        """
+        lf = scan_input_file(self.input_file, cache_dir=self.cache_dir)
+        self.assertIsInstance(lf, pl.LazyFrame)
+        self.assertTrue(lf.collect().equals(read_input_file(self.input_file)))
+
+    def test_ipc_cache(self):
+        """
+        Check that Parquet inputs are cached as memory-mappable Arrow IPC files.
+        """
+        test_data_file = (
+            Path(__file__).resolve().parent
+            / "data"
+            / "input"
+            / "nrt_cora_bo_test.parquet"
+        )
+        df = read_input_file(
+            str(test_data_file), cache_dir=self.cache_dir, cache_file_type="ipc"
+        )
+        cache_file = get_cache_file_name(
+            str(test_data_file), self.cache_dir, cache_file_type="ipc"
+        )
+        self.assertTrue(cache_file.endswith(".arrow"))
+        self.assertTrue(os.path.exists(cache_file))
+        self.assertTrue(df.equals(pl.read_parquet(test_data_file)))
+
+        lf = scan_input_file(
+            str(test_data_file), cache_dir=self.cache_dir, cache_file_type="ipc"
+        )
+        self.assertEqual(lf.select(pl.len()).collect().item(), 132342)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+    def test_invalid_cache_file_type(self):
+        """
+        Check that an unsupported cache file type raises a ValueError.
+        """
+        with self.assertRaises(ValueError):
+            get_cache_file_name(self.input_file, self.cache_dir, cache_file_type="csv")
+
+    def test_parquet_not_cached(self):
+        """
+        Check that Parquet files are read directly without a cache file.
+        """
+        test_data_file = (
+            Path(__file__).resolve().parent
+            / "data"
+            / "input"
+            / "nrt_cora_bo_test.parquet"
+        )
+        read_input_file(str(test_data_file), cache_dir=self.cache_dir)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+
+class TestProfileIndex(unittest.TestCase):
+    """
+    A suite of tests verifying profile-clustered Parquet files and the
+    profile index used to read profiles by row offset.
+    """
+
+    def setUp(self):
+        """
+        Sort the test data by profile and create a temporary directory.
+        """
+        self.test_data_file = (
+            Path(__file__).resolve().parent
+            / "data"
+            / "input"
+            / "nrt_cora_bo_test.parquet"
+        )
+        self.df = pl.read_parquet(self.test_data_file).sort(
+            ["platform_code", "profile_no", "observation_no"]
+        )
+        self.test_dir = tempfile.mkdtemp()
+        self.output_file = os.path.join(self.test_dir, "clustered.parquet")
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.test_dir)
+
+    def test_build_profile_index(self):
+        """
+        Check that offsets and counts cover every row once.
+        """
+        profile_index = build_profile_index(self.df)
+        self.assertEqual(profile_index.shape[0], 503)
+        self.assertEqual(profile_index["row_count"].sum(), self.df.shape[0])
+        self.assertEqual(profile_index["row_offset"][0], 0)
+        self.assertTrue(
+            (
+                profile_index["row_offset"].shift(-1)
+                == profile_index["row_offset"] + profile_index["row_count"]
+            )
+            .drop_nulls()
+            .all()
+        )
+
+    def test_build_profile_index_not_clustered(self):
+        """
+        Check that interleaved profiles raise a ValueError.
+        """
+        df = pl.DataFrame({"platform_code": ["A", "B", "A"], "profile_no": [1, 1, 1]})
+        with self.assertRaises(ValueError):
+            build_profile_index(df)
+
+    def test_row_groups_aligned(self):
+        """
+        Check that every row group ends on a profile boundary.
+        """
+        profile_index = build_profile_index(self.df)
+        write_profile_clustered_parquet(
+            self.df, profile_index, self.output_file, row_group_size=20000
+        )
+        metadata = pq.ParquetFile(self.output_file).metadata
+        self.assertGreater(metadata.num_row_groups, 1)
+
+        profile_ends = set(profile_index["row_offset"] + profile_index["row_count"])
+        end = 0
+        for i in range(metadata.num_row_groups):
+            end += metadata.row_group(i).num_rows
+            self.assertIn(end, profile_ends)
+        self.assertTrue(pl.read_parquet(self.output_file).equals(self.df))
+
+    def test_read_profile_rows(self):
+        """
+        Check that reading by offset returns the same rows as a join.
+        """
+        profile_index = build_profile_index(self.df)
+        write_profile_clustered_parquet(
+            self.df, profile_index, self.output_file, row_group_size=20000
+        )
+        profiles = profile_index.sample(10, seed=42)
+        df = read_profile_rows(self.output_file, profile_index, profiles)
+        expected = self.df.join(
+            profiles.select("platform_code", "profile_no"),
+            on=["platform_code", "profile_no"],
+            how="semi",
+        )
+        self.assertTrue(df.equals(expected))
+
+        df_empty = read_profile_rows(self.output_file, profile_index, profiles.head(0))
+        self.assertEqual(df_empty.shape, (0, 30))
+
+
+class TestBatchedInput(unittest.TestCase):
+    """
+    A suite of tests verifying that large text files can be read in batches
+    and staged into a Parquet file.
+    """
+
+    def setUp(self):
+        """
+        Write part of the test data to temporary CSV and TSV.GZ files.
+        """
+        self.test_dir = tempfile.mkdtemp()
+        self.df = pl.read_parquet(
+            Path(__file__).resolve().parent
+            / "data"
+            / "input"
+            / "nrt_cora_bo_test.parquet"
+        ).head(5000)
+        self.csv_file = os.path.join(self.test_dir, "input.csv")
+        self.df.write_csv(self.csv_file)
+        self.tsv_gz_file = os.path.join(self.test_dir, "input.tsv.gz")
+        with gzip.open(self.tsv_gz_file, "wt") as f:
+            f.write(self.df.write_csv(separator="\t"))
+        self.options = {"try_parse_dates": True}
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.test_dir)
+
+    def test_iter_batches(self):
+        """
+        Check batch sizes and that the batches add up to the full file.
+        """
+        for file_name in [self.csv_file, self.tsv_gz_file]:
+            with self.subTest(file_name=file_name):
+                batches = list(
+                    iter_input_file_batches(
+                        file_name, options=self.options, batch_size=1500
+                    )
+                )
+                self.assertEqual([x.shape[0] for x in batches], [1500, 1500, 1500, 500])
+                self.assertTrue(
+                    pl.concat(batches).equals(
+                        read_input_file(file_name, options=self.options)
+                    )
+                )
+
+    def test_iter_batches_widened_schema(self):
+        """
+        Check that a column with integers in the first batch and a decimal
+        value in a later batch is read as a float column in every batch.
+        """
+        df = pl.DataFrame({"profile_no": [1, 2, 3, 4], "value": ["1", "2", "3", "4.5"]})
+        file_name = os.path.join(self.test_dir, "widened.csv")
+        df.write_csv(file_name)
+
+        batches = list(iter_input_file_batches(file_name, batch_size=2))
+        self.assertEqual(len(batches), 2)
+        self.assertTrue(all(x.schema["value"] == pl.Float64 for x in batches))
+        self.assertEqual(pl.concat(batches)["value"].to_list(), [1.0, 2.0, 3.0, 4.5])
+
+        batches = list(
+            iter_input_file_batches(
+                file_name,
+                options={"schema_overrides": {"value": pl.String}},
+                batch_size=2,
+            )
+        )
+        self.assertEqual(batches[1]["value"].to_list(), ["3", "4.5"])
+
+    def test_iter_batches_parquet(self):
+        """
+        Check that a Parquet file is streamed in batches of rows.
+        """
+        parquet_file = os.path.join(self.test_dir, "input.parquet")
+        self.df.write_parquet(parquet_file)
+        batches = list(iter_input_file_batches(parquet_file, batch_size=1000))
+        self.assertEqual(len(batches), -(-self.df.shape[0] // 1000))
+        self.assertTrue(all(x.shape[0] <= 1000 for x in batches))
+        self.assertTrue(pl.concat(batches).equals(self.df))
+
+        batches = list(
+            iter_input_file_batches(
+                parquet_file, batch_size=1000, options={"columns": ["temp"]}
+            )
+        )
+        self.assertEqual(batches[0].columns, ["temp"])
+
+    def test_unsupported_option(self):
+        """
+        Check that skip_rows and n_rows are rejected for text files.
+        """
+        with self.assertRaises(ValueError):
+            list(iter_input_file_batches(self.csv_file, options={"n_rows": 10}))
+
+    def test_stage_input_file(self):
+        """
+        Check that the staged file holds the transformed rows of all batches.
+        """
+        staging_file = os.path.join(self.test_dir, "staging.parquet")
+        stage_input_file(
+            self.tsv_gz_file,
+            staging_file,
+            options=self.options,
+            batch_size=1000,
+            transform=lambda x: x.filter(pl.col("temp_qc") == 1).select(
+                ["platform_code", "profile_no", "temp"]
+            ),
+        )
+        self.assertEqual(pq.ParquetFile(staging_file).metadata.num_row_groups, 5)
+        expected = (
+            read_input_file(self.tsv_gz_file, options=self.options)
+            .filter(pl.col("temp_qc") == 1)
+            .select(["platform_code", "profile_no", "temp"])
+        )
+        self.assertTrue(pl.read_parquet(staging_file).equals(expected))
+
+
+class TestInputFingerprint(unittest.TestCase):
+    """
+    A suite of tests verifying that file fingerprints are stable and change
+    when the file changes.
+    """
+
+    def setUp(self):
+        """
+        Copy the Parquet test file into a temporary directory.
+        """
+        self.test_dir = tempfile.mkdtemp()
+        self.input_file = os.path.join(self.test_dir, "input.parquet")
+        shutil.copy(
+            Path(__file__).resolve().parent
+            / "data"
+            / "input"
+            / "nrt_cora_bo_test.parquet",
+            self.input_file,
+        )
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.test_dir)
+
+    def test_file_fingerprint(self):
+        """
+        Check the fields of a Parquet fingerprint with and without content hash.
+        """
+        fingerprint = get_file_fingerprint(self.input_file)
+        self.assertEqual(fingerprint["num_rows"], 132342)
+        self.assertIn("footer", fingerprint)
+        self.assertNotIn("content", fingerprint)
+        self.assertIn("content", get_file_fingerprint(self.input_file, True))
+
+    def test_text_file_fingerprint(self):
+        """
+        Check that text files have no Parquet footer entry.
+        """
+        fingerprint = get_file_fingerprint(
+            Path(__file__).resolve().parent
+            / "data"
+            / "input"
+            / "nrt_cora_bo_test_2023_row1.csv"
+        )
+        self.assertNotIn("footer", fingerprint)
+        self.assertGreater(fingerprint["size"], 0)
+
+    def test_input_fingerprint_changes(self):
+        """
+        Check that the fingerprint is stable and changes with the file.
+        """
+        fingerprint = get_input_fingerprint([self.input_file])
+        self.assertEqual(fingerprint, get_input_fingerprint([self.input_file]))
+
+        pl.read_parquet(self.input_file).head(100).write_parquet(self.input_file)
+        self.assertNotEqual(fingerprint, get_input_fingerprint([self.input_file]))
+
+    def test_file_not_found(self):
+        """
+        Check that a missing file raises FileNotFoundError.
+        """
+        with self.assertRaises(FileNotFoundError):
+            get_file_fingerprint(os.path.join(self.test_dir, "missing.parquet"))
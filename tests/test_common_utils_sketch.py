@@ -0,0 +1,107 @@
+"""
+Unit tests for the mergeable sketches in dmqclib.common.utils.sketch,
+verifying exact moments, approximate quantiles and merging of sketches.
+"""
+
+import unittest
+from pathlib import Path
+
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from dmqclib.common.utils.sketch import create_sketch, get_sketch_stats, merge_sketches
+
+
+class TestSketch(unittest.TestCase):
+    """
+    Tests for create_sketch, merge_sketches and get_sketch_stats.
+    """
+
+    def setUp(self):
+        """
+        Load the test data and compute the exact statistics.
+        """
+        self.test_data_file = (
+            Path(__file__).resolve().parent
+            / "data"
+            / "input"
+            / "nrt_cora_bo_test.parquet"
+        )
+        self.input_data = pl.read_parquet(self.test_data_file)
+        self.val_col_names = ["temp", "psal", "pres"]
+        self.expected = pl.concat(
+            [
+                self.input_data.select(
+                    pl.lit(x).alias("variable"),
+                    pl.col(x).min().cast(pl.Float64).alias("min"),
+                    pl.col(x).max().cast(pl.Float64).alias("max"),
+                    pl.col(x).mean().cast(pl.Float64).alias("mean"),
+                    pl.col(x).std().cast(pl.Float64).alias("sd"),
+                    pl.col(x).median().cast(pl.Float64).alias("median"),
+                    pl.col(x).quantile(0.975).cast(pl.Float64).alias("pct97.5"),
+                )
+                for x in self.val_col_names
+            ]
+        ).sort("variable")
+
+    def _get_stats(self, sketch):
+        """
+        Return the statistics of a sketch in the column order of the expected data.
+        """
+        return get_sketch_stats(sketch).select(self.expected.columns).sort("variable")
+
+    def test_create_sketch(self):
+        """
+        Check that the moments are exact and the quantiles are close.
+        """
+        sketch = create_sketch(self.input_data, self.val_col_names, sketch_size=500)
+        self.assertEqual(sketch.shape[0], 3)
+        self.assertTrue((sketch["centroids"].list.len() <= 500).all())
+        stats = self._get_stats(sketch)
+        assert_frame_equal(
+            stats.select(["variable", "min", "max", "mean", "sd"]),
+            self.expected.select(["variable", "min", "max", "mean", "sd"]),
+        )
+        for col_name in ["median", "pct97.5"]:
+            error = (stats[col_name] - self.expected[col_name]).abs() / (
+                self.expected["max"] - self.expected["min"]
+            )
+            self.assertTrue((error < 0.01).all())
+
+    def test_merge_sketches(self):
+        """
+        Check that merging sketches of two parts matches a sketch of the whole.
+        """
+        sketches = [
+            create_sketch(self.input_data.head(50000), self.val_col_names),
+            create_sketch(self.input_data.slice(50000), self.val_col_names),
+        ]
+        stats = self._get_stats(merge_sketches(sketches))
+        expected = self._get_stats(create_sketch(self.input_data, self.val_col_names))
+        assert_frame_equal(
+            stats.select(["variable", "min", "max", "mean", "sd"]),
+            expected.select(["variable", "min", "max", "mean", "sd"]),
+        )
+        for col_name in ["median", "pct97.5"]:
+            error = (stats[col_name] - expected[col_name]).abs() / (
+                expected["max"] - expected["min"]
+            )
+            self.assertTrue((error < 0.01).all())
+
+    def test_group_sketch(self):
+        """
+        Check that one sketch is built per profile with exact ranges.
+        """
+        group_col_names = ["platform_code", "profile_no"]
+        sketch = create_sketch(self.input_data, ["temp"], group_col_names)
+        stats = get_sketch_stats(sketch, group_col_names).sort(group_col_names)
+        expected = (
+            self.input_data.group_by(group_col_names)
+            .agg(
+                pl.col("temp").min().cast(pl.Float64).alias("min"),
+                pl.col("temp").max().cast(pl.Float64).alias("max"),
+            )
+            .sort(group_col_names)
+        )
+        self.assertEqual(stats.shape[0], 503)
+        assert_frame_equal(stats.select(expected.columns), expected)
@@ -0,0 +1,77 @@
+"""
+Unit tests for the sort utilities in dmqclib.common.utils.sort, verifying the
+sort order check and the sorted lookup of observations.
+"""
+
+import unittest
+from pathlib import Path
+
+import polars as pl
+
+from dmqclib.common.utils.sort import SORT_COL_NAMES, is_sorted_by, join_sorted
+
+
+class TestSortUtils(unittest.TestCase):
+    """
+    Tests for is_sorted_by and join_sorted.
+    """
+
+    def setUp(self):
+        """
+        Load the test data and sample observations to look up.
+        """
+        self.test_data_file = (
+            Path(__file__).resolve().parent
+            / "data"
+            / "input"
+            / "nrt_cora_bo_test.parquet"
+        )
+        self.input_data = pl.read_parquet(self.test_data_file).sort(SORT_COL_NAMES)
+        self.right = self.input_data.select(SORT_COL_NAMES + ["temp", "psal"])
+        self.left = (
+            self.input_data.sample(1000, seed=1)
+            .select(SORT_COL_NAMES)
+            .with_row_index("row_id")
+            .vstack(
+                pl.DataFrame(
+                    {
+                        "row_id": [1000, 1001],
+                        "platform_code": ["UNKNOWN", self.right["platform_code"][0]],
+                        "profile_no": [1, self.right["profile_no"][0]],
+                        "observation_no": [1, 100000],
+                    },
+                    schema={
+                        "row_id": pl.UInt32,
+                        "platform_code": self.right.schema["platform_code"],
+                        "profile_no": self.right.schema["profile_no"],
+                        "observation_no": self.right.schema["observation_no"],
+                    },
+                )
+            )
+        )
+
+    def test_is_sorted_by(self):
+        """
+        Check that the sort order is detected.
+        """
+        self.assertTrue(is_sorted_by(self.input_data))
+        self.assertFalse(is_sorted_by(self.input_data.reverse()))
+        self.assertTrue(is_sorted_by(self.input_data.head(0)))
+
+    def test_join_sorted(self):
+        """
+        Check that the sorted lookup equals an inner hash join.
+        """
+        expected = self.left.join(self.right, on=SORT_COL_NAMES, maintain_order="left")
+        result = join_sorted(self.left, self.right)
+        self.assertEqual(result.shape[0], 1000)
+        self.assertTrue(result.equals(expected))
+
+    def test_join_unsorted(self):
+        """
+        Check that unsorted data falls back to the hash join.
+        """
+        expected = self.left.join(self.right, on=SORT_COL_NAMES, maintain_order="left")
+        right = self.right.sample(fraction=1.0, shuffle=True, seed=1)
+        self.assertTrue(join_sorted(self.left, right).equals(expected))
+        self.assertTrue(join_sorted(self.left, right.head(0)).is_empty())
@@ -0,0 +1,153 @@
+"""
+Unit tests for the `run_data_sets` function, verifying that several data sets
+sharing one input file are read once and processed into separate outputs.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+from dmqclib.common.config.dataset_config import DataSetConfig
+from dmqclib.common.config.training_config import TrainingConfig
+from dmqclib.interface.runner import get_input_key, run_configs, run_data_sets
+from dmqclib.prepare.step1_read_input.dataset_a import InputDataSetA
+
+
+class TestRunDataSets(unittest.TestCase):
+    """
+    Tests for verifying that run_data_sets shares the input data between data
+    sets and writes the outputs of every data set.
+    """
+
+    def setUp(self):
+        """
+        Write a configuration file with two data sets that read the same input.
+        """
+        self.test_dir = tempfile.mkdtemp()
+        self.input_data_path = Path(__file__).resolve().parent / "data" / "input"
+        with open(
+            Path(__file__).resolve().parent
+            / "data"
+            / "config"
+            / "test_dataset_001.yaml",
+            encoding="utf-8",
+        ) as f:
+            config = yaml.safe_load(f)
+
+        config["path_info_sets"][0] = {
+            "name": "data_set_1",
+            "common": {"base_path": self.test_dir},
+            "input": {"base_path": str(self.input_data_path), "step_folder_name": ""},
+        }
+        data_set_2 = dict(config["data_sets"][0])
+        data_set_2["name"] = "NRT_BO_002"
+        data_set_2["dataset_folder_name"] = "nrt_bo_002"
+        data_set_2["target_set"] = "target_set_1_2"
+        config["data_sets"].append(data_set_2)
+
+        self.config_file = os.path.join(self.test_dir, "config.yaml")
+        with open(self.config_file, "w", encoding="utf-8") as f:
+            yaml.safe_dump(config, f)
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.test_dir)
+
+    def test_run_data_sets(self):
+        """
+        Check that the input is read once and both data sets are written.
+        """
+        with mock.patch.object(
+            InputDataSetA,
+            "read_input_data",
+            autospec=True,
+            side_effect=InputDataSetA.read_input_data,
+        ) as read_input_data:
+            run_data_sets(self.config_file, n_cpus=2)
+
+        self.assertEqual(read_input_data.call_count, 1)
+        for folder_name, target_names in [
+            ("nrt_bo_001", ["temp", "psal", "pres"]),
+            ("nrt_bo_002", ["temp", "psal"]),
+        ]:
+            dir_split = os.path.join(self.test_dir, folder_name, "split")
+            self.assertEqual(
+                sorted(os.listdir(dir_split)),
+                sorted(
+                    [f"train_set_{x}.parquet" for x in target_names]
+                    + [f"test_set_{x}.parquet" for x in target_names]
+                ),
+            )
+
+    def test_run_selected_data_set(self):
+        """
+        Check that only the selected data set is processed.
+        """
+        run_data_sets(self.config_file, set_names=["NRT_BO_002"], max_workers=1)
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, "nrt_bo_001")))
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "nrt_bo_002")))
+
+    def test_get_input_key(self):
+        """
+        Check that column pruning makes the key depend on the target set.
+        """
+        configs = []
+        for set_name in ["NRT_BO_001", "NRT_BO_002"]:
+            config = DataSetConfig(self.config_file)
+            config.select(set_name)
+            configs.append(config)
+        self.assertEqual(get_input_key(configs[0]), get_input_key(configs[1]))
+
+        for config in configs:
+            config.get_step_params("input")["lazy_scan"] = True
+        self.assertNotEqual(get_input_key(configs[0]), get_input_key(configs[1]))
+
+    def test_n_cpus_on_copies(self):
+        """
+        Check that the n_jobs share of n_cpus is not written to the
+        configurations passed in.
+        """
+        config = DataSetConfig(self.config_file)
+        config.select("NRT_BO_001")
+        config.data["step_param_set"]["steps"]["model"] = {
+            "model_params": {"n_jobs": 1}
+        }
+        with (
+            mock.patch("dmqclib.interface.runner._read_shared_input"),
+            mock.patch(
+                "dmqclib.interface.runner.create_training_dataset"
+            ) as create_training_dataset,
+        ):
+            run_configs([config], n_cpus=4)
+
+        used_config = create_training_dataset.call_args.args[0]
+        self.assertEqual(
+            used_config.data["step_param_set"]["steps"]["model"]["model_params"],
+            {"n_jobs": 4},
+        )
+        self.assertEqual(
+            config.data["step_param_set"]["steps"]["model"]["model_params"],
+            {"n_jobs": 1},
+        )
+
+    def test_unsupported_config(self):
+        """
+        Check that training configurations are rejected.
+        """
+        config = TrainingConfig(
+            str(
+                Path(__file__).resolve().parent
+                / "data"
+                / "config"
+                / "test_training_001.yaml"
+            )
+        )
+        with self.assertRaises(ValueError):
+            run_configs([config])
@@ -9,6 +9,7 @@ import unittest
 from pathlib import Path
 
 import polars as pl
+from polars.testing import assert_frame_equal
 
 from dmqclib.interface.stats import get_summary_stats, format_summary_stats
 
@@ -92,3 +93,35 @@ class TestSummaryStats(unittest.TestCase):
         stats_str_filtered_vars = format_summary_stats(ds, ["pres", "temp"])
         self.assertIsInstance(stats_str_filtered_vars, str)
         self.assertNotIn("psal", stats_str_filtered_vars)
+
+    def test_get_approximate_summary_stats(self):
+        """Verify that the approximate mode matches the exact statistics.
+
+        This test streams the file in small batches and checks that the
+        exact statistics agree and that the quantiles are close.
+        """
+        expected = get_summary_stats(self.test_data_file, "profiles")
+        ds = get_summary_stats(
+            self.test_data_file, "profiles", approximate=True, batch_size=20000
+        )
+        self.assertEqual(ds.shape, expected.shape)
+
+        expected = get_summary_stats(self.test_data_file, "all")
+        ds = get_summary_stats(
+            self.test_data_file, "all", approximate=True, batch_size=20000
+        )
+        assert_frame_equal(
+            ds.select(["variable", "min", "mean", "max"]),
+            expected.select(["variable", "min", "mean", "max"]),
+        )
+        error = (ds["pct97.5"] - expected["pct97.5"]).abs() / (
+            expected["max"] - expected["min"]
+        )
+        self.assertTrue((error < 0.1).all())
+
+    def test_invalid_rank_error(self):
+        """Verify that an invalid rank error is rejected."""
+        with self.assertRaises(ValueError):
+            get_summary_stats(
+                self.test_data_file, "all", approximate=True, rank_error=0
+            )
@@ -348,6 +348,49 @@ class TestProfileSummaryStatsFeature(_TestFeatureBase):
         self.assertEqual(ds.features.shape[0], 128)
         self.assertEqual(ds.features.shape[1], 16)
 
+    def test_profile_summary_stats_wide(self):
+        """
+        Verifies that joining the wide per-profile statistics gives the same
+        features as joining every statistic separately.
+        """
+        ds = ProfileSummaryStats(
+            "temp",
+            self.feature_info,
+            self.ds_select.selected_profiles,
+            self.ds_extract.filtered_input,
+            self.ds_locate.selected_rows,
+            self.ds_summary.summary_stats,
+        )
+        ds.summary_stats_wide = self.ds_extract.summary_stats_wide
+        ds.extract_features()
+
+        ds_single = ProfileSummaryStats(
+            "temp",
+            self.feature_info,
+            self.ds_select.selected_profiles,
+            self.ds_extract.filtered_input,
+            self.ds_locate.selected_rows,
+            self.ds_summary.summary_stats,
+        )
+        ds_single._filter_selected_rows_cols()
+        for variable_name in self.feature_info["col_names"]:
+            for metric_name in self.feature_info["summary_stats_names"]:
+                ds_single.features = ds_single.features.join(
+                    ds_single.summary_stats.filter(
+                        pl.col("variable") == variable_name
+                    ).select(
+                        pl.col("platform_code"),
+                        pl.col("profile_no"),
+                        pl.col(metric_name).alias(f"{variable_name}_{metric_name}"),
+                    ),
+                    on=["platform_code", "profile_no"],
+                    maintain_order="left",
+                )
+        ds_single.features = ds_single.features.drop(["platform_code", "profile_no"])
+
+        self.assertIsNotNone(ds.summary_stats_wide)
+        self.assertTrue(ds.features.equals(ds_single.features))
+
 
 class TestBasicValues3PlusFlanksFeature(_TestFeatureBase):
     """
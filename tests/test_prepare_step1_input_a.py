@@ -4,6 +4,9 @@ reading data from various file types, resolving input file paths,
 applying column renames, and filtering rows based on year criteria.
 """
 
+import os
+import shutil
+import tempfile
 import unittest
 from pathlib import Path
 
@@ -337,3 +340,628 @@ class TestInputDataSetAFilter(unittest.TestCase):
             self._get_uniq_years(df),
             [2022, 2023],
         )
+
+
+class TestInputDataSetALazyScan(unittest.TestCase):
+    """
+    Tests for verifying that the lazy_scan option reads the same rows as the
+    eager reader while keeping only the columns used by the configuration.
+    """
+
+    def setUp(self):
+        """
+        Load the test configuration for dataset_002 and enable lazy scanning.
+        """
+        self.config_file_path = (
+            Path(__file__).resolve().parent
+            / "data"
+            / "config"
+            / "test_dataset_002.yaml"
+        )
+        self.config = DataSetConfig(str(self.config_file_path))
+        self.config.select("NRT_BO_001")
+        self.config.get_step_params("input")["lazy_scan"] = True
+        self.test_data_file = (
+            Path(__file__).resolve().parent
+            / "data"
+            / "input"
+            / "nrt_cora_bo_test.parquet"
+        )
+
+    def _get_input_data(self, config):
+        """
+        Helper method that loads input data with the given configuration.
+        """
+        ds = InputDataSetA(config)
+        ds.input_file_name = str(self.test_data_file)
+        ds.read_input_data()
+        return ds.input_data
+
+    def test_get_used_col_names(self):
+        """
+        Check that keys, targets, flags and feature columns are collected once.
+        """
+        ds = InputDataSetA(self.config)
+        col_names = ds.get_used_col_names()
+        for x in ["platform_code", "observation_no", "temp", "temp_qc", "pres_qc"]:
+            self.assertIn(x, col_names)
+        self.assertEqual(len(col_names), len(set(col_names)))
+
+    def test_column_projection(self):
+        """
+        Ensure that columns not referenced by the configuration are dropped.
+        """
+        df = self._get_input_data(self.config)
+        self.assertIsInstance(df, pl.DataFrame)
+        self.assertEqual(df.shape[0], 132342)
+        self.assertIn("temp_qc", df.columns)
+        self.assertNotIn("filename_new", df.columns)
+        self.assertNotIn("dist2coast", df.columns)
+
+    def test_remove_years(self):
+        """
+        Check that remove_years gives the same rows as the eager reader.
+        """
+        self.config.get_step_params("input")["sub_steps"]["filter_rows"] = True
+        self.config.get_step_params("input")["filter_method_dict"]["remove_years"] = [
+            2022,
+            2023,
+        ]
+        self.config.get_step_params("input")["filter_method_dict"]["keep_years"] = []
+        df = self._get_input_data(self.config)
+
+        self.config.get_step_params("input")["lazy_scan"] = False
+        df_eager = self._get_input_data(self.config)
+
+        self.assertEqual(df.shape[0], df_eager.shape[0])
+        self.assertTrue(df.equals(df_eager.select(df.columns)))
+
+    def test_keep_years(self):
+        """
+        Check that keep_years retains only the specified years.
+        """
+        self.config.get_step_params("input")["sub_steps"]["filter_rows"] = True
+        self.config.get_step_params("input")["filter_method_dict"]["remove_years"] = []
+        self.config.get_step_params("input")["filter_method_dict"]["keep_years"] = [
+            2022,
+            2023,
+        ]
+        df = self._get_input_data(self.config)
+        self.assertEqual(
+            df.select(pl.col("profile_timestamp").dt.year().unique().sort())
+            .to_series()
+            .to_list(),
+            [2022, 2023],
+        )
+
+
+class TestInputDataSetAPartitioned(unittest.TestCase):
+    """
+    Tests for verifying that a Hive-partitioned input directory is read and
+    that partitions excluded by the year filter are skipped.
+    """
+
+    def setUp(self):
+        """
+        Write the test data into a temporary directory partitioned by year.
+        """
+        self.config_file_path = (
+            Path(__file__).resolve().parent
+            / "data"
+            / "config"
+            / "test_dataset_002.yaml"
+        )
+        self.config = DataSetConfig(str(self.config_file_path))
+        self.config.select("NRT_BO_001")
+        self.test_dir = tempfile.mkdtemp()
+        df = pl.read_parquet(
+            Path(__file__).resolve().parent
+            / "data"
+            / "input"
+            / "nrt_cora_bo_test.parquet"
+        )
+        for year in df["profile_timestamp"].dt.year().unique().to_list():
+            part_dir = os.path.join(self.test_dir, f"year={year}")
+            os.makedirs(part_dir)
+            df.filter(pl.col("profile_timestamp").dt.year() == year).write_parquet(
+                os.path.join(part_dir, "part-0.parquet")
+            )
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.test_dir)
+
+    def test_read_all_partitions(self):
+        """
+        Ensure that all partitions are read when no year filter is set.
+        """
+        ds = InputDataSetA(self.config)
+        ds.input_file_name = self.test_dir
+        self.assertEqual(len(ds.get_input_files()), 7)
+        ds.read_input_data()
+        self.assertEqual(ds.input_data.shape[0], 132342)
+        self.assertIn("year", ds.input_data.columns)
+
+    def test_prune_remove_years(self):
+        """
+        Check that partitions listed in remove_years are not read.
+        """
+        self.config.get_step_params("input")["filter_method_dict"]["remove_years"] = [
+            2022,
+            2023,
+        ]
+        ds = InputDataSetA(self.config)
+        ds.input_file_name = self.test_dir
+        self.assertEqual(len(ds.get_input_files()), 5)
+        ds.read_input_data()
+        self.assertEqual(
+            sorted(ds.input_data["year"].unique().to_list()),
+            [2017, 2018, 2019, 2020, 2021],
+        )
+
+    def test_prune_keep_years_lazy(self):
+        """
+        Check that only partitions listed in keep_years are scanned lazily.
+        """
+        self.config.get_step_params("input")["filter_method_dict"]["keep_years"] = [
+            2023
+        ]
+        self.config.get_step_params("input")["lazy_scan"] = True
+        ds = InputDataSetA(self.config)
+        ds.input_file_name = os.path.join(self.test_dir, "year=*", "*.parquet")
+        self.assertEqual(len(ds.get_input_files()), 1)
+        ds.read_input_data()
+        self.assertEqual(ds.input_data.shape[0], 19480)
+
+
+class TestInputDataSetACompactSchema(unittest.TestCase):
+    """
+    Tests for verifying that the compact_schema sub-step downcasts value, flag
+    and platform columns without changing the data.
+    """
+
+    def setUp(self):
+        """
+        Load the test configuration for dataset_002 and the test data file.
+        """
+        self.config_file_path = (
+            Path(__file__).resolve().parent
+            / "data"
+            / "config"
+            / "test_dataset_002.yaml"
+        )
+        self.config = DataSetConfig(str(self.config_file_path))
+        self.config.select("NRT_BO_001")
+        self.test_data_file = (
+            Path(__file__).resolve().parent
+            / "data"
+            / "input"
+            / "nrt_cora_bo_test.parquet"
+        )
+
+    def _get_input_data(self, compact_schema, lazy_scan=False):
+        """
+        Helper method that loads input data with the given sub-step options.
+        """
+        self.config.get_step_params("input")["sub_steps"]["compact_schema"] = (
+            compact_schema
+        )
+        self.config.get_step_params("input")["lazy_scan"] = lazy_scan
+        ds = InputDataSetA(self.config)
+        ds.input_file_name = str(self.test_data_file)
+        ds.read_input_data()
+        return ds.input_data
+
+    def test_compact_dtypes(self):
+        """
+        Check that values are Float32, flags Int8 and platform_code Categorical.
+        """
+        df = self._get_input_data(compact_schema=True)
+        self.assertEqual(df.schema["platform_code"], pl.Categorical)
+        for col_name in ["longitude", "latitude", "temp", "psal", "pres"]:
+            self.assertEqual(df.schema[col_name], pl.Float32)
+        for col_name in ["temp_qc", "psal_qc", "pres_qc"]:
+            self.assertEqual(df.schema[col_name], pl.Int8)
+
+    def test_compact_dtypes_lazy(self):
+        """
+        Check that the compact schema is also applied to lazily scanned data.
+        """
+        df = self._get_input_data(compact_schema=True, lazy_scan=True)
+        self.assertEqual(df.schema["platform_code"], pl.Categorical)
+        self.assertEqual(df.schema["temp"], pl.Float32)
+        self.assertEqual(df.schema["temp_qc"], pl.Int8)
+
+    def test_same_data(self):
+        """
+        Check that the compact data has the same rows and flag values.
+        """
+        df_full = self._get_input_data(compact_schema=False)
+        df_compact = self._get_input_data(compact_schema=True)
+        self.assertEqual(df_full.shape, df_compact.shape)
+        self.assertTrue(
+            df_full["temp_qc"].equals(df_compact["temp_qc"], check_dtypes=False)
+        )
+        self.assertEqual(
+            df_full["platform_code"].to_list(),
+            df_compact["platform_code"].cast(pl.String).to_list(),
+        )
+
+    def test_disabled_by_default(self):
+        """
+        Check that the original data types are kept without the sub-step.
+        """
+        df = self._get_input_data(compact_schema=False)
+        self.assertEqual(df.schema["platform_code"], pl.String)
+        self.assertEqual(df.schema["temp"], pl.Float64)
+
+
+class TestInputDataSetACache(unittest.TestCase):
+    """
+    Tests for verifying that InputDataSetA reads text inputs through the
+    Parquet cache when cache_dir is set.
+    """
+
+    def setUp(self):
+        """
+        Write part of the test data to a temporary CSV file.
+        """
+        self.config_file_path = (
+            Path(__file__).resolve().parent
+            / "data"
+            / "config"
+            / "test_dataset_002.yaml"
+        )
+        self.config = DataSetConfig(str(self.config_file_path))
+        self.config.select("NRT_BO_001")
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.test_dir, "cache")
+        self.test_data_file = os.path.join(self.test_dir, "input.csv")
+        df = pl.read_parquet(
+            Path(__file__).resolve().parent
+            / "data"
+            / "input"
+            / "nrt_cora_bo_test.parquet"
+        )
+        df.filter(pl.col("profile_timestamp").dt.year() == 2023).write_csv(
+            self.test_data_file
+        )
+        self.config.get_step_params("input")["read_file_options"] = {
+            "try_parse_dates": True
+        }
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.test_dir)
+
+    def _get_input_data(self):
+        """
+        Helper method that loads input data from the temporary CSV file.
+        """
+        ds = InputDataSetA(self.config)
+        ds.input_file_name = self.test_data_file
+        ds.read_input_data()
+        return ds.input_data
+
+    def test_read_with_cache(self):
+        """
+        Check that the cached read returns the same data and writes one file.
+        """
+        df_direct = self._get_input_data()
+        self.config.get_step_params("input")["cache_dir"] = self.cache_dir
+        df_cached = self._get_input_data()
+        self.assertTrue(df_direct.equals(df_cached))
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        self.assertTrue(df_direct.equals(self._get_input_data()))
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+
+class TestInputDataSetAClusterProfiles(unittest.TestCase):
+    """
+    Tests for verifying the cluster_profiles sub-step, the profile index and
+    the profile-clustered output files.
+    """
+
+    def setUp(self):
+        """
+        Load the test configuration for dataset_002 and enable clustering.
+        """
+        self.config_file_path = (
+            Path(__file__).resolve().parent
+            / "data"
+            / "config"
+            / "test_dataset_002.yaml"
+        )
+        self.config = DataSetConfig(str(self.config_file_path))
+        self.config.select("NRT_BO_001")
+        self.config.get_step_params("input")["sub_steps"]["cluster_profiles"] = True
+        self.test_data_file = (
+            Path(__file__).resolve().parent
+            / "data"
+            / "input"
+            / "nrt_cora_bo_test.parquet"
+        )
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.test_dir)
+
+    def _get_dataset(self):
+        """
+        Helper method that reads the input data and returns the dataset.
+        """
+        ds = InputDataSetA(self.config)
+        ds.input_file_name = str(self.test_data_file)
+        ds.read_input_data()
+        return ds
+
+    def test_output_file_names(self):
+        """
+        Check that the clustered data is written to the profile_index folder.
+        """
+        ds = InputDataSetA(self.config)
+        self.assertEqual(
+            "/path/to/data_1/nrt_bo_001/profile_index/profile_clustered_input.parquet",
+            str(ds.output_file_name),
+        )
+        self.assertEqual(
+            "/path/to/data_1/nrt_bo_001/profile_index/profile_index.parquet",
+            str(ds.index_file_name),
+        )
+
+    def test_profile_index(self):
+        """
+        Check that the input is sorted by profile and indexed.
+        """
+        ds = self._get_dataset()
+        self.assertEqual(ds.profile_index.shape[0], 503)
+        self.assertEqual(ds.profile_index["row_count"].sum(), ds.input_data.shape[0])
+        self.assertTrue(
+            ds.input_data.equals(
+                ds.input_data.sort(["platform_code", "profile_no", "observation_no"])
+            )
+        )
+
+    def test_get_profile_rows(self):
+        """
+        Check that slicing by offset returns the same rows as a join.
+        """
+        ds = self._get_dataset()
+        profiles = ds.profile_index.sample(5, seed=1)
+        expected = ds.input_data.join(
+            profiles.select("platform_code", "profile_no"),
+            on=["platform_code", "profile_no"],
+            how="semi",
+        )
+        self.assertTrue(ds.get_profile_rows(profiles).equals(expected))
+
+    def test_write_profile_clustered_data(self):
+        """
+        Check that the clustered data and the index are written.
+        """
+        ds = self._get_dataset()
+        ds.output_file_name = os.path.join(self.test_dir, "data.parquet")
+        ds.index_file_name = os.path.join(self.test_dir, "index.parquet")
+        ds.write_profile_clustered_data()
+        self.assertTrue(pl.read_parquet(ds.output_file_name).equals(ds.input_data))
+        self.assertTrue(pl.read_parquet(ds.index_file_name).equals(ds.profile_index))
+
+    def test_disabled_by_default(self):
+        """
+        Check that no index is built and writing fails without the sub-step.
+        """
+        self.config.get_step_params("input")["sub_steps"]["cluster_profiles"] = False
+        ds = self._get_dataset()
+        self.assertIsNone(ds.profile_index)
+        with self.assertRaises(ValueError):
+            ds.write_profile_clustered_data()
+
+
+class TestInputDataSetABatched(unittest.TestCase):
+    """
+    Tests for verifying that InputDataSetA reads large text inputs in batches
+    with the same result as a single read.
+    """
+
+    def setUp(self):
+        """
+        Write the test data to a temporary CSV file and enable year filtering.
+        """
+        self.config_file_path = (
+            Path(__file__).resolve().parent
+            / "data"
+            / "config"
+            / "test_dataset_002.yaml"
+        )
+        self.config = DataSetConfig(str(self.config_file_path))
+        self.config.select("NRT_BO_001")
+        self.test_dir = tempfile.mkdtemp()
+        self.test_data_file = os.path.join(self.test_dir, "input.csv")
+        pl.read_parquet(
+            Path(__file__).resolve().parent
+            / "data"
+            / "input"
+            / "nrt_cora_bo_test.parquet"
+        ).write_csv(self.test_data_file)
+        input_params = self.config.get_step_params("input")
+        input_params["read_file_options"] = {"try_parse_dates": True}
+        input_params["sub_steps"]["filter_rows"] = True
+        input_params["filter_method_dict"] = {"remove_years": [2022, 2023]}
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.test_dir)
+
+    def _get_input_data(self):
+        """
+        Helper method that loads input data from the temporary CSV file.
+        """
+        ds = InputDataSetA(self.config)
+        ds.input_file_name = self.test_data_file
+        ds.read_input_data()
+        return ds.input_data
+
+    def test_read_batched(self):
+        """
+        Check that batched reading returns the same renamed and filtered data.
+        """
+        df_full = self._get_input_data()
+        self.config.get_step_params("input")["batch_size"] = 20000
+        self.config.get_step_params("input")["staging_dir"] = self.test_dir
+        df_batched = self._get_input_data()
+        self.assertEqual(df_batched.shape[0], 132342 - 16470 - 19480)
+        self.assertTrue("filename_new" in df_batched.columns)
+        self.assertTrue(df_full.equals(df_batched))
+        self.assertEqual(os.listdir(self.test_dir), ["input.csv"])
+
+    def test_read_batched_select_columns(self):
+        """
+        Check that unused columns are dropped per batch with lazy_scan.
+        """
+        self.config.get_step_params("input")["batch_size"] = 20000
+        self.config.get_step_params("input")["lazy_scan"] = True
+        df = self._get_input_data()
+        self.assertEqual(df.shape[0], 132342 - 16470 - 19480)
+        self.assertFalse("filename_new" in df.columns)
+
+
+class TestInputDataSetACacheKey(unittest.TestCase):
+    """
+    Tests for verifying the input fingerprint and cache key of InputDataSetA.
+    """
+
+    def setUp(self):
+        """
+        Load the test configuration for dataset_002 and the test data file.
+        """
+        self.config_file_path = (
+            Path(__file__).resolve().parent
+            / "data"
+            / "config"
+            / "test_dataset_002.yaml"
+        )
+        self.config = DataSetConfig(str(self.config_file_path))
+        self.config.select("NRT_BO_001")
+        self.test_data_file = (
+            Path(__file__).resolve().parent
+            / "data"
+            / "input"
+            / "nrt_cora_bo_test.parquet"
+        )
+        self.ds = InputDataSetA(self.config)
+        self.ds.input_file_name = str(self.test_data_file)
+
+    def test_input_fingerprint(self):
+        """
+        Check that the fingerprint is stable and that content hashing changes it.
+        """
+        fingerprint = self.ds.get_input_fingerprint()
+        self.assertEqual(fingerprint, self.ds.get_input_fingerprint())
+        self.config.get_step_params("input")["content_hash"] = True
+        self.assertNotEqual(fingerprint, self.ds.get_input_fingerprint())
+        self.assertEqual(fingerprint, self.ds.get_input_fingerprint(content_hash=False))
+
+    def test_cache_key(self):
+        """
+        Check that the cache key follows changes of the selected config keys.
+        """
+        key = self.ds.get_cache_key()
+        input_key = self.ds.get_cache_key(["step_param_set"])
+        self.config.data["target_set"]["variables"][0]["pos_flag_values"] = [3, 4]
+        self.assertNotEqual(key, self.ds.get_cache_key())
+        self.assertEqual(input_key, self.ds.get_cache_key(["step_param_set"]))
+
+
+class TestInputDataSetASortOrder(unittest.TestCase):
+    """
+    Tests for verifying that InputDataSetA checks or enforces the sort order
+    of the input data.
+    """
+
+    def setUp(self):
+        """
+        Load the test configuration and build an unsorted copy of the data.
+        """
+        self.config_file_path = (
+            Path(__file__).resolve().parent
+            / "data"
+            / "config"
+            / "test_dataset_001.yaml"
+        )
+        self.config = DataSetConfig(str(self.config_file_path))
+        self.config.select("NRT_BO_001")
+        self.test_data_file = (
+            Path(__file__).resolve().parent
+            / "data"
+            / "input"
+            / "nrt_cora_bo_test.parquet"
+        )
+        self.ds = InputDataSetA(self.config)
+        self.ds.input_file_name = str(self.test_data_file)
+        self.ds.read_input_data()
+        self.sorted_data = self.ds.input_data
+        self.ds.input_data = self.sorted_data.reverse()
+
+    def test_disabled_by_default(self):
+        """
+        Check that the data is left unchanged without sort_order.
+        """
+        self.ds.verify_sort_order()
+        self.assertTrue(self.ds.input_data.equals(self.sorted_data.reverse()))
+
+    def test_check(self):
+        """
+        Check that unsorted data is rejected and sorted data is accepted.
+        """
+        self.config.get_step_params("input")["sort_order"] = "check"
+        with self.assertRaises(ValueError):
+            self.ds.verify_sort_order()
+
+        self.ds.input_data = self.sorted_data
+        self.ds.verify_sort_order()
+        self.assertTrue(self.ds.input_data.equals(self.sorted_data))
+        self.assertTrue(self.ds.input_data["platform_code"].flags["SORTED_ASC"])
+
+    def test_enforce(self):
+        """
+        Check that unsorted data is sorted.
+        """
+        self.config.get_step_params("input")["sort_order"] = "enforce"
+        self.ds.verify_sort_order()
+        self.assertTrue(self.ds.input_data.equals(self.sorted_data))
+
+    def test_read_input_data(self):
+        """
+        Check that read_input_data applies the sort order.
+        """
+        self.config.get_step_params("input")["sort_order"] = "check"
+        self.ds.read_input_data()
+        self.assertTrue(self.ds.input_data.equals(self.sorted_data))
+
+    def test_invalid_sort_order(self):
+        """
+        Check that an unknown sort_order is rejected.
+        """
+        self.config.get_step_params("input")["sort_order"] = "merge"
+        with self.assertRaises(ValueError):
+            self.ds.verify_sort_order()
+
+    def test_missing_sort_columns(self):
+        """
+        Check that data without any of the sort columns is rejected.
+        """
+        self.config.get_step_params("input")["sort_order"] = "check"
+        self.ds.input_data = self.ds.input_data.drop(
+            ["platform_code", "profile_no", "observation_no"]
+        )
+        with self.assertRaisesRegex(ValueError, "platform_code"):
+            self.ds.verify_sort_order()
@@ -6,6 +6,7 @@ import pytest
 from pathlib import Path
 
 import polars as pl
+from polars.testing import assert_frame_equal
 
 from dmqclib.common.config.dataset_config import DataSetConfig
 from dmqclib.common.loader.dataset_loader import load_step1_input_dataset
@@ -134,6 +135,202 @@ class TestSelectDataSetA:
         assert ds.summary_stats.shape[0] == 2520
         assert ds.summary_stats.shape[1] == 12
 
+    @pytest.mark.parametrize("idx", range(2))
+    def test_summary_stats_fused(self, idx):
+        """Check that the fused mode produces the same statistics as the default mode."""
+        ds = SummaryDataSetA(
+            self.configs[idx], input_data=self.input_ds[idx].input_data
+        )
+        ds.calculate_stats()
+        expected = ds.summary_stats
+
+        self.configs[idx].get_step_params("summary")["fused"] = True
+        ds.calculate_stats()
+        assert ds.summary_stats.shape[0] == 2520
+        assert ds.summary_stats.shape[1] == 12
+        sort_col_names = ["variable", "platform_code", "profile_no"]
+        assert_frame_equal(
+            ds.summary_stats.sort(sort_col_names), expected.sort(sort_col_names)
+        )
+
+    @pytest.mark.parametrize("idx", range(2))
+    @pytest.mark.parametrize("fused", [False, True])
+    def test_summary_stats_required(self, idx, fused):
+        """Check that the required mode only computes the per-profile statistics used by the features."""
+        ds = SummaryDataSetA(
+            self.configs[idx], input_data=self.input_ds[idx].input_data
+        )
+        ds.calculate_stats()
+        expected = ds.summary_stats
+
+        summary_params = self.configs[idx].get_step_params("summary")
+        summary_params["stats_mode"] = "required"
+        summary_params["fused"] = fused
+        ds = SummaryDataSetA(
+            self.configs[idx], input_data=self.input_ds[idx].input_data
+        )
+        assert ds.required_stats == {
+            x: ["mean", "median", "sd", "pct25", "pct75"]
+            for x in ["temp", "psal", "pres"]
+        }
+        ds.calculate_stats()
+        assert ds.summary_stats.shape[0] == 1509
+        assert ds.summary_stats.shape[1] == 12
+        assert ds.summary_stats.get_column("min").null_count() == 1509
+
+        col_names = ds.profile_col_names + ["variable", "mean", "median", "sd"]
+        sort_col_names = ["variable", "platform_code", "profile_no"]
+        assert_frame_equal(
+            ds.summary_stats.select(col_names).sort(sort_col_names),
+            expected.filter(
+                pl.col("variable").is_in(["temp", "psal", "pres"])
+                & (pl.col("platform_code") != "all")
+            )
+            .select(col_names)
+            .sort(sort_col_names),
+        )
+
+    @pytest.mark.parametrize("idx", range(2))
+    def test_profile_stats_not_required(self, idx):
+        """Check that per-profile statistics of a column that is not required are empty."""
+        self.configs[idx].get_step_params("summary")["stats_mode"] = "required"
+        ds = SummaryDataSetA(
+            self.configs[idx], input_data=self.input_ds[idx].input_data
+        )
+        grouped_df = ds.input_data.group_by(ds.profile_col_names)
+        assert ds.calculate_profile_stats(grouped_df, "longitude").is_empty()
+        assert ds.calculate_profile_stats(grouped_df, "temp").shape[0] == 503
+
+    @pytest.mark.parametrize("idx", range(2))
+    def test_invalid_stats_mode(self, idx):
+        """Ensure `ValueError` is raised for an unknown `stats_mode`."""
+        self.configs[idx].get_step_params("summary")["stats_mode"] = "partial"
+        with pytest.raises(ValueError):
+            SummaryDataSetA(self.configs[idx], input_data=self.input_ds[idx].input_data)
+
+    @pytest.mark.parametrize("idx", range(2))
+    def test_summary_stats_cached(self, idx, tmp_path):
+        """Check that cached statistics are reused until the key changes or a recompute is forced."""
+        summary_params = self.configs[idx].get_step_params("summary")
+        summary_params["cache_dir"] = str(tmp_path)
+        ds = SummaryDataSetA(
+            self.configs[idx], input_data=self.input_ds[idx].input_data
+        )
+        ds.calculate_stats_cached(self.input_ds[idx])
+        expected = ds.summary_stats
+        cache_files = ds.list_cache_files()
+        assert len(cache_files) == 1
+
+        ds.input_data = ds.input_data.head(0)
+        ds.calculate_stats_cached(self.input_ds[idx])
+        assert_frame_equal(ds.summary_stats, expected)
+
+        summary_params["force_recompute"] = True
+        ds.calculate_stats_cached(self.input_ds[idx])
+        assert ds.summary_stats.filter(pl.col("platform_code") != "all").is_empty()
+        assert ds.list_cache_files() == cache_files
+
+        summary_params["force_recompute"] = False
+        summary_params["fused"] = True
+        ds.input_data = self.input_ds[idx].input_data
+        ds.calculate_stats_cached(self.input_ds[idx])
+        assert ds.summary_stats.shape[0] == 2520
+        assert len(ds.list_cache_files()) == 1
+        assert ds.list_cache_files() != cache_files
+
+        ds.clear_cache()
+        assert ds.list_cache_files() == []
+
+    @pytest.mark.parametrize("idx", range(2))
+    def test_summary_stats_incremental(self, idx, tmp_path):
+        """Check that the incremental mode adds the rows of new profiles to a previous run."""
+        input_data = self.input_ds[idx].input_data
+        ds = SummaryDataSetA(self.configs[idx], input_data=input_data)
+        ds.calculate_stats()
+        expected = ds.summary_stats
+
+        self.configs[idx].get_step_params("summary")["incremental"] = True
+        for df in [input_data.filter(pl.col("profile_no") < 100), input_data]:
+            ds = SummaryDataSetA(self.configs[idx], input_data=df)
+            ds.output_file_name = str(tmp_path / "summary_stats.tsv")
+            ds.sketch_file_name = str(tmp_path / "summary_sketch.parquet")
+            ds.calculate_stats()
+            ds.write_summary_stats()
+        assert os.path.exists(ds.sketch_file_name)
+        assert ds.summary_stats.shape[0] == 2520
+        assert ds.summary_stats.shape[1] == 12
+
+        sort_col_names = ["variable", "platform_code", "profile_no"]
+        assert_frame_equal(
+            ds.summary_stats.filter(pl.col("platform_code") != "all").sort(
+                sort_col_names
+            ),
+            expected.filter(pl.col("platform_code") != "all").sort(sort_col_names),
+        )
+        exact_col_names = ["variable", "min", "max", "mean", "sd"]
+        assert_frame_equal(
+            ds.summary_stats.filter(pl.col("platform_code") == "all").select(
+                exact_col_names
+            ),
+            expected.filter(pl.col("platform_code") == "all").select(exact_col_names),
+        )
+
+    @pytest.mark.parametrize("idx", range(2))
+    def test_summary_stats_incremental_required(self, idx, tmp_path):
+        """Check that the incremental mode only adds the required per-profile statistics."""
+        input_data = self.input_ds[idx].input_data
+        summary_params = self.configs[idx].get_step_params("summary")
+        summary_params["stats_mode"] = "required"
+        ds = SummaryDataSetA(self.configs[idx], input_data=input_data)
+        ds.calculate_stats()
+        expected = ds.summary_stats
+
+        summary_params["incremental"] = True
+        for df in [input_data.filter(pl.col("profile_no") < 100), input_data]:
+            ds = SummaryDataSetA(self.configs[idx], input_data=df)
+            ds.output_file_name = str(tmp_path / "summary_stats.tsv")
+            ds.sketch_file_name = str(tmp_path / "summary_sketch.parquet")
+            ds.calculate_stats()
+            ds.write_summary_stats()
+        assert ds.summary_stats.shape[0] == 1509
+        assert ds.summary_stats.filter(pl.col("platform_code") == "all").is_empty()
+
+        sort_col_names = ["variable", "platform_code", "profile_no"]
+        assert_frame_equal(
+            ds.summary_stats.sort(sort_col_names),
+            expected.sort(sort_col_names),
+        )
+
+    @pytest.mark.parametrize("idx", range(2))
+    def test_summary_stats_from_batches(self, idx):
+        """Check that statistics estimated from batches have the expected dimensions and exact ranges."""
+        input_data = self.input_ds[idx].input_data
+        ds = SummaryDataSetA(self.configs[idx], input_data=input_data)
+        ds.calculate_stats()
+        expected = ds.summary_stats
+
+        ds.calculate_stats_from_batches(input_data.iter_slices(20000))
+        assert ds.summary_stats.shape[0] == 2520
+        assert ds.summary_stats.shape[1] == 12
+        sort_col_names = ["variable", "platform_code", "profile_no"]
+        exact_col_names = sort_col_names + ["min", "max", "mean"]
+        assert_frame_equal(
+            ds.summary_stats.sort(sort_col_names).select(exact_col_names),
+            expected.sort(sort_col_names).select(exact_col_names),
+        )
+
+        with pytest.raises(ValueError):
+            ds.calculate_stats_from_batches([])
+
+        ds.calculate_stats_from_batches(
+            input_data.sample(fraction=1.0, shuffle=True, seed=1).iter_slices(20000)
+        )
+        assert ds.summary_stats.shape[0] == 2520
+        assert_frame_equal(
+            ds.summary_stats.sort(sort_col_names).select(exact_col_names),
+            expected.sort(sort_col_names).select(exact_col_names),
+        )
+
     @pytest.mark.parametrize("idx", range(2))
     def test_write_summary_stats(self, idx):
         """Confirm that `summary_stats` are successfully written to a file and the file's existence is verified."""
@@ -193,6 +390,27 @@ class TestSelectDataSetA:
         assert ds.summary_stats_profile.shape[0] == 27
         assert ds.summary_stats_profile.shape[1] == 6
 
+    @pytest.mark.parametrize("idx", range(2))
+    def test_summary_stats_wide(self, idx):
+        """Check that `create_summary_stats_wide` reshapes the per-profile statistics to one row per profile."""
+        ds = SummaryDataSetA(
+            self.configs[idx], input_data=self.input_ds[idx].input_data
+        )
+        ds.calculate_stats()
+        ds.create_summary_stats_wide()
+        assert ds.summary_stats_wide.shape[0] == 503
+        assert ds.summary_stats_wide.shape[1] == 47
+        assert "temp_mean" in ds.summary_stats_wide.columns
+
+    @pytest.mark.parametrize("idx", range(2))
+    def test_summary_stats_wide_without_stats_ds(self, idx):
+        """Ensure `ValueError` is raised if `create_summary_stats_wide` is called when `summary_stats` is empty."""
+        ds = SummaryDataSetA(
+            self.configs[idx], input_data=self.input_ds[idx].input_data
+        )
+        with pytest.raises(ValueError):
+            ds.create_summary_stats_wide()
+
     @pytest.mark.parametrize("idx", range(2))
     def test_summary_stats_profile_without_stats_ds(self, idx):
         """Ensure `ValueError` is raised if `create_summary_stats_profile` is called when `summary_stats` is empty."""
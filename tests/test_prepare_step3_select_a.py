@@ -95,6 +95,29 @@ class TestSelectDataSetA(unittest.TestCase):
         self.assertEqual(ds.neg_profile_df.shape[0], 478)
         self.assertEqual(ds.neg_profile_df.shape[1], 7)
 
+    def test_profile_catalog(self):
+        """Check that the profile catalog has one row per profile with the flag counts of every target."""
+        ds = SelectDataSetA(self.config, input_data=self.ds.input_data)
+        ds.create_profile_catalog()
+        self.assertEqual(ds.profile_catalog.shape[0], 503)
+        self.assertEqual(ds.profile_catalog.shape[1], 6 + 4 * 3)
+        self.assertEqual(ds.profile_catalog["n_rows"].sum(), 132342)
+
+    def test_profile_input(self):
+        """Check that the profile input keeps the rows of the selected profiles only."""
+        ds = SelectDataSetA(self.config, input_data=self.ds.input_data)
+        with self.assertRaises(ValueError):
+            ds.create_profile_input()
+
+        ds.label_profiles()
+        ds.create_profile_input()
+        n_rows = ds.profile_catalog.join(
+            ds.selected_profiles.select(["platform_code", "profile_no"]).unique(),
+            on=["platform_code", "profile_no"],
+        )["n_rows"].sum()
+        self.assertEqual(ds.profile_input.shape, (n_rows, 30))
+        self.assertLess(n_rows, 132342)
+
     def test_find_profile_pairs(self):
         """Validate the creation of matching positive and negative profile pairs."""
         ds = SelectDataSetA(self.config, input_data=self.ds.input_data)
@@ -183,6 +206,25 @@ class TestSelectDataSetANegX5(unittest.TestCase):
         self.assertEqual(ds.neg_profile_df.shape[0], 125)  # 25 positive * 5 ratio
         self.assertEqual(ds.neg_profile_df.shape[1], 8)
 
+    def test_find_closest_neg_ids(self):
+        """Check that the closest negative profiles match a ranking of all profile pairs."""
+        ds = SelectDataSetA(self.config, input_data=self.ds.input_data)
+        ds.select_positive_profiles()
+        ds.select_negative_profiles()
+        expected = (
+            ds.pos_profile_df.select(pl.col("pos_day_of_year").unique())
+            .join(ds.neg_profile_df, how="cross")
+            .with_columns(
+                (pl.col("pos_day_of_year") - pl.col("neg_day_of_year"))
+                .abs()
+                .alias("day_diff")
+            )
+            .sort(["pos_day_of_year", "day_diff", "profile_id"])
+            .group_by("pos_day_of_year", maintain_order=True)
+            .agg(pl.col("profile_id").head(5))
+        )
+        self.assertTrue(ds.find_closest_neg_ids(5).equals(expected))
+
     def test_label_profiles(self):
         """Check that profiles are labeled correctly and combined, reflecting the 1:5 ratio."""
         ds = SelectDataSetA(self.config, input_data=self.ds.input_data)
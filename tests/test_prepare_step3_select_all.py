@@ -102,3 +102,78 @@ class TestSelectDataSetAll(unittest.TestCase):
 
         with self.assertRaises(ValueError):
             ds.write_selected_profiles()
+
+    def test_sampled_negative_profiles(self):
+        """Check that sampling keeps all positive profiles and contiguous profile IDs."""
+        self.config.data["step_param_set"]["steps"]["select"] = {"max_neg_pos_ratio": 4}
+        ds = SelectDataSetAll(self.config, input_data=self.ds.input_data)
+        ds.label_profiles()
+        self.assertEqual(ds.pos_profile_df.shape[0], 25)
+        self.assertEqual(ds.neg_profile_df.shape[0], 100)
+        self.assertEqual(
+            ds.selected_profiles["profile_id"].to_list(), list(range(1, 126))
+        )
+
+    def test_max_negatives(self):
+        """Check that the smaller of the total and per-positive limits is used."""
+        self.config.data["step_param_set"]["steps"]["select"] = {
+            "max_neg_pos_ratio": 4,
+            "max_negatives": 60,
+        }
+        ds = SelectDataSetAll(self.config, input_data=self.ds.input_data)
+        ds.label_profiles()
+        self.assertEqual(ds.neg_profile_df.shape[0], 60)
+
+        self.config.data["step_param_set"]["steps"]["select"] = {"max_negatives": 1000}
+        ds = SelectDataSetAll(self.config, input_data=self.ds.input_data)
+        ds.label_profiles()
+        self.assertEqual(ds.neg_profile_df.shape[0], 478)
+
+    def test_seeded_sample(self):
+        """Check that the sample is reproducible and changes with the seed."""
+        self.config.data["step_param_set"]["steps"]["select"] = {
+            "max_negatives": 50,
+            "seed": 1,
+        }
+        samples = []
+        for _ in range(2):
+            ds = SelectDataSetAll(self.config, input_data=self.ds.input_data)
+            ds.label_profiles()
+            samples.append(ds.neg_profile_df)
+        self.assertTrue(samples[0].equals(samples[1]))
+
+        self.config.data["step_param_set"]["steps"]["select"]["seed"] = 2
+        ds = SelectDataSetAll(self.config, input_data=self.ds.input_data)
+        ds.label_profiles()
+        self.assertFalse(samples[0].equals(ds.neg_profile_df))
+
+    def test_stratified_sample(self):
+        """Check that each stratum keeps a share proportional to its size."""
+        ds_all = SelectDataSetAll(self.config, input_data=self.ds.input_data)
+        ds_all.label_profiles()
+
+        self.config.data["step_param_set"]["steps"]["select"] = {
+            "max_negatives": 100,
+            "stratify_by": "month",
+        }
+        ds = SelectDataSetAll(self.config, input_data=self.ds.input_data)
+        ds.label_profiles()
+        self.assertEqual(ds.neg_profile_df.shape[0], 100)
+
+        month = pl.col("profile_timestamp").dt.month().alias("month")
+        counts = (
+            ds_all.neg_profile_df.group_by(month)
+            .len("n_all")
+            .join(ds.neg_profile_df.group_by(month).len("n_sample"), on="month")
+        )
+        self.assertEqual(counts.shape[0], 12)
+        for n_all, n_sample in counts.select(["n_all", "n_sample"]).rows():
+            self.assertLessEqual(abs(n_sample - 100 * n_all / 478), 1)
+
+    def test_invalid_stratify_by(self):
+        """Check that an unknown stratum raises a ValueError."""
+        self.config.data["step_param_set"]["steps"]["select"] = {
+            "stratify_by": ["year", "season"]
+        }
+        with self.assertRaises(ValueError):
+            SelectDataSetAll(self.config, input_data=self.ds.input_data)
@@ -0,0 +1,124 @@
+"""
+This module contains unit tests for the SelectDataSetNearest class,
+which pairs positive and negative profiles by day of year and location.
+"""
+
+import unittest
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+
+from dmqclib.common.config.dataset_config import DataSetConfig
+from dmqclib.common.loader.dataset_loader import (
+    load_step1_input_dataset,
+    load_step3_select_dataset,
+)
+from dmqclib.prepare.step3_select_profiles.dataset_nearest import (
+    EARTH_RADIUS_KM,
+    SelectDataSetNearest,
+    embed_profiles,
+)
+
+
+class TestSelectDataSetNearest(unittest.TestCase):
+    """
+    A suite of tests ensuring the SelectDataSetNearest class pairs profiles
+    by the combined distance in day of year and position.
+    """
+
+    def setUp(self):
+        """Set up test environment and load input dataset."""
+        self.config_file_path = str(
+            Path(__file__).resolve().parent
+            / "data"
+            / "config"
+            / "test_dataset_003.yaml"
+        )
+        self.config = DataSetConfig(str(self.config_file_path))
+        self.config.select("NRT_BO_001")
+        self.config.data["step_class_set"]["steps"]["select"] = "SelectDataSetNearest"
+        self.test_data_file = (
+            Path(__file__).resolve().parent
+            / "data"
+            / "input"
+            / "nrt_cora_bo_test.parquet"
+        )
+        self.ds = load_step1_input_dataset(self.config)
+        self.ds.input_file_name = str(self.test_data_file)
+        self.ds.read_input_data()
+
+    def test_load_select_dataset(self):
+        """Ensure the class is registered and loaded from the configuration."""
+        ds = load_step3_select_dataset(self.config, input_data=self.ds.input_data)
+        self.assertIsInstance(ds, SelectDataSetNearest)
+
+    def test_find_profile_pairs(self):
+        """Validate the creation of matching profile pairs with a 1:5 positive:negative ratio."""
+        ds = SelectDataSetNearest(self.config, input_data=self.ds.input_data)
+        ds.select_positive_profiles()
+        ds.select_negative_profiles()
+        ds.find_profile_pairs()
+        self.assertEqual(ds.pos_profile_df.shape[0], 25)
+        self.assertEqual(ds.pos_profile_df.shape[1], 8)
+        self.assertEqual(ds.neg_profile_df.shape[0], 125)
+        self.assertEqual(ds.neg_profile_df.shape[1], 8)
+
+    def test_label_profiles(self):
+        """Check that profiles are labeled correctly and combined into a single DataFrame."""
+        ds = SelectDataSetNearest(self.config, input_data=self.ds.input_data)
+        ds.label_profiles()
+        self.assertEqual(ds.selected_profiles.shape[0], 150)
+        self.assertEqual(ds.selected_profiles.shape[1], 8)
+
+    def test_match_negative_profiles(self):
+        """Check that the matched profiles are the nearest by a brute-force search."""
+        ds = SelectDataSetNearest(self.config, input_data=self.ds.input_data)
+        ds.select_positive_profiles()
+        ds.select_negative_profiles()
+        pairs = ds.match_negative_profiles(5)
+
+        pos_points = embed_profiles(ds.pos_profile_df, "pos_day_of_year", 10.0)
+        neg_points = embed_profiles(ds.neg_profile_df, "neg_day_of_year", 10.0)
+        distance = np.linalg.norm(
+            pos_points[:, None, :] - neg_points[None, :, :], axis=2
+        )
+        neg_ids = ds.neg_profile_df.get_column("profile_id").to_numpy()
+        expected = np.sort(neg_ids[np.argsort(distance, axis=1)[:, :5]], axis=1)
+
+        actual = (
+            pairs.group_by("pos_profile_id")
+            .agg(pl.col("profile_id").sort())
+            .sort("pos_profile_id")
+            .get_column("profile_id")
+            .to_list()
+        )
+        self.assertEqual(actual, expected.tolist())
+
+    def test_match_without_negative_profiles(self):
+        """Check that no pairs are returned without negative profiles."""
+        ds = SelectDataSetNearest(self.config, input_data=self.ds.input_data)
+        ds.select_positive_profiles()
+        ds.select_negative_profiles()
+        ds.neg_profile_df = ds.neg_profile_df.head(0)
+        pairs = ds.match_negative_profiles(5)
+        self.assertEqual(pairs.shape, (0, 2))
+
+    def test_embed_profiles(self):
+        """Verify that embedded distances follow the position and circular day of year."""
+        df = pl.DataFrame(
+            {
+                "longitude": [0.0, 1.0, 0.0, 0.0],
+                "latitude": [0.0, 0.0, 0.0, 0.0],
+                "day": [1, 1, 2, 366],
+            }
+        )
+        points = embed_profiles(df, "day", 10.0)
+        self.assertEqual(points.shape, (4, 5))
+        self.assertAlmostEqual(
+            np.linalg.norm(points[1] - points[0]),
+            EARTH_RADIUS_KM * np.radians(1.0),
+            delta=0.01,
+        )
+        self.assertAlmostEqual(np.linalg.norm(points[2] - points[0]), 10.0, delta=0.01)
+        self.assertAlmostEqual(np.linalg.norm(points[3] - points[0]), 2.5, delta=0.01)
@@ -411,6 +411,217 @@ class TestLocateDataSetANegX5(unittest.TestCase):
         self.assertEqual(ds.selected_rows["pres"].shape[0], 783)
         self.assertEqual(ds.selected_rows["pres"].shape[1], 9)
 
+    def test_profile_catalog(self):
+        """
+        Confirms that skipping profiles with the profile catalog selects the
+        same rows.
+        """
+        ds = LocateDataSetA(
+            self.config,
+            input_data=self.ds_input.input_data,
+            selected_profiles=self.ds_select.selected_profiles,
+        )
+        ds.process_targets()
+
+        ds_catalog = LocateDataSetA(
+            self.config,
+            input_data=self.ds_input.input_data,
+            selected_profiles=self.ds_select.selected_profiles,
+        )
+        ds_catalog.profile_catalog = self.ds_select.profile_catalog
+        ds_catalog.process_targets()
+
+        for target_name in ["temp", "psal", "pres"]:
+            sort_col_names = ["pair_id", "label", "profile_id", "observation_no"]
+            self.assertTrue(
+                ds_catalog.selected_rows[target_name]
+                .drop("row_id")
+                .sort(sort_col_names)
+                .equals(
+                    ds.selected_rows[target_name].drop("row_id").sort(sort_col_names)
+                )
+            )
+
+    def test_sorted_input(self):
+        """
+        Confirms that input data with a verified sort order selects the same
+        rows.
+        """
+        ds = LocateDataSetA(
+            self.config,
+            input_data=self.ds_input.input_data,
+            selected_profiles=self.ds_select.selected_profiles,
+        )
+        ds.process_targets()
+
+        self.config.get_step_params("input")["sort_order"] = "check"
+        ds_sorted = LocateDataSetA(
+            self.config,
+            input_data=self.ds_input.input_data,
+            selected_profiles=self.ds_select.selected_profiles,
+        )
+        ds_sorted.process_targets()
+
+        for target_name in ["temp", "psal", "pres"]:
+            sort_col_names = ["pair_id", "label", "profile_id", "observation_no"]
+            self.assertTrue(
+                ds_sorted.selected_rows[target_name]
+                .drop("row_id")
+                .sort(sort_col_names)
+                .equals(
+                    ds.selected_rows[target_name].drop("row_id").sort(sort_col_names)
+                )
+            )
+
+    def test_profile_input(self):
+        """
+        Confirms that locating rows in the input restricted to the selected
+        profiles selects the same rows, with and without fused queries.
+        """
+        ds = LocateDataSetA(
+            self.config,
+            input_data=self.ds_input.input_data,
+            selected_profiles=self.ds_select.selected_profiles,
+        )
+        ds.process_targets()
+
+        self.ds_select.create_profile_input()
+        for fused in [False, True]:
+            self.config.get_step_params("locate")["fused"] = fused
+            ds_profile = LocateDataSetA(
+                self.config,
+                input_data=self.ds_input.input_data,
+                selected_profiles=self.ds_select.selected_profiles,
+            )
+            ds_profile.profile_input = self.ds_select.profile_input
+            self.assertIs(ds_profile.get_profile_input(), ds_profile.profile_input)
+            ds_profile.process_targets()
+
+            for target_name in ["temp", "psal", "pres"]:
+                sort_col_names = ["pair_id", "label", "profile_id", "observation_no"]
+                self.assertTrue(
+                    ds_profile.selected_rows[target_name]
+                    .drop("row_id")
+                    .sort(sort_col_names)
+                    .equals(
+                        ds.selected_rows[target_name]
+                        .drop("row_id")
+                        .sort(sort_col_names)
+                    )
+                )
+
+    def test_pair_ids(self):
+        """
+        Confirms that pair_id is a dense integer key shared by each positive
+        row and its negative rows, and that it can be decoded.
+        """
+        ds = LocateDataSetA(
+            self.config,
+            input_data=self.ds_input.input_data,
+            selected_profiles=self.ds_select.selected_profiles,
+        )
+        ds.process_targets()
+
+        selected_rows = ds.selected_rows["temp"]
+        self.assertEqual(selected_rows.schema["pair_id"], pl.UInt32)
+        self.assertEqual(
+            selected_rows.filter(pl.col("label") == 1)["pair_id"].sort().to_list(),
+            list(range(1, 65)),
+        )
+        self.assertEqual(
+            selected_rows.filter(pl.col("label") == 0)["pair_id"].n_unique(), 64
+        )
+
+        pair_keys = ds.decode_pair_ids("temp")
+        self.assertEqual(pair_keys.shape, (64, 5))
+        self.assertEqual(pair_keys["pair_id"].to_list(), list(range(1, 65)))
+        self.assertEqual(
+            pair_keys["pair_key"][0],
+            "|".join(str(x) for x in pair_keys.row(0)[1:4]),
+        )
+
+    def test_fused(self):
+        """
+        Confirms that the fused lazy queries of all targets select the same
+        rows as the per-target path.
+        """
+        ds = LocateDataSetA(
+            self.config,
+            input_data=self.ds_input.input_data,
+            selected_profiles=self.ds_select.selected_profiles,
+        )
+        ds.process_targets()
+
+        self.config.get_step_params("locate")["fused"] = True
+        ds_fused = LocateDataSetA(
+            self.config,
+            input_data=self.ds_input.input_data,
+            selected_profiles=self.ds_select.selected_profiles,
+        )
+        ds_fused.process_targets()
+        self.assertEqual(ds_fused.positive_rows, {})
+
+        for target_name in ["temp", "psal", "pres"]:
+            sort_col_names = ["pair_id", "label", "profile_id", "observation_no"]
+            self.assertEqual(
+                ds_fused.selected_rows[target_name]["row_id"].to_list(),
+                list(range(1, ds.selected_rows[target_name].shape[0] + 1)),
+            )
+            self.assertTrue(
+                ds_fused.selected_rows[target_name]
+                .drop("row_id")
+                .sort(sort_col_names)
+                .equals(
+                    ds.selected_rows[target_name].drop("row_id").sort(sort_col_names)
+                )
+            )
+
+    def test_closest_pressure(self):
+        """
+        Confirms that each negative row is the observation of its negative
+        profile that is closest in pressure to the positive observation.
+        """
+        ds = LocateDataSetA(
+            self.config,
+            input_data=self.ds_input.input_data,
+            selected_profiles=self.ds_select.selected_profiles,
+        )
+        ds.select_positive_rows("temp", self.target_value_temp)
+        ds.select_negative_rows_closest_day("temp", self.target_value_temp)
+        negative_rows = ds.negative_rows["temp"]
+        self.assertEqual(negative_rows.shape[0], 320)
+
+        min_pres_diff = (
+            ds.positive_rows["temp"]
+            .select(["pair_id", "pos_profile_id", pl.col("pres").alias("pos_pres")])
+            .join(
+                self.ds_select.selected_profiles.filter(pl.col("label") == 0).select(
+                    ["profile_id", "pos_profile_id", "platform_code", "profile_no"]
+                ),
+                on="pos_profile_id",
+            )
+            .join(
+                self.ds_input.input_data.filter(pl.col("temp_qc") == 1).select(
+                    ["platform_code", "profile_no", "pres"]
+                ),
+                on=["platform_code", "profile_no"],
+            )
+            .group_by(["pair_id", "profile_id"])
+            .agg(
+                (pl.col("pres") - pl.col("pos_pres")).abs().min().alias("pres_diff"),
+                pl.col("pos_pres").first(),
+            )
+        )
+        matched = negative_rows.join(min_pres_diff, on=["pair_id", "profile_id"])
+        self.assertEqual(matched.shape[0], 320)
+        self.assertTrue(
+            matched.select(
+                (
+                    (pl.col("pres") - pl.col("pos_pres")).abs() == pl.col("pres_diff")
+                ).all()
+            ).item()
+        )
+
     def test_write_selected_rows(self):
         """
         Verifies that the `write_selected_rows` method successfully creates
@@ -13,6 +13,7 @@ import polars as pl
 from dmqclib.common.config.dataset_config import DataSetConfig
 from dmqclib.common.loader.dataset_loader import load_step1_input_dataset
 from dmqclib.common.loader.dataset_loader import load_step3_select_dataset
+from dmqclib.common.loader.dataset_loader import load_step4_locate_dataset
 from dmqclib.prepare.step4_select_rows.dataset_all import LocateDataSetAll
 
 
@@ -132,6 +133,99 @@ class TestLocateDataSetAll(unittest.TestCase):
         self.assertEqual(ds.selected_rows["pres"].shape[0], 132342)
         self.assertEqual(ds.selected_rows["pres"].shape[1], 9)
 
+    def test_fused(self):
+        """
+        Confirms that the fused lazy queries of all targets select the same
+        rows as the per-target path.
+        """
+        ds = LocateDataSetAll(
+            self.config,
+            input_data=self.ds_input.input_data,
+            selected_profiles=self.ds_select.selected_profiles,
+        )
+        ds.process_targets()
+
+        self.config.get_step_params("locate")["fused"] = True
+        ds_fused = LocateDataSetAll(
+            self.config,
+            input_data=self.ds_input.input_data,
+            selected_profiles=self.ds_select.selected_profiles,
+        )
+        ds_fused.process_targets()
+
+        for target_name in ["temp", "psal", "pres"]:
+            self.assertTrue(
+                ds_fused.selected_rows[target_name].equals(
+                    ds.selected_rows[target_name]
+                )
+            )
+
+    def test_sampled_profiles(self):
+        """
+        Confirms that only the rows of the profiles kept by the negative
+        sampling of the select step are located.
+        """
+        self.config.data["step_param_set"]["steps"]["select"] = {"max_negatives": 20}
+        ds_select = load_step3_select_dataset(
+            self.config, input_data=self.ds_input.input_data
+        )
+        ds_select.label_profiles()
+        self.assertEqual(ds_select.selected_profiles.shape[0], 45)
+
+        ds = load_step4_locate_dataset(
+            self.config,
+            input_data=self.ds_input.input_data,
+            selected_profiles=ds_select.selected_profiles,
+        )
+        ds.process_targets()
+
+        for target_name in ["temp", "psal", "pres"]:
+            self.assertEqual(
+                ds.selected_rows[target_name]
+                .select(["platform_code", "profile_no"])
+                .unique()
+                .shape[0],
+                45,
+            )
+        self.assertEqual(ds.selected_rows["temp"].shape[0], 12512)
+
+    def test_profile_input(self):
+        """
+        Confirms that locating rows without a shared profile_input gives the
+        same rows as with the profile_input of the select step when
+        negatives are sampled.
+        """
+        self.config.data["step_param_set"]["steps"]["select"] = {"max_negatives": 20}
+        ds_select = load_step3_select_dataset(
+            self.config, input_data=self.ds_input.input_data
+        )
+        ds_select.label_profiles()
+        ds_select.create_profile_input()
+
+        ds = LocateDataSetAll(
+            self.config,
+            input_data=self.ds_input.input_data,
+            selected_profiles=ds_select.selected_profiles,
+        )
+        self.assertIsNone(ds.profile_input)
+        ds.process_targets()
+        self.assertTrue(ds.profile_input.equals(ds_select.profile_input))
+
+        ds_profile = LocateDataSetAll(
+            self.config,
+            input_data=self.ds_input.input_data,
+            selected_profiles=ds_select.selected_profiles,
+        )
+        ds_profile.profile_input = ds_select.profile_input
+        ds_profile.process_targets()
+
+        for target_name in ["temp", "psal", "pres"]:
+            self.assertTrue(
+                ds.selected_rows[target_name].equals(
+                    ds_profile.selected_rows[target_name]
+                )
+            )
+
     def test_write_selected_rows(self):
         """
         Verifies that the `write_selected_rows` method successfully creates
@@ -345,6 +345,30 @@ class TestExtractDataSetANegX5(unittest.TestCase):
         self.assertEqual(ds.selected_rows["pres"].shape[0], 783)
         self.assertEqual(ds.selected_rows["pres"].shape[1], 9)
 
+    def test_profile_input(self):
+        """
+        Validate that the profile input of the select step is used as the
+        filtered input without joining the input data again.
+        """
+        self.ds_select.create_profile_input()
+        ds = ExtractDataSetA(
+            self.config,
+            input_data=self.ds_input.input_data,
+            selected_profiles=self.ds_select.selected_profiles,
+            selected_rows=self.ds_locate.selected_rows,
+            summary_stats=self.ds_summary.summary_stats,
+            profile_input=self.ds_select.profile_input,
+        )
+        self.assertIs(ds.filtered_input, self.ds_select.profile_input)
+        self.assertEqual(ds.filtered_input.shape[0], 26362)
+
+        ds_joined = ExtractDataSetA(
+            self.config,
+            input_data=self.ds_input.input_data,
+            selected_profiles=self.ds_select.selected_profiles,
+        )
+        self.assertTrue(ds.filtered_input.equals(ds_joined.filtered_input))
+
     def test_location_features(self):
         """
         Check that features are correctly processed for temp and psal targets.
@@ -408,6 +432,77 @@ class TestExtractDataSetANegX5(unittest.TestCase):
         os.remove(ds.output_file_names["psal"])
         os.remove(ds.output_file_names["pres"])
 
+    def test_summary_stats_wide(self):
+        """
+        Check that the wide summary statistics are only reshaped when a
+        profile_summary_stats feature is configured.
+        """
+        ds = ExtractDataSetA(
+            self.config,
+            input_data=self.ds_input.input_data,
+            selected_profiles=self.ds_select.selected_profiles,
+            selected_rows=self.ds_locate.selected_rows,
+            summary_stats=self.ds_summary.summary_stats,
+        )
+        ds.process_targets()
+        self.assertIn("summary_stats_wide", vars(ds))
+
+        ds_no_summary = ExtractDataSetA(
+            self.config,
+            input_data=self.ds_input.input_data,
+            selected_profiles=self.ds_select.selected_profiles,
+            selected_rows=self.ds_locate.selected_rows,
+            summary_stats=self.ds_summary.summary_stats,
+        )
+        ds_no_summary.feature_info = [
+            x
+            for x in ds_no_summary.feature_info
+            if x["feature"] != "profile_summary_stats"
+        ]
+        ds_no_summary.process_targets()
+        self.assertNotIn("summary_stats_wide", vars(ds_no_summary))
+
+    def test_sorted_input(self):
+        """
+        Check that features looked up on sorted input equal those of the
+        hash joins.
+        """
+        ds = ExtractDataSetA(
+            self.config,
+            input_data=self.ds_input.input_data,
+            selected_profiles=self.ds_select.selected_profiles,
+            selected_rows=self.ds_locate.selected_rows,
+            summary_stats=self.ds_summary.summary_stats,
+        )
+        ds.process_targets()
+
+        self.config.get_step_params("input")["sort_order"] = "check"
+        ds_sorted = ExtractDataSetA(
+            self.config,
+            input_data=self.ds_input.input_data,
+            selected_profiles=self.ds_select.selected_profiles,
+            selected_rows=self.ds_locate.selected_rows,
+            summary_stats=self.ds_summary.summary_stats,
+        )
+        self.assertTrue(ds_sorted.sorted_input)
+        ds_sorted.process_targets()
+
+        ds_unsorted = ExtractDataSetA(
+            self.config,
+            input_data=self.ds_input.input_data.reverse(),
+            selected_profiles=self.ds_select.selected_profiles,
+            selected_rows=self.ds_locate.selected_rows,
+            summary_stats=self.ds_summary.summary_stats,
+        )
+        self.assertFalse(ds_unsorted.sorted_input)
+
+        for target_name in ["temp", "psal", "pres"]:
+            self.assertTrue(
+                ds_sorted.target_features[target_name].equals(
+                    ds.target_features[target_name]
+                )
+            )
+
 
 class TestExtractDataSetAwithAll(unittest.TestCase):
     """